@@ -0,0 +1,58 @@
+"""
+Compare two json results of ``benchmarks/suite.py``.
+
+Exit with status 1 if any benchmark is slower than ``--threshold`` in median time.
+
+    python benchmarks/compare.py before.json after.json --threshold 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any
+
+
+def key(result: dict[str, Any]) -> str:
+    return result["name"] + " " + json.dumps(result["params"], sort_keys=True)
+
+
+def load(path: str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown ratio, default to 0.1 (10%%)")
+    args = parser.parse_args()
+
+    base = load(args.base)
+    head = load(args.head)
+    base_results = {key(r): r for r in base["results"]}
+
+    print(f"base {base.get('commit')} -> head {head.get('commit')}")
+    regressions = 0
+    for result in head["results"]:
+        k = key(result)
+        old = base_results.get(k)
+        if old is None:
+            print(f"{k:<60} {result['median'] * 1e3:10.3f} ms (new)")
+            continue
+        change = result["median"] / old["median"] - 1
+        mark = ""
+        if change > args.threshold:
+            mark = "  REGRESSION"
+            regressions += 1
+        print(f"{k:<60} {old['median'] * 1e3:10.3f} ms -> {result['median'] * 1e3:10.3f} ms {change:+8.1%}{mark}")
+
+    if regressions:
+        print(f"{regressions} regression(s) over {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
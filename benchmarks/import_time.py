@@ -0,0 +1,51 @@
+"""
+Measure wall time of importing transmission-rpc in fresh interpreters.
+
+Short-lived scripts, for example ``script-torrent-done`` of transmission daemon,
+pay this cost for every run.
+
+    python benchmarks/import_time.py --runs 20
+    python -X importtime -c "from transmission_rpc import Client"  # breakdown by module
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "pass",
+    "import transmission_rpc",
+    "from transmission_rpc import Torrent",
+    "from transmission_rpc import Client",
+]
+
+_TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def run(statement: str) -> float:
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", _TIMER.format(statement=statement)], capture_output=True, check=True, text=True
+    ).stdout
+    return float(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    for statement in STATEMENTS:
+        samples = [run(statement) for _ in range(args.runs)]
+        print(f"{statement:<56} median {statistics.median(samples) * 1e3:8.2f} ms  min {min(samples) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
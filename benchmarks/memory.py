@@ -0,0 +1,160 @@
+"""
+Measure memory of client results with tracemalloc, and fail when it grows over recorded thresholds.
+
+Responses are generated by the in-process fake daemon and encoded before tracing starts,
+so only client side allocations are measured: response decoding and object building.
+
+``peak`` is the max traced memory during the call, ``retained`` is memory still held by the result after it returns.
+Both are reported per item (torrent, file or piece) for ``*_per_item``.
+
+    python benchmarks/memory.py                  # check against benchmarks/memory_thresholds.json
+    python benchmarks/memory.py --update         # record current numbers as thresholds
+    python benchmarks/memory.py --output mem.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gc
+import json
+import pathlib
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+from transmission_rpc import Client, Torrent
+from transmission_rpc.testing import FakeDaemon
+from transmission_rpc.transport import InMemoryTransport
+
+MINIMAL_FIELDS = ["id", "hashString", "name", "status", "percentDone"]
+
+THRESHOLDS = pathlib.Path(__file__).with_name("memory_thresholds.json")
+
+
+def measure(fn: Callable[[], Any]) -> tuple[int, int]:
+    """returns (peak, retained) bytes allocated by ``fn``, the result is retained until measured"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        gc.collect()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - before, after - before
+
+
+def encoded_client(daemon: FakeDaemon) -> Client:
+    """client with responses encoded once per distinct request, before they are measured"""
+    cache: dict[str, bytes] = {}
+
+    def handler(request: dict[str, Any]) -> bytes:
+        key = json.dumps(request, sort_keys=True)
+        data = cache.get(key)
+        if data is None:
+            data = cache[key] = json.dumps(daemon.handle(request)).encode()
+        return data
+
+    return Client(transport=InMemoryTransport(handler))
+
+
+class Report:
+    def __init__(self) -> None:
+        self.results: dict[str, dict[str, float]] = {}
+
+    def run(self, name: str, fn: Callable[[], Any], items: int) -> None:
+        fn()  # warm up, and cache encoded response
+        peak, retained = measure(fn)
+        self.results[name] = {
+            "items": items,
+            "peak": peak,
+            "retained": retained,
+            "peak_per_item": peak / items,
+            "retained_per_item": retained / items,
+        }
+        print(
+            f"{name:<32} peak {peak / 2**20:9.2f} MiB {peak / items:10.1f} B/item"
+            f"   retained {retained / 2**20:9.2f} MiB {retained / items:10.1f} B/item",
+            file=sys.stderr,
+        )
+
+
+def bench_get_torrents(report: Report, n: int) -> None:
+    with FakeDaemon(torrents=n, files=1, peers=0, seed=n) as daemon, encoded_client(daemon) as client:
+        report.run(f"get_torrents[minimal,{n}]", lambda: client.get_torrents(arguments=MINIMAL_FIELDS), n)
+        report.run(f"get_torrents[full,{n}]", client.get_torrents, n)
+
+
+def bench_get_files(report: Report, n: int) -> None:
+    with FakeDaemon(torrents=1, files=n) as daemon, encoded_client(daemon) as client:
+        torrent = client.get_torrent(1, arguments=["id", "files", "fileStats", "priorities", "wanted"])
+        report.run(f"get_files[{n}]", torrent.get_files, n)
+
+
+def bench_pieces(report: Report, n: int) -> None:
+    fields = {"id": 1, "pieceCount": n, "pieces": base64.b64encode(b"\xaa" * (n // 8)).decode()}
+    # ``pieces`` is cached on the torrent, decode it from a new torrent each time
+    report.run(f"pieces[{n}]", lambda: Torrent(fields=fields).pieces, n)
+
+
+def bench_session(report: Report) -> None:
+    with FakeDaemon() as daemon, encoded_client(daemon) as client:
+        report.run("session", client.get_session, 1)
+
+
+def check(results: dict[str, dict[str, float]], thresholds: dict[str, dict[str, float]], tolerance: float) -> int:
+    failed = 0
+    for name, limits in thresholds.items():
+        result = results.get(name)
+        if result is None:
+            continue
+        for key, limit in limits.items():
+            if result[key] > limit * (1 + tolerance):
+                print(f"{name} {key} {result[key]:.2f} is over threshold {limit:.2f}", file=sys.stderr)
+                failed += 1
+    return failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,50000", help="comma separated numbers of torrents")
+    parser.add_argument("--files", type=int, default=100_000, help="number of files of a torrent")
+    parser.add_argument("--pieces", type=int, default=1_000_000, help="number of pieces of a torrent")
+    parser.add_argument("--thresholds", type=pathlib.Path, default=THRESHOLDS)
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed growth over thresholds")
+    parser.add_argument("--update", action="store_true", help="write current per item numbers as thresholds")
+    parser.add_argument("--output", help="write json results to this file")
+    args = parser.parse_args()
+
+    report = Report()
+    for n in [int(s) for s in args.sizes.split(",")]:
+        bench_get_torrents(report, n)
+    bench_get_files(report, args.files)
+    bench_pieces(report, args.pieces)
+    bench_session(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report.results, f, indent=2)
+
+    if args.update:
+        thresholds = {
+            name: {"peak_per_item": round(r["peak_per_item"], 2), "retained_per_item": round(r["retained_per_item"], 2)}
+            for name, r in report.results.items()
+        }
+        args.thresholds.write_text(json.dumps(thresholds, indent=2) + "\n", "utf-8")
+        return
+
+    if not args.thresholds.exists():
+        return
+    failed = check(report.results, json.loads(args.thresholds.read_text("utf-8")), args.tolerance)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare per-call overhead of the default urllib3 transport and SocketTransport on a unix socket.
+
+A minimal in-process HTTP/1.1 server answers every request with a fixed session-stats response,
+so the result is dominated by client side cost.
+
+    python benchmarks/socket_transport.py --calls 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.server
+import os
+import socketserver
+import tempfile
+import threading
+import time
+
+from transmission_rpc import Client
+from transmission_rpc.transport import SocketTransport, Transport, Urllib3Transport
+
+RESPONSE = (
+    b'{"result":"success","arguments":{"activeTorrentCount":1,"downloadSpeed":0,"pausedTorrentCount":0,'
+    b'"torrentCount":1,"uploadSpeed":0,"version":"4.0.6","rpc-version":17,"rpc-version-semver":"5.3.0",'
+    b'"cumulative-stats":{"downloadedBytes":0,"filesAdded":0,"secondsActive":0,"sessionCount":1,"uploadedBytes":0},'
+    b'"current-stats":{"downloadedBytes":0,"filesAdded":0,"secondsActive":0,"sessionCount":1,"uploadedBytes":0}}}'
+)
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["content-length"]))
+        self.send_response_only(200)
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def address_string(self) -> str:
+        return "unix"
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def bench(name: str, transport: Transport, calls: int) -> None:
+    with Client(transport=transport) as client:
+        for _ in range(100):
+            client.session_stats()
+        start = time.perf_counter()
+        for _ in range(calls):
+            client.session_stats()
+        elapsed = time.perf_counter() - start
+    print(f"{name:<20} {calls / elapsed:10.0f} calls/s {elapsed / calls * 1e6:10.1f} us/call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rpc.sock")
+        server = Server(path, Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            bench("urllib3 (http+unix)", Urllib3Transport("http+unix", path), args.calls)
+            bench("SocketTransport", SocketTransport(path), args.calls)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
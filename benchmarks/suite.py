@@ -0,0 +1,253 @@
+"""
+Benchmark client hot paths against the in-process fake daemon, without transmission daemon.
+
+Results are written as json, compare two runs with ``benchmarks/compare.py``.
+
+    python benchmarks/suite.py --output before.json
+    git checkout my-branch
+    python benchmarks/suite.py --output after.json
+    python benchmarks/compare.py before.json after.json
+
+With ``--transport memory`` (the default) responses of read-only requests are encoded once and cached,
+so the result is client side cost only: request encoding, response decoding and object building.
+``--transport http`` and ``--transport unix`` add the network stack, and fake daemon cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+from transmission_rpc import Client, Torrent
+from transmission_rpc.testing import FakeDaemon
+from transmission_rpc.transport import InMemoryTransport
+
+MINIMAL_FIELDS = ["id", "hashString", "name", "status", "percentDone"]
+
+#: torrent properties read in property access benchmark
+PROPERTIES = [
+    "id",
+    "name",
+    "hashString",
+    "status",
+    "progress",
+    "ratio",
+    "eta",
+    "total_size",
+    "rate_download",
+    "rate_upload",
+    "labels",
+    "download_dir",
+    "added_date",
+]
+
+_CACHED_METHODS = frozenset({"torrent-get", "session-get"})
+
+
+def bencode(value: Any) -> bytes:
+    if isinstance(value, int):
+        return b"i%de" % value
+    if isinstance(value, bytes):
+        return b"%d:%s" % (len(value), value)
+    if isinstance(value, str):
+        return bencode(value.encode())
+    if isinstance(value, list):
+        return b"l" + b"".join(bencode(v) for v in value) + b"e"
+    return b"d" + b"".join(bencode(k) + bencode(v) for k, v in sorted(value.items())) + b"e"
+
+
+def large_torrent(files: int, size: int) -> bytes:
+    """multi-file torrent with ``files`` files of ``size`` bytes, pieces of 16 KiB"""
+    piece_length = 16 * 1024
+    pieces = files * size // piece_length + 1
+    return bencode(
+        {
+            "announce": "https://tracker.example.com/announce",
+            "info": {
+                "name": "benchmark",
+                "piece length": piece_length,
+                "pieces": os.urandom(20 * pieces),
+                "files": [{"length": size, "path": ["dir", f"file-{i}.bin"]} for i in range(files)],
+            },
+        }
+    )
+
+
+class Benchmark:
+    def __init__(self, transport: str, repeat: int):
+        self.transport = transport
+        self.repeat = repeat
+        self.results: list[dict[str, Any]] = []
+        self.__tmp = tempfile.TemporaryDirectory()
+
+    def client(self, daemon: FakeDaemon) -> Client:
+        if self.transport == "http":
+            daemon.serve_http()
+        elif self.transport == "unix":
+            daemon.serve_unix(os.path.join(self.__tmp.name, f"{id(daemon)}.sock"))
+        else:
+            return Client(transport=InMemoryTransport(cached_handler(daemon)))
+        return daemon.client()
+
+    def measure(self, name: str, fn: Callable[[], Any], *, items: int = 1, **params: Any) -> None:
+        fn()  # warm up
+        samples = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+
+        median = statistics.median(samples)
+        result = {
+            "name": name,
+            "params": params,
+            "items": items,
+            "repeat": self.repeat,
+            "min": min(samples),
+            "median": median,
+            "mean": statistics.fmean(samples),
+            "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "ops_per_sec": 1 / median,
+            "items_per_sec": items / median,
+        }
+        self.results.append(result)
+        print(
+            f"{name:<24} {json.dumps(params):<36} {median * 1e3:10.3f} ms {result['items_per_sec']:14.0f} items/s",
+            file=sys.stderr,
+        )
+
+    def close(self) -> None:
+        self.__tmp.cleanup()
+
+
+def cached_handler(daemon: FakeDaemon) -> Callable[[dict[str, Any]], dict[str, Any] | bytes]:
+    cache: dict[str, bytes] = {}
+
+    def handler(request: dict[str, Any]) -> dict[str, Any] | bytes:
+        if request["method"] not in _CACHED_METHODS:
+            cache.clear()
+            return daemon.handle(request)
+        key = json.dumps(request, sort_keys=True)
+        data = cache.get(key)
+        if data is None:
+            data = cache[key] = json.dumps(daemon.handle(request)).encode()
+        return data
+
+    return handler
+
+
+def bench_torrent_get(b: Benchmark, n: int) -> None:
+    with FakeDaemon(torrents=n, files=1, seed=n) as daemon, b.client(daemon) as client:
+        b.measure(
+            "torrent_get",
+            lambda: client.get_torrents(arguments=MINIMAL_FIELDS),
+            items=n,
+            torrents=n,
+            fields="minimal",
+        )
+        b.measure("torrent_get", client.get_torrents, items=n, torrents=n, fields="full")
+
+        torrents = client.get_torrents()
+        raw = [t.fields for t in torrents]
+        b.measure("torrent_construct", lambda: [Torrent(fields=f) for f in raw], items=n, torrents=n)
+        b.measure(
+            "torrent_properties",
+            lambda: [[getattr(t, p) for p in PROPERTIES] for t in torrents],
+            items=n * len(PROPERTIES),
+            torrents=n,
+        )
+
+
+def bench_get_files(b: Benchmark, n: int) -> None:
+    with FakeDaemon(torrents=1, files=n) as daemon, b.client(daemon) as client:
+        torrent = client.get_torrent(1, arguments=["id", "files", "fileStats", "priorities", "wanted"])
+        b.measure("file_construct", torrent.get_files, items=n, files=n)
+
+
+def bench_add_torrent(b: Benchmark, files: int) -> None:
+    metainfo = large_torrent(files, 1 << 20)
+    with FakeDaemon() as daemon, b.client(daemon) as client:
+
+        def add() -> None:
+            torrent = client.add_torrent(metainfo)
+            client.remove_torrent(torrent.id)
+
+        b.measure("add_torrent", add, items=len(metainfo), files=files, payload_bytes=len(metainfo))
+
+
+def bench_change_torrent(b: Benchmark, n: int) -> None:
+    with FakeDaemon(torrents=n) as daemon, b.client(daemon) as client:
+        ids = list(range(1, n + 1))
+        b.measure(
+            "change_torrent",
+            lambda: client.change_torrent(ids, labels=["a", "b"], upload_limit=100),
+            items=n,
+            torrents=n,
+        )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+            timeout=10,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transport", choices=["memory", "http", "unix"], default="memory")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="comma separated numbers of torrents")
+    parser.add_argument("--files", default="100,10000", help="comma separated numbers of files of a torrent")
+    parser.add_argument("--add-files", type=int, default=2000, help="number of files of added torrent")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write json results to this file, default to stdout")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    files = [int(s) for s in args.files.split(",")]
+    b = Benchmark(args.transport, args.repeat)
+    try:
+        for n in sizes:
+            bench_torrent_get(b, n)
+        for n in files:
+            bench_get_files(b, n)
+        bench_add_torrent(b, args.add_files)
+        for n in sizes:
+            bench_change_torrent(b, n)
+    finally:
+        b.close()
+
+    report = {
+        "commit": git_commit(),
+        "date": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "transport": args.transport,
+        "results": b.results,
+    }
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data)
+    else:
+        print(data)
+
+
+if __name__ == "__main__":
+    main()
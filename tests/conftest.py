@@ -8,15 +8,26 @@ import pytest
 
 from transmission_rpc import LOGGER
 from transmission_rpc.client import Client
+from transmission_rpc.testing import FakeDaemon
 
 PROTOCOL = os.getenv("TR_PROTOCOL", "http")
 HOST = os.getenv("TR_HOST", "127.0.0.1")
 PORT = int(os.getenv("TR_PORT", "9091"))
 USER = os.getenv("TR_USER", "admin")
 PASSWORD = os.getenv("TR_PASSWORD", "password")
+FAKE_DAEMON = os.getenv("TR_FAKE_DAEMON", "") == "1"
 
 
 def pytest_configure():
+    if FAKE_DAEMON:
+        # run tests without a real transmission daemon
+        daemon = FakeDaemon(username=USER, password=PASSWORD)
+        if PROTOCOL == "http+unix":
+            daemon.serve_unix(HOST)
+        else:
+            daemon.serve_http(HOST, PORT)
+        return
+
     start = time.time()
     while True:
         with contextlib.suppress(ConnectionError, FileNotFoundError):
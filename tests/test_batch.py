@@ -0,0 +1,152 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from transmission_rpc.batch import MutationBatcher
+
+example_hash = "51ba7d0dd45ab9b9564329c33f4f97493b677924"
+
+
+def fake_client(cached_ids=None):
+    client = mock.Mock()
+    client.cached_torrent_id.side_effect = (cached_ids or {}).get
+    return client
+
+
+def test_merge_calls():
+    client = fake_client()
+    with MutationBatcher(client, window=60) as batcher:
+        futures = [
+            batcher.start_torrent(1),
+            batcher.start_torrent([2, example_hash]),
+            batcher.verify_torrent(3),
+            batcher.start_torrent(1),
+            batcher.change_torrent(1, labels=["a"]),
+            batcher.change_torrent([2], labels=["a"]),
+            batcher.change_torrent(3, labels=["b"]),
+        ]
+        assert not any(f.done() for f in futures), "calls should be buffered"
+
+    assert all(f.result(timeout=0) is None for f in futures)
+    client.start_torrent.assert_called_once_with([1, 2, example_hash], bypass_queue=False)
+    client.verify_torrent.assert_called_once_with([3])
+    assert client.change_torrent.call_args_list == [
+        mock.call([1, 2], labels=["a"]),
+        mock.call([3], labels=["b"]),
+    ]
+
+
+def test_cancel_contradiction():
+    client = fake_client()
+    with MutationBatcher(client, window=60) as batcher:
+        start = batcher.start_torrent([1, 2])
+        stop = batcher.stop_torrent(1)
+
+    assert start.result(timeout=0) is None
+    assert stop.result(timeout=0) is None
+    client.start_torrent.assert_called_once_with([2], bypass_queue=False)
+    client.stop_torrent.assert_called_once_with([1])
+
+
+def test_cancel_contradiction_error():
+    client = fake_client()
+    client.start_torrent.side_effect = ValueError("boom")
+    with MutationBatcher(client, window=60) as batcher:
+        canceled = batcher.start_torrent(1)
+        partly_canceled = batcher.start_torrent([1, 2])
+        failed = batcher.start_torrent(2)
+        stop = batcher.stop_torrent(1)
+        assert canceled.done(), "call with all ids canceled should be resolved at once"
+        assert not partly_canceled.done()
+
+    assert canceled.result(timeout=0) is None
+    assert stop.result(timeout=0) is None
+    for future in [partly_canceled, failed]:
+        with pytest.raises(ValueError, match="boom"):
+            future.result(timeout=0)
+    client.start_torrent.assert_called_once_with([2], bypass_queue=False)
+
+
+def test_cancel_contradiction_hash():
+    client = fake_client({example_hash: 1})
+    with MutationBatcher(client, window=60) as batcher:
+        batcher.stop_torrent([example_hash, 2])
+        batcher.start_torrent(1, bypass_queue=True)
+        batcher.start_torrent(2)
+        batcher.stop_torrent(example_hash)
+
+    client.start_torrent.assert_called_once_with([2], bypass_queue=False)
+    client.stop_torrent.assert_called_once_with([example_hash])
+
+
+def test_merge_unhashable_arguments():
+    client = fake_client()
+    with MutationBatcher(client, window=60) as batcher:
+        batcher.change_torrent(1, files_wanted={2, 1}, labels=["a"])
+        batcher.change_torrent(2, files_wanted={1, 2}, labels=["a"])
+        batcher.change_torrent(3, files_wanted={1, 2}, labels=["b"])
+
+    assert [c.args for c in client.change_torrent.call_args_list] == [([1, 2],), ([3],)]
+
+
+def test_flush_concurrent():
+    sending = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    def stop_torrent(ids):
+        sending.set()
+        assert release.wait(5)
+        sent.append(ids)
+
+    client = fake_client()
+    client.stop_torrent.side_effect = stop_torrent
+    with MutationBatcher(client, window=0) as batcher:
+        batcher.stop_torrent(1)
+        assert sending.wait(5)
+        batcher.stop_torrent(2)
+        flushing = threading.Thread(target=batcher.flush)
+        flushing.start()
+        flushing.join(0.1)
+        assert flushing.is_alive(), "flush should wait for the batch being sent"
+        release.set()
+        flushing.join(5)
+
+    assert sent == [[1], [2]]
+
+
+def test_window():
+    sent = threading.Event()
+    client = fake_client()
+    client.stop_torrent.side_effect = lambda ids: sent.set()
+    with MutationBatcher(client, window=0.01) as batcher:
+        future = batcher.stop_torrent(1)
+        assert sent.wait(5)
+        assert future.result(timeout=5) is None
+
+
+def test_max_ids():
+    client = fake_client()
+    with MutationBatcher(client, window=60, max_ids=3) as batcher:
+        future = batcher.stop_torrent([1, 2, 3])
+        assert future.result(timeout=5) is None
+
+
+def test_error():
+    client = fake_client()
+    client.stop_torrent.side_effect = ValueError("boom")
+    with MutationBatcher(client, window=60) as batcher:
+        futures = [batcher.stop_torrent(1), batcher.stop_torrent(2)]
+
+    for future in futures:
+        with pytest.raises(ValueError, match="boom"):
+            future.result(timeout=0)
+
+
+def test_invalid_ids():
+    with MutationBatcher(fake_client()) as batcher:
+        with pytest.raises(ValueError, match="recently-active"):
+            batcher.stop_torrent("recently-active")
+        with pytest.raises(ValueError, match="require ids"):
+            batcher.stop_torrent([])
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import pathlib
+import time
+
+import pytest
+
+from transmission_rpc import Client, TransmissionError
+from transmission_rpc.cassette import RecordingTransport, ReplayTransport
+from transmission_rpc.testing import FakeDaemon
+
+
+def record(path: pathlib.Path, **kwargs) -> FakeDaemon:
+    """record requests on a fake daemon, torrent 1 is renamed to ``renamed``"""
+    daemon = FakeDaemon(torrents=5, files=2, peers=1, seed=3)
+    with Client(transport=RecordingTransport(daemon.transport(), path, **kwargs)) as c:
+        c.get_torrents()
+        c.get_torrents(arguments=["id", "name"])
+        c.rename_torrent_path(1, daemon.torrents[1]["name"], "renamed")
+        c.get_torrent(1)
+    return daemon
+
+
+def test_replay(tmp_path):
+    daemon = record(tmp_path)
+    with Client(transport=ReplayTransport(tmp_path, strict=True)) as c:
+        # recorded before torrent 1 is renamed
+        names = [t.name for t in c.get_torrents(arguments=["id", "name"])]
+        assert names[0].startswith("torrent-")
+        assert names[1:] == [daemon.torrents[i]["name"] for i in range(2, 6)]
+        assert c.get_torrent(1).name == "renamed"
+        assert len(c.get_torrents()) == 5
+
+        with pytest.raises(TransmissionError, match="no recorded response"):
+            c.stop_torrent(1)
+
+
+def test_replay_by_method(tmp_path):
+    record(tmp_path)
+    with Client(transport=ReplayTransport(tmp_path)) as c:
+        assert len(c.get_torrents(arguments=["id", "name", "status"])) == 5
+
+
+def test_replay_body_copied_once(tmp_path):
+    record(tmp_path)
+    transport = ReplayTransport(tmp_path)
+    # recorded once, replayed from the same entry
+    body = b'{"method":"torrent-rename-path","arguments":{}}'
+    first = transport.request("/transmission/rpc", {}, body, None)
+    second = transport.request("/transmission/rpc", {}, body, None)
+    transport.close()
+    assert isinstance(first.data, bytes)
+    assert second.data is first.data
+
+
+def test_replay_timing(tmp_path):
+    record(tmp_path)
+    index = tmp_path.joinpath("index.jsonl")
+    lines = [json.loads(line) for line in index.read_text().splitlines()]
+    for line in lines:
+        line["elapsed"] = 0.05
+    index.write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+    with Client(transport=ReplayTransport(tmp_path, timing=2)) as c:
+        start = time.monotonic()
+        c.get_torrents()
+        assert time.monotonic() - start >= 0.1
+
+
+def test_anonymize(tmp_path):
+    daemon = record(tmp_path, anonymize=True)
+    bodies = tmp_path.joinpath("bodies.bin").read_bytes()
+    torrent = daemon.torrents[2]
+    for secret in [
+        torrent["name"],
+        torrent["files"][0]["name"],
+        torrent["downloadDir"],
+        torrent["trackers"][0]["announce"],
+        torrent["peers"][0]["address"],
+        "renamed",
+    ]:
+        assert secret.encode() not in bodies
+
+    with Client(transport=ReplayTransport(tmp_path)) as c:
+        torrents = c.get_torrents()
+        assert len(torrents) == 5
+        files = torrents[1].get_files()
+        assert files[0].name.startswith(torrents[1].name + "/")
+        assert files[0].name.endswith(".bin")
+        assert torrents[1].hashString == torrent["hashString"]
+
+
+def test_anonymize_session(tmp_path):
+    secrets = [
+        "https://tracker.example.com/0123456789abcdef/announce",
+        "https://blocklist.example.com/list.gz",
+        "/home/alice/bin/done.sh",
+    ]
+    daemon = FakeDaemon()
+    with Client(transport=RecordingTransport(daemon.transport(), tmp_path, anonymize=True)) as c:
+        c.set_session(
+            default_trackers=[secrets[0], "udp://open.example.org:1337/announce"],
+            blocklist_url=secrets[1],
+            script_torrent_done_filename=secrets[2],
+        )
+        c.get_session()
+
+    bodies = tmp_path.joinpath("bodies.bin").read_bytes()
+    for secret in [*secrets, "tracker.example.com", "0123456789abcdef", "alice"]:
+        assert secret.encode() not in bodies
+
+    with Client(transport=ReplayTransport(tmp_path)) as c:
+        session = c.get_session()
+        assert session.default_trackers[0].endswith(".invalid/announce")
+        assert session.script_torrent_done_filename.endswith(".sh")
@@ -1,4 +1,5 @@
 import base64
+import json
 import pathlib
 import time
 from unittest import mock
@@ -8,8 +9,12 @@ import pytest
 from typing_extensions import Literal
 
 from tests.util import ServerTooLowError, skip_on
+from transmission_rpc._body import Base64JsonBody
 from transmission_rpc.client import Client, _try_read_torrent, ensure_location_str
+from transmission_rpc.constants import RpcMethod
 from transmission_rpc.error import TransmissionAuthError
+from transmission_rpc.testing import FakeDaemon
+from transmission_rpc.torrent import Torrent
 from transmission_rpc.types import File
 
 
@@ -233,3 +238,226 @@ def test_groups(tr_client: Client):
     groups = tr_client.get_groups()
 
     assert "test.1" in groups
+
+
+def test_refresh_torrents():
+    m = mock.Mock(return_value={"torrents": [{"id": 1, "name": "a", "status": 0}, {"id": 2, "name": "b"}]})
+    with mock.patch("transmission_rpc.client.Client._request", m), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        c = Client()
+        old = Torrent(fields={"id": 1, "name": "a", "status": 4})
+        snapshot = {1: old, 3: Torrent(fields={"id": 3})}
+        changes = c.refresh_torrents(snapshot, arguments=["name", "status"])
+
+    assert changes == {1: {"status"}, 2: {"id", "name"}}
+    assert snapshot[1] is old
+    assert old.status == "stopped"
+    assert set(snapshot) == {1, 2}
+
+
+def test_get_torrents_raw():
+    torrents = [{"name": "a"}]
+    m = mock.Mock(return_value={"torrents": torrents})
+    with mock.patch("transmission_rpc.client.Client._request", m), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        c = Client()
+        assert c.get_torrents(arguments=["name"], raw=True) is torrents
+        m.assert_called_with("torrent-get", {"fields": ["name"]}, None, timeout=None)
+
+        # empty arguments fall back to all fields, same as without raw
+        c.get_torrents(arguments=[], raw=True)
+        fields = m.call_args.args[1]["fields"]
+        assert "name" in fields
+        assert "hashString" in fields
+
+
+def test_get_torrents_bytes():
+    body = b'{"arguments":{"torrents":[]},"result":"success"}'
+    m = mock.Mock(return_value=body)
+    with mock.patch("transmission_rpc.client.Client._http_send", m), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        c = Client()
+        assert c.get_torrents_bytes(3, arguments=["name"]) is body
+        m.assert_called_with({"method": "torrent-get", "arguments": {"fields": ["name"], "ids": [3]}}, None)
+
+        c.get_torrents_bytes(arguments=[])
+        assert "hashString" in m.call_args.args[0]["arguments"]["fields"]
+
+
+def test_prepare():
+    body = b'{"arguments":{"torrents":[]},"result":"success"}'
+    m = mock.Mock(return_value=body)
+    with mock.patch("transmission_rpc.client.Client._http_post", m), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        c = Client()
+        prepared = c.prepare(RpcMethod.TorrentGet, {"fields": ["id"]}, ids=[1, torrent_hash])
+        assert prepared.body == b'{"method":"torrent-get","arguments":{"fields":["id"],"ids":[1,"%s"]}}' % (
+            torrent_hash.encode()
+        )
+        assert prepared.send() == {"torrents": []}
+        assert prepared() == {"torrents": []}
+
+    m.assert_called_with(prepared.body, None)
+
+
+def test_id_cache():
+    responses = [
+        {"torrents": [{"id": 1, "hashString": torrent_hash}, {"id": 2, "hashString": torrent_hash2}]},
+        {},
+        {},
+        {"cumulative-stats": {"sessionCount": 1}},
+        {},
+        {"cumulative-stats": {"sessionCount": 2}},
+        {},
+    ]
+    sent = []
+
+    def http_query(query, timeout=None):
+        sent.append(query["arguments"].get("ids"))
+        return json.dumps({"result": "success", "arguments": responses.pop(0)})
+
+    with mock.patch("transmission_rpc.client.Client._http_query", side_effect=http_query), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        c = Client(id_cache=True)
+        c.get_torrents(arguments=["id", "hashString"])
+        assert c.cached_torrent_id(torrent_hash2) == 2
+        c.stop_torrent([torrent_hash, torrent_hash2, 3])
+        c.remove_torrent(torrent_hash2)
+        c.session_stats()
+        c.start_torrent([torrent_hash, torrent_hash2])
+        c.session_stats()
+        c.start_torrent([torrent_hash])
+
+    assert sent == [None, [1, 2, 3], [2], None, [1, torrent_hash2], None, [torrent_hash]]
+
+
+def test_id_cache_daemon_restart():
+    with FakeDaemon(torrents=2).serve_http() as daemon, daemon.client(id_cache=True) as c:
+        first, _ = c.get_torrents(arguments=["id", "hashString"])
+        for torrent in daemon.torrents.values():
+            torrent["status"] = 4
+
+        # daemon restarted, torrents got new ids
+        daemon.session_id = "restarted"
+        daemon.torrents = {1: daemon.torrents[2], 2: daemon.torrents[1]}
+        daemon.torrents[1]["id"] = 1
+        daemon.torrents[2]["id"] = 2
+
+        c.stop_torrent(first.hashString)
+
+        assert daemon.torrents[2]["hashString"] == first.hashString
+        assert daemon.torrents[2]["status"] == 0
+        assert daemon.torrents[1]["status"] != 0
+
+
+def test_add_torrent_known_hash():
+    iso = pathlib.Path(__file__).parent.joinpath("fixtures/iso.torrent")
+    responses = [
+        {"torrents": [{"id": 7, "hashString": torrent_hash}]},
+        {"torrent-added": {"id": 8, "hashString": torrent_hash2, "name": "other"}},
+        {"torrent-duplicate": {"id": 7, "hashString": torrent_hash, "name": "iso"}},
+        {"torrent-duplicate": {"id": 7, "hashString": torrent_hash, "name": "iso"}},
+    ]
+    methods = []
+
+    def http_query(query, timeout=None):
+        methods.append(query["method"])
+        return json.dumps({"result": "success", "arguments": responses.pop(0)})
+
+    with mock.patch("transmission_rpc.client.Client._http_query", side_effect=http_query), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        c = Client(id_cache=True)
+        c.get_torrents(arguments=["id", "hashString"])
+
+        for torrent in [iso, iso.read_bytes(), f"magnet:?xt=urn:btih:{torrent_hash}"]:
+            known = c.add_torrent(torrent, skip_known=True)
+            assert known.id == 7
+            assert known.hashString == torrent_hash
+
+        assert c.add_torrent(f"magnet:?xt=urn:btih:{torrent_hash2}", skip_known=True).id == 8
+        # not skipped by default
+        assert c.add_torrent(iso.read_bytes()).id == 7
+        # file-like object is not read to compute info hash
+        with iso.open("rb") as f, mock.patch("transmission_rpc.client.Client._http_post") as post:
+            post.return_value = json.dumps({"result": "success", "arguments": responses.pop(0)}).encode()
+            assert c.add_torrent(f, skip_known=True).id == 7
+            post.assert_called_once()
+
+    assert methods == ["torrent-get", "torrent-add", "torrent-add"]
+
+
+def test_add_torrents():
+    iso = pathlib.Path(__file__).parent.joinpath("fixtures/iso.torrent")
+    responses = {
+        "magnet:?xt=urn:btih:" + torrent_hash2: {"torrent-added": {"id": 2, "hashString": torrent_hash2, "name": "b"}},
+        "https://example.com/a.torrent": {"torrent-duplicate": {"id": 3, "hashString": "a" * 40, "name": "c"}},
+    }
+
+    def http_post(body, timeout=None):
+        content = body if isinstance(body, bytes) else b"".join(body)
+        assert len(content) == len(body)
+        arguments = json.loads(content)["arguments"]
+        assert arguments["paused"] is True
+        if "metainfo" in arguments:
+            assert base64.b64decode(arguments["metainfo"]) == iso.read_bytes()
+            res = {"torrent-added": {"id": 1, "hashString": torrent_hash, "name": "a"}}
+        else:
+            res = responses[arguments["filename"]]
+        return json.dumps({"result": "success", "arguments": res}).encode()
+
+    with mock.patch("transmission_rpc.client.Client._http_post", side_effect=http_post), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        c = Client(pool_maxsize=2)
+        sources = [iso, "magnet:?xt=urn:btih:" + torrent_hash2, "https://example.com/a.torrent", b""]
+        results = c.add_torrents(iter(sources), workers=2, max_pending=2, paused=True)
+
+    assert [r.source for r in results] == sources
+    assert [r.status for r in results] == ["added", "added", "duplicate", "error"]
+    assert [r.torrent.id for r in results[:3]] == [1, 2, 3]
+    assert isinstance(results[3].error, ValueError)
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 196607, 196608, 196609, 500000])
+def test_base64_json_body(tmp_path: pathlib.Path, size: int):
+    content = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    p = tmp_path.joinpath("a.torrent")
+    p.write_bytes(content)
+
+    with p.open("rb") as f:
+        f.read(0)
+        for source in [p, f]:
+            body = Base64JsonBody(b'{"metainfo":"', source, b'"}')
+            assert body.size == size
+            for _ in range(2):  # body is sent again after 409
+                encoded = b"".join(body)
+                assert len(encoded) == len(body)
+                assert base64.b64decode(json.loads(encoded)["metainfo"]) == content
+
+
+def test_add_torrent_streaming():
+    iso = pathlib.Path(__file__).parent.joinpath("fixtures/iso.torrent")
+    m = mock.Mock(
+        return_value=json.dumps(
+            {"result": "success", "arguments": {"torrent-added": {"id": 1, "hashString": torrent_hash}}}
+        ).encode()
+    )
+    with mock.patch("transmission_rpc.client.Client._http_post", m), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        c = Client()
+        with iso.open("rb") as f:
+            for torrent in [iso, f]:
+                assert c.add_torrent(torrent, labels=["a"]).id == 1
+                body = m.call_args[0][0]
+                assert isinstance(body, Base64JsonBody)
+                assert json.loads(b"".join(body)) == {
+                    "method": "torrent-add",
+                    "arguments": {"labels": ["a"], "metainfo": base64.b64encode(iso.read_bytes()).decode()},
+                }
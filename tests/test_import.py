@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+def loaded_modules(statement: str) -> set[str]:
+    """modules imported by ``statement`` in a fresh interpreter"""
+    code = f"import sys\nbefore = set(sys.modules)\n{statement}\nprint(json.dumps(sorted(set(sys.modules) - before)))"
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", "import json\n" + code], capture_output=True, check=True, text=True
+    ).stdout
+    return set(json.loads(output))
+
+
+def test_lazy_import():
+    modules = loaded_modules("import transmission_rpc")
+    assert not modules & {"urllib3", "certifi", "importlib.metadata", "transmission_rpc.client"}
+
+
+@pytest.mark.parametrize("name", ["Torrent", "Session", "TransmissionError", "File"])
+def test_lazy_import_without_client(name: str):
+    modules = loaded_modules(f"from transmission_rpc import {name}")
+    assert "transmission_rpc.client" not in modules
+    assert "urllib3" not in modules
+
+
+def test_import_client():
+    # urllib3 2.x imports importlib.metadata itself
+    modules = loaded_modules("from transmission_rpc import Client")
+    assert not modules & {"asyncio", "certifi", "transmission_rpc.metrics"}
+
+
+def test_lazy_attributes():
+    import transmission_rpc  # noqa: PLC0415
+
+    for name in transmission_rpc.__all__:
+        assert getattr(transmission_rpc, name) is not None
+    assert set(transmission_rpc.__all__) <= set(dir(transmission_rpc))
+    with pytest.raises(AttributeError):
+        transmission_rpc.NotExists  # noqa: B018
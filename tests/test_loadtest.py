@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from transmission_rpc import TransmissionError, loadtest
+from transmission_rpc.testing import FakeDaemon
+
+
+def test_parse_mix():
+    assert loadtest.parse_mix("get_minimal=3,stats") == {"get_minimal": 3, "stats": 1}
+    with pytest.raises(ValueError, match="unknown operation"):
+        loadtest.parse_mix("get_everything=1")
+
+
+def test_run():
+    daemon = FakeDaemon(torrents=20)
+    result = loadtest.run(
+        daemon.client, loadtest.parse_mix(loadtest.DEFAULT_MIX + ",change=20"), threads=2, duration=0.3, pool=3
+    )
+    ops = {op.name: op for op in result.operations}
+    assert ops["get_minimal"].requests > 0
+    assert ops["change"].requests > 0
+    assert not any(op.errors for op in result.operations)
+    assert ops["stats"].latency["p50"] <= ops["stats"].latency["max"]
+    # torrents added by load test are removed
+    assert len(daemon.torrents) == 20
+
+
+def test_run_rate():
+    daemon = FakeDaemon(torrents=1)
+    result = loadtest.run(daemon.client, {"stats": 1}, threads=2, duration=0.5, rate=20)
+    assert 5 <= result.operations[0].requests <= 11
+
+
+def test_errors():
+    daemon = FakeDaemon(torrents=1, error_rate=1, error_methods=["session-stats"])
+    result = loadtest.run(daemon.client, {"stats": 1}, threads=1, duration=0.1)
+    assert result.operations[0].errors == {"TransmissionError": result.operations[0].requests}
+    assert "error rate 100.00%" in loadtest.format_result(result)
+
+
+def test_unexpected_error(monkeypatch):
+    def broken(client, ctx):
+        raise KeyError("torrents")
+
+    monkeypatch.setitem(loadtest.OPERATIONS, "stats", broken)
+    daemon = FakeDaemon(torrents=1)
+    result = loadtest.run(daemon.client, {"stats": 1, "get_minimal": 1}, threads=1, duration=0.1)
+    ops = {op.name: op for op in result.operations}
+    assert ops["stats"].errors == {"KeyError": ops["stats"].requests}
+    assert ops["get_minimal"].requests > 0
+
+
+def reject_constant(name):
+    raise ValueError(f"invalid json constant {name}")
+
+
+def test_all_failed_json(monkeypatch, capsys):
+    def broken(client, ctx):
+        raise TransmissionError("failed")
+
+    monkeypatch.setitem(loadtest.OPERATIONS, "stats", broken)
+    loadtest.main(["--fake", "1", "--mix", "stats", "--duration", "0.1", "--threads", "1", "--json"])
+    output = json.loads(capsys.readouterr().out, parse_constant=reject_constant)
+    (op,) = output["operations"]
+    assert op["errors"] == {"TransmissionError": op["requests"]}
+    assert set(op["latency"].values()) == {None}
+
+    loadtest.main(["--fake", "1", "--mix", "stats", "--duration", "0.1", "--threads", "1"])
+    row = capsys.readouterr().out.splitlines()[2]
+    assert row.split()[-5:] == ["-"] * 5
+
+
+def test_empty_pool(capsys):
+    with pytest.raises(ValueError, match="pool"):
+        loadtest.run(FakeDaemon().client, {"change": 1}, pool=0)
+    with pytest.raises(SystemExit):
+        loadtest.main(["--fake", "10", "--mix", "change=1", "--pool", "0"])
+    assert "--pool must be positive" in capsys.readouterr().err
+
+
+def test_main(capsys):
+    loadtest.main(["--fake", "10", "--duration", "0.2", "--threads", "1", "--json"])
+    output = json.loads(capsys.readouterr().out)
+    assert {op["name"] for op in output["operations"]} <= set(loadtest.OPERATIONS)
@@ -0,0 +1,124 @@
+import base64
+import functools
+import hashlib
+import pathlib
+from typing import Any
+
+import pytest
+
+from transmission_rpc.metainfo import MetainfoFile, TorrentMetainfo, bdecode, parse_magnet
+
+iso_torrent = pathlib.Path(__file__).parent.joinpath("fixtures/iso.torrent")
+iso_hash = "e84213a794f3ccd890382a54a64ca68b7e925433"
+
+
+def bencode(value: Any) -> bytes:
+    if isinstance(value, int):
+        return b"i%de" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"%d:%s" % (len(value), value)
+    if isinstance(value, list):
+        return b"l" + b"".join(bencode(v) for v in value) + b"e"
+    return b"d" + b"".join(bencode(k) + bencode(v) for k, v in sorted(value.items())) + b"e"
+
+
+def test_bdecode():
+    assert bdecode(b"d1:ai-3e1:bl4:spami0eee") == {b"a": -3, b"b": [b"spam", 0]}
+
+
+@pytest.mark.parametrize("data", [b"", b"i1", b"l", b"d1:ai1e", b"5:ab", b"x", b"i1ei2e", b"di1ei1ee"])
+def test_bdecode_invalid(data):
+    with pytest.raises(ValueError, match="invalid bencode data"):
+        bdecode(data)
+
+
+def test_bdecode_nested():
+    assert bdecode(b"l" * 200 + b"e" * 200) == functools.reduce(lambda v, _: [v], range(199), [])
+    with pytest.raises(ValueError, match="nested deeper"):
+        bdecode(b"l" * 5000 + b"e" * 5000)
+    with pytest.raises(ValueError, match="nested deeper"):
+        TorrentMetainfo(b"d4:info" + b"l" * 5000)
+
+
+@pytest.mark.parametrize("data", [b"l-3:e", b"-1:a", b"l0-1:e", b"3 :abc", b"d1:a+1:ae"])
+def test_bdecode_invalid_string_length(data):
+    with pytest.raises(ValueError, match="invalid bencode data"):
+        bdecode(data)
+
+
+@pytest.mark.parametrize(
+    "info",
+    [
+        {"pieces": "", "files": [1]},
+        {"pieces": "", "files": 1},
+        {"pieces": "", "files": [{"path": [1], "length": 1}]},
+        {"pieces": "", "files": [{"path": ["a"]}]},
+        {"pieces": "", "name": 1, "length": 1},
+        {"pieces": "", "length": "1"},
+        {"pieces": "", "length": 1, "piece length": "1"},
+        {"meta version": 2, "file tree": {"a": 1}},
+        {"meta version": 2, "file tree": {"a": {"": {"length": -1}}}},
+    ],
+)
+def test_invalid_metainfo(info):
+    with pytest.raises(ValueError, match="invalid torrent metainfo"):
+        TorrentMetainfo(bencode({"info": info}))
+
+
+def test_from_file():
+    meta = TorrentMetainfo.from_file(iso_torrent)
+    assert meta.info_hash == iso_hash
+    assert meta.info_hash_v2 is None
+    assert meta.files == [MetainfoFile(id=0, name="ubuntu-18.04.1-desktop-amd64.iso", size=1953349632)]
+    assert TorrentMetainfo(iso_torrent.read_bytes()).info_hash == iso_hash
+
+
+def test_multi_file():
+    info = {
+        "name": "dir",
+        "piece length": 16384,
+        "pieces": b"\0" * 20,
+        "files": [
+            {"length": 1, "path": ["a", "1.txt"]},
+            {"length": 16383, "path": [".pad", "16383"], "attr": "p"},
+            {"length": 2, "path": ["2.txt"]},
+        ],
+    }
+    meta = TorrentMetainfo(bencode({"announce": "http://tracker", "info": info}))
+    assert meta.info_hash == hashlib.sha1(bencode(info)).hexdigest()  # noqa: S324
+    assert meta.files == [MetainfoFile(0, "dir/a/1.txt", 1), MetainfoFile(1, "dir/2.txt", 2)]
+    assert meta.total_size == 3
+
+
+def test_v2_only():
+    info = {
+        "name": "dir",
+        "meta version": 2,
+        "piece length": 16384,
+        "file tree": {"b.txt": {"": {"length": 2}}, "a": {"1.txt": {"": {"length": 1}}}},
+    }
+    meta = TorrentMetainfo(bencode({"info": info}))
+    assert meta.info_hash is None
+    assert meta.info_hash_v2 == hashlib.sha256(bencode(info)).hexdigest()
+    assert [f.name for f in meta.files] == ["dir/a/1.txt", "dir/b.txt"]
+
+
+def test_missing_info():
+    with pytest.raises(ValueError, match="missing info dict"):
+        TorrentMetainfo(bencode({"announce": "http://tracker"}))
+
+
+def test_parse_magnet():
+    b32 = base64.b32encode(bytes.fromhex(iso_hash)).decode()
+    v2 = "a" * 64
+    magnet = parse_magnet(f"magnet:?xt=urn:btih:{b32}&xt=urn:btmh:1220{v2}&dn=ubuntu")
+    assert magnet.info_hash == iso_hash
+    assert magnet.info_hash_v2 == v2
+    assert magnet.name == "ubuntu"
+
+    assert parse_magnet(f"magnet:?xt=urn:btih:{iso_hash.upper()}").info_hash == iso_hash
+
+    with pytest.raises(ValueError, match="no info hash"):
+        parse_magnet("magnet:?dn=ubuntu")
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import urllib.request
+
+import pytest
+
+from transmission_rpc import Client, TransmissionAuthError, TransmissionConnectError, TransmissionTimeoutError
+from transmission_rpc.metrics import CONTENT_TYPE, Metrics, MetricsServer
+from transmission_rpc.testing import FakeDaemon
+from transmission_rpc.transport import SocketTransport
+
+
+def samples(text: str) -> dict[str, float]:
+    return {
+        name: float(value)
+        for name, _, value in (line.rpartition(" ") for line in text.splitlines() if not line.startswith("#"))
+    }
+
+
+def test_metrics_render():
+    metrics = Metrics(buckets=[0.001, 10], labels={"daemon": 'a"b'})
+    with FakeDaemon(torrents=10).serve_http() as daemon, daemon.client(metrics=metrics) as c:
+        assert c.metrics is metrics
+        c.get_torrents()
+        c.get_torrents()
+
+    text = metrics.render()
+    assert "# TYPE transmission_rpc_request_duration_seconds histogram" in text
+    s = samples(text)
+    assert s['transmission_rpc_request_duration_seconds_bucket{daemon="a\\"b",method="torrent-get",le="10.0"}'] == 2
+    assert s['transmission_rpc_request_duration_seconds_bucket{daemon="a\\"b",method="torrent-get",le="+Inf"}'] == 2
+    assert s['transmission_rpc_request_duration_seconds_count{daemon="a\\"b",method="torrent-get"}'] == 2
+    assert s['transmission_rpc_request_duration_seconds_sum{daemon="a\\"b",method="torrent-get"}'] > 0
+    assert s['transmission_rpc_response_bytes_total{daemon="a\\"b",method="torrent-get"}'] > 1000
+    assert s['transmission_rpc_request_bytes_total{daemon="a\\"b",method="session-get"}'] > 0
+    # first request of the client negotiates session id
+    assert s['transmission_rpc_retries_total{daemon="a\\"b",method="session-get"}'] == 1
+    assert s['transmission_rpc_session_id_rotations_total{daemon="a\\"b"}'] == 0
+
+    metrics.reset()
+    assert samples(metrics.render()) == {'transmission_rpc_session_id_rotations_total{daemon="a\\"b"}': 0}
+
+
+def test_metrics_session_id_rotation():
+    metrics = Metrics()
+    with FakeDaemon().serve_http() as daemon, daemon.client(metrics=metrics) as c:
+        daemon.session_id = "restarted"
+        c.session_stats()
+
+    assert metrics.session_id_rotations == 1
+    s = samples(metrics.render())
+    assert s["transmission_rpc_session_id_rotations_total"] == 1
+    assert s['transmission_rpc_retries_total{method="session-stats"}'] == 1
+
+
+def test_metrics_errors(tmp_path):
+    metrics = Metrics()
+
+    daemon = FakeDaemon(username="user", password="pass").serve_http()  # noqa: S106
+    with daemon, pytest.raises(TransmissionAuthError):
+        daemon.client(password="wrong", metrics=metrics)  # noqa: S106
+
+    daemon = FakeDaemon(latency=1).serve_http()
+    with daemon, daemon.client(metrics=metrics) as c, pytest.raises(TransmissionTimeoutError):
+        c.session_stats(timeout=0.1)
+
+    with pytest.raises(TransmissionConnectError):
+        Client(transport=SocketTransport(str(tmp_path / "missing.sock")), metrics=metrics)
+
+    assert metrics.errors() == {
+        ("session-get", "TransmissionAuthError"): 1,
+        ("session-get", "TransmissionConnectError"): 1,
+        ("session-stats", "TransmissionTimeoutError"): 1,
+    }
+    s = samples(metrics.render())
+    assert s['transmission_rpc_errors_total{method="session-stats",error="TransmissionTimeoutError"}'] == 1
+
+
+def test_metrics_server():
+    metrics = Metrics()
+    with FakeDaemon().client(metrics=metrics), MetricsServer(metrics) as server:
+        r = urllib.request.urlopen(server.url)  # noqa: S310
+        with r:
+            assert r.headers["content-type"] == CONTENT_TYPE
+            body = r.read().decode()
+    assert body == metrics.render()
+    assert 'transmission_rpc_request_duration_seconds_count{method="session-get"} 1' in body
@@ -1,10 +1,18 @@
 import pytest
 
-from transmission_rpc.client import _parse_torrent_id, _parse_torrent_ids
+from transmission_rpc.client import TorrentIds, _parse_torrent_id, _parse_torrent_ids
+from transmission_rpc.torrent import Torrent
 
 example_hash = "51ba7d0dd45ab9b9564329c33f4f97493b677924"
 
 
+def torrent_without_ids() -> Torrent:
+    # `id` is required when a torrent is created, but `fields` may be changed later
+    torrent = Torrent(fields={"id": 1, "name": "a"})
+    del torrent.fields["id"]
+    return torrent
+
+
 @pytest.mark.parametrize("arg", [float(1), "non-hash-string"])
 def test_parse_id_raise(arg):
     with pytest.raises(ValueError, match=f"{arg} is not valid torrent id"):
@@ -19,13 +27,48 @@ def test_parse_id_raise(arg):
         ((2, example_hash), [2, example_hash]),
         (3, [3]),
         (None, []),
+        ([example_hash, example_hash], [example_hash, example_hash]),
+        ({example_hash}, [example_hash]),
+        ({1: None, 2: None}, [1, 2]),
+        (Torrent(fields={"id": 1, "hashString": example_hash}), [example_hash]),
+        ([Torrent(fields={"id": 1}), 2], [1, 2]),
+        (TorrentIds([1, example_hash]), [1, example_hash]),
     ],
 )
 def test_parse_torrent_ids(arg, expected):
     assert _parse_torrent_ids(arg) == expected, f"parse_torrent_ids({arg}) != {expected}"
 
 
-@pytest.mark.parametrize("arg", ["not-recently-active", "non-hash-string", -1, 1.1, "5:10", "5,6,8,9,10"])
+@pytest.mark.parametrize(
+    "arg",
+    [
+        "not-recently-active",
+        "non-hash-string",
+        -1,
+        1.1,
+        "5:10",
+        "5,6,8,9,10",
+        [example_hash, example_hash.upper()],
+        [example_hash, example_hash[:39] + "g"],
+        [example_hash[:20], example_hash + example_hash[:20]],
+        [example_hash[:-1] + "é"],
+        torrent_without_ids(),
+        [1, torrent_without_ids()],
+    ],
+)
 def test_parse_torrent_ids_value_error(arg):
     with pytest.raises(ValueError, match="torrent id"):
         _parse_torrent_ids(arg)
+
+
+def test_torrent_ids():
+    ids = TorrentIds(x for x in [1, example_hash])
+    assert ids == (1, example_hash)
+    assert repr(ids) == f"TorrentIds([1, {example_hash!r}])"
+    assert _parse_torrent_ids(ids) == [1, example_hash]
+
+    with pytest.raises(ValueError, match="torrent id"):
+        TorrentIds(["non-hash-string"])
+
+    with pytest.raises(ValueError, match="recently-active"):
+        TorrentIds("recently-active")
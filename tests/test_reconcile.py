@@ -0,0 +1,157 @@
+import json
+from unittest import mock
+
+import pytest
+
+from transmission_rpc import Priority, QueueMove, TorrentChangeBatch
+from transmission_rpc._reconcile import plan_queue_moves, plan_torrent_changes
+from transmission_rpc.client import Client
+from transmission_rpc.constants import RpcMethod
+
+example_hash = "51ba7d0dd45ab9b9564329c33f4f97493b677924"
+
+
+def test_plan_torrent_changes():
+    current = {
+        1: {"labels": ["a"], "seedRatioLimit": 1.0},
+        2: {"labels": ["a"], "seedRatioLimit": 2.0},
+        3: {"labels": [], "seedRatioLimit": 1.0},
+        4: {"labels": [], "seedRatioLimit": 1.0},
+        5: {"labels": ["b"], "bandwidthPriority": 1},
+    }
+    desired = {
+        1: {"labels": ["a"], "seed_ratio_limit": 2.0},
+        2: {"labels": ["a"], "seed_ratio_limit": 2.0},
+        3: {"labels": ("a",), "seed_ratio_limit": 2},
+        4: {"labels": ["a"], "seed_ratio_limit": 2.0},
+        5: {"labels": "b", "bandwidth_priority": Priority.High},
+        6: {"labels": ["a"]},
+    }
+
+    assert plan_torrent_changes(desired, current) == [
+        TorrentChangeBatch(ids=[1], arguments={"seed_ratio_limit": 2.0}),
+        TorrentChangeBatch(ids=[3, 4], arguments={"labels": ["a"], "seed_ratio_limit": 2}),
+    ]
+
+
+def test_reconcile_torrents():
+    m = mock.Mock(
+        return_value={
+            "torrents": [
+                {"id": 1, "hashString": example_hash, "labels": [], "group": ""},
+                {"id": 2, "hashString": "0" * 40, "labels": [], "group": ""},
+                {"id": 3, "hashString": "1" * 40, "labels": ["a"], "group": "g"},
+            ]
+        }
+    )
+    with mock.patch("transmission_rpc.client.Client._request", m), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        c = Client()
+        batches = c.reconcile_torrents(
+            {
+                example_hash: {"labels": ["a"], "group": "g"},
+                2: {"labels": ["a"], "group": "g"},
+                3: {"labels": ["a"], "group": "g"},
+            }
+        )
+
+    assert batches == [TorrentChangeBatch(ids=[1, 2], arguments={"labels": ["a"], "group": "g"})]
+    m.assert_called_with("torrent-set", {"labels": ["a"], "group": "g"}, [1, 2], True, timeout=None)
+
+
+def test_reconcile_torrents_unsupported():
+    with mock.patch("transmission_rpc.client.Client._request"), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ), pytest.raises(ValueError, match="location"):
+        Client().reconcile_torrents({1: {"location": "/"}})
+
+
+def test_reconcile_session():
+    sent = []
+
+    def http_query(query, timeout=None):
+        sent.append((query["method"], query["arguments"]))
+        arguments = {}
+        if query["method"] == "session-get":
+            arguments = {
+                "version": "4.0.5",
+                "rpc-version": 17,
+                "download-dir": "/data",
+                "speed-limit-down": 100,
+                "seedRatioLimit": 2.0,
+                "default-trackers": "",
+            }
+            arguments = {key: value for key, value in arguments.items() if key in query["arguments"]["fields"]}
+        return json.dumps({"result": "success", "arguments": arguments})
+
+    with mock.patch("transmission_rpc.client.Client._http_query", side_effect=http_query):
+        c = Client()
+        sent.clear()
+        desired = {"download_dir": "/data", "speed_limit_down": 200, "seed_ratio_limit": 2, "default_trackers": []}
+
+        assert c.reconcile_session(desired) == {"speed_limit_down": (100, 200)}
+        assert sent == [
+            ("session-get", {"fields": ["download-dir", "speed-limit-down", "seedRatioLimit", "default-trackers"]}),
+            ("session-set", {"speed-limit-down": 200}),
+        ]
+
+        sent.clear()
+        assert c.reconcile_session(desired) == {}
+        assert sent == [], "cached session should be used and nothing should be sent"
+
+        with pytest.raises(ValueError, match="unknown session parameter"):
+            c.reconcile_session({"not_a_parameter": 1})
+
+
+def _apply_queue_moves(order, moves):
+    for method, ids in moves:
+        moved = [x for x in order if x in set(ids)]
+        rest = [x for x in order if x not in set(ids)]
+        order = moved + rest if method == RpcMethod.QueueMoveTop else rest + moved
+    return order
+
+
+@pytest.mark.parametrize(
+    ("current", "target"),
+    [
+        ([1, 2, 3], [1, 2, 3]),
+        ([1, 2, 3], [3]),
+        ([1, 2, 3, 4, 5], [5, 4, 3, 2, 1]),
+        ([5, 1, 4, 2, 3], [1, 2]),
+        (list(range(100)), [(x * 37) % 100 for x in range(100)]),
+    ],
+)
+def test_plan_queue_moves(current, target):
+    positions = {torrent_id: position for position, torrent_id in enumerate(current)}
+    moves = plan_queue_moves(target, positions)
+    final = _apply_queue_moves(current, moves)
+
+    assert final == target + [x for x in current if x not in target]
+    assert len(moves) <= max(len(current) - 1, 1).bit_length()
+
+
+def test_plan_queue_moves_sorted():
+    assert plan_queue_moves([1, 2], {1: 0, 2: 1, 3: 2}) == []
+
+
+def test_reorder_queue():
+    queue = [3, 1, 2]
+    timeouts = []
+
+    def request(method, arguments=None, ids=None, require_ids=False, timeout=None):
+        nonlocal queue
+        timeouts.append(timeout)
+        if method == "torrent-get":
+            return {"torrents": [{"id": x, "hashString": f"{x}" * 40, "queuePosition": queue.index(x)} for x in queue]}
+        queue = _apply_queue_moves(queue, [(method, ids)])
+        return {}
+
+    with mock.patch("transmission_rpc.client.Client._request", side_effect=request), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        moves = Client().reorder_queue(["1" * 40, 2, 3], timeout=5)
+
+    assert queue == [1, 2, 3]
+    assert timeouts == [5, 5, 5]
+    assert moves == [QueueMove(RpcMethod.QueueMoveBottom, [3])]
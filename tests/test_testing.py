@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import pathlib
+
+import pytest
+
+from transmission_rpc import TransmissionAuthError, TransmissionError
+from transmission_rpc.constants import TORRENT_GET_ARGS, RpcMethod
+from transmission_rpc.testing import FakeDaemon
+from transmission_rpc.transport import SocketTransport
+
+
+def test_fake_daemon_deterministic():
+    a = FakeDaemon(torrents=20, files=3, peers=2, seed=1).client().get_torrents()
+    b = FakeDaemon(torrents=20, files=3, peers=2, seed=1).client().get_torrents()
+    assert [t.fields for t in a] == [t.fields for t in b]
+    assert len(a) == 20
+    assert len(a[0].get_files()) == 3
+    assert len(a[0].peers) == 2
+
+
+def test_fake_daemon_all_fields():
+    daemon = FakeDaemon(torrents=1, files=2, peers=1, trackers=2)
+    with daemon.client() as c:
+        torrent = c.get_torrent(1)
+    assert {k for k, v in TORRENT_GET_ARGS.items() if v.added_version <= 17 and v.removed_version is None} <= set(
+        torrent.fields
+    )
+    assert torrent.tracker_list == [t.announce for t in torrent.trackers]
+    assert torrent.total_size == sum(f.size for f in torrent.get_files())
+    assert len(torrent.tracker_stats) == 2
+
+
+def test_fake_daemon_all_methods():
+    methods = {m.value for m in RpcMethod}
+    handlers = {name[len("_rpc_") :].replace("_", "-") for name in dir(FakeDaemon) if name.startswith("_rpc_")}
+    assert methods <= handlers
+
+
+def test_fake_daemon_methods():
+    c = FakeDaemon(torrents=3).client()
+
+    added = c.add_torrent(pathlib.Path("tests/fixtures/iso.torrent"), paused=True, labels=["a"])
+    assert c.add_torrent(pathlib.Path("tests/fixtures/iso.torrent")).id == added.id
+    torrent = c.get_torrent(added.id)
+    assert torrent.status == "stopped"
+    assert torrent.labels == ["a"]
+
+    c.start_torrent(added.id)
+    assert c.get_torrent(added.id).status == "downloading"
+    c.change_torrent(added.id, files_unwanted=[0], priority_high=[0])
+    file = c.get_torrent(added.id).get_files()[0]
+    assert (file.selected, file.priority) == (False, 1)
+
+    c.queue_top(added.id)
+    assert c.get_torrent(added.id).queue_position == 0
+    c.queue_down(added.id)
+    assert c.get_torrent(added.id).queue_position == 1
+
+    c.remove_torrent(1)
+    assert [t.id for t in c.get_torrents()] == [2, 3, added.id]
+
+    c.set_group("g", speed_limit_down=10, speed_limit_down_enabled=True)
+    assert c.get_group("g").speed_limit_down == 10
+    assert c.free_space("/downloads") == 1 << 40
+    assert c.session_stats().torrent_count == 3
+
+
+def test_fake_daemon_error_injection():
+    c = FakeDaemon(torrents=1, error_rate=1, error_methods=["torrent-get"]).client()
+    c.get_session()
+    with pytest.raises(TransmissionError, match="injected error"):
+        c.get_torrents()
+
+
+def test_fake_daemon_http():
+    with FakeDaemon(torrents=2, username="u", password="p").serve_http() as daemon:  # noqa: S106
+        with daemon.client() as c:
+            assert len(c.get_torrents()) == 2
+        with pytest.raises(TransmissionAuthError):
+            daemon.client(password="wrong")  # noqa: S106
+
+
+def test_fake_daemon_unix(tmp_path):
+    path = str(tmp_path.joinpath("rpc.sock"))
+    with FakeDaemon(torrents=2).serve_unix(path) as daemon:
+        with daemon.client() as c:
+            assert len(c.get_torrents()) == 2
+        with daemon.client(transport=SocketTransport(path)) as c:
+            assert len(c.get_torrents()) == 2
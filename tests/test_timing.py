@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from transmission_rpc import RequestTiming, TransmissionError
+from transmission_rpc.constants import RpcMethod
+from transmission_rpc.metrics import Metrics
+from transmission_rpc.testing import FakeDaemon
+from transmission_rpc.transport import SocketTransport
+
+
+def test_timing_disabled():
+    with FakeDaemon(torrents=2).client() as c:
+        c.get_torrents()
+        assert c.recent_timings == []
+
+
+def test_timing_history():
+    with FakeDaemon(torrents=5, files=3).serve_http() as daemon, daemon.client(timing_history=2) as c:
+        assert [t.method for t in c.recent_timings] == [RpcMethod.SessionGet]
+        first = c.recent_timings[0]
+        # first request is sent again with session id
+        assert first.retries == 1
+
+        c.get_torrents()
+        c.session_stats()
+        timings = c.recent_timings
+        assert [t.method for t in timings] == [RpcMethod.TorrentGet, RpcMethod.SessionStats]
+
+        t = timings[0]
+        assert isinstance(t, RequestTiming)
+        assert t.retries == 0
+        assert t.connection_reused is True
+        assert t.error is None
+        assert t.request_bytes > 0
+        assert t.response_bytes > 1000
+        assert t.network > 0
+        assert t.serialize > 0
+        assert t.decode > 0
+        assert t.build > 0
+        assert t.total == pytest.approx(t.serialize + t.network + t.decode + t.build)
+        assert t.started_at >= first.started_at
+
+
+def test_timing_socket_transport_connection_reused(tmp_path):
+    path = str(tmp_path / "rpc.sock")
+    with FakeDaemon().serve_unix(path) as daemon:
+        transport = SocketTransport(path)
+        with daemon.client(transport=transport, timing_history=10) as c:
+            assert c.recent_timings[0].connection_reused is True  # retry after 409
+            transport.close()
+            c.session_stats()
+            c.session_stats()
+            assert [t.connection_reused for t in c.recent_timings[1:]] == [False, True]
+
+
+def test_timing_hook():
+    timings: list[RequestTiming] = []
+    with FakeDaemon(torrents=3).client() as c:
+        c.add_timing_hook(timings.append)
+        c.get_torrent(1)
+        c.refresh_torrents({t.id: t for t in c.get_torrents(arguments=["id", "name"])})
+        c.remove_timing_hook(timings.append)
+        c.get_torrents()
+
+        assert [t.method for t in timings] == [RpcMethod.TorrentGet] * 3
+        assert all(t.connection_reused is None for t in timings)
+
+        with pytest.raises(ValueError, match="not in list"):
+            c.remove_timing_hook(timings.append)
+
+
+def test_timing_raw():
+    timings: list[RequestTiming] = []
+    metrics = Metrics()
+    with FakeDaemon(torrents=3).client(metrics=metrics) as c:
+        c.add_timing_hook(timings.append)
+        assert len(c.get_torrents(raw=True)) == 3
+        body = c.get_torrents_bytes(arguments=["id"])
+
+    raw, raw_bytes = timings
+    assert raw.method == raw_bytes.method == RpcMethod.TorrentGet
+    assert raw.decode > 0
+    assert raw.response_bytes > 0
+    assert raw_bytes.response_bytes == len(body)
+    assert raw_bytes.serialize > 0
+    assert raw_bytes.network > 0
+    assert raw_bytes.decode == 0
+    assert 'transmission_rpc_request_duration_seconds_count{method="torrent-get"} 2' in metrics.render()
+
+
+def test_timing_hook_error(caplog):
+    def hook(timing: RequestTiming) -> None:
+        raise RuntimeError("hook")
+
+    with FakeDaemon(torrents=1).client() as c:
+        c.add_timing_hook(hook)
+        with caplog.at_level(logging.ERROR, logger="transmission-rpc"):
+            assert len(c.get_torrents()) == 1
+        assert caplog.records[0].exc_info[0] is RuntimeError
+
+
+def test_timing_error():
+    timings: list[RequestTiming] = []
+    with FakeDaemon(torrents=1, error_rate=1, error_methods=["torrent-start"]).client() as c:
+        c.add_timing_hook(timings.append)
+        with pytest.raises(TransmissionError):
+            c.start_torrent(1)
+
+    assert len(timings) == 1
+    assert isinstance(timings[0].error, TransmissionError)
+    assert timings[0].response_bytes > 0
+
+
+def test_timing_history_negative():
+    with pytest.raises(ValueError, match="timing_history"):
+        FakeDaemon().client(timing_history=-1)
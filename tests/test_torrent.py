@@ -103,3 +103,19 @@ def test_status():
     assert not Status("downloading").download_pending
     assert Status("download pending").download_pending
     assert Status("download pending") in {"download pending", "o"}
+
+
+def test_update():
+    torrent = transmission_rpc.Torrent(fields={"id": 1, "name": "a", "pieces": "gA==", "status": 0})
+    pieces = torrent.pieces
+    assert pieces.get(0)
+
+    assert torrent.update({"id": 1, "name": "a", "status": 4}) == {"status"}
+    assert torrent.status == "downloading"
+    assert torrent.pieces is pieces, "cached property should be kept"
+
+    assert torrent.update({"pieces": "AA=="}) == {"pieces"}
+    assert not torrent.pieces.get(0)
+
+    with pytest.raises(ValueError, match="can't update torrent 1"):
+        torrent.update({"id": 2})
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from transmission_rpc import TransmissionError
+from transmission_rpc.testing import FakeDaemon
+from transmission_rpc.tracing import OpenTelemetryTracer, RequestEvent, Tracer
+
+
+class RecordingTracer(Tracer):
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, RequestEvent]] = []
+        self.errors: list[Exception] = []
+
+    def before_request(self, event: RequestEvent) -> None:
+        event.span = len(self.calls)
+        self.calls.append(("before_request", event))
+
+    def on_retry(self, event: RequestEvent) -> None:
+        self.calls.append(("on_retry", event))
+
+    def after_response(self, event: RequestEvent) -> None:
+        self.calls.append(("after_response", event))
+
+    def on_error(self, event: RequestEvent, error: Exception) -> None:
+        self.calls.append(("on_error", event))
+        self.errors.append(error)
+
+
+def test_tracer_hooks():
+    tracer = RecordingTracer()
+    with FakeDaemon(torrents=3).serve_http() as daemon, daemon.client(tracer=tracer) as c:
+        assert c.tracer is tracer
+        assert [name for name, _ in tracer.calls] == ["before_request", "on_retry", "after_response"]
+        assert tracer.calls[0][1].method == "session-get"
+
+        tracer.calls.clear()
+        c.get_torrent(1, arguments=["id", "name"])
+        (_, event), (_, after) = tracer.calls
+        assert after is event
+        assert event.method == "torrent-get"
+        assert event.arguments == ["fields"]
+        assert event.ids == 1
+        assert event.span == 0
+        assert event.timing.build > 0
+        assert event.timing.response_bytes > 0
+
+        tracer.calls.clear()
+        c.get_recently_active_torrents()
+        assert tracer.calls[0][1].ids is None
+
+
+def test_tracer_error():
+    tracer = RecordingTracer()
+    with FakeDaemon(torrents=1, error_rate=1, error_methods=["torrent-stop"]).client(tracer=tracer) as c:
+        tracer.calls.clear()
+        with pytest.raises(TransmissionError):
+            c.stop_torrent([1])
+
+    assert [name for name, _ in tracer.calls] == ["before_request", "on_error"]
+    assert tracer.calls[1][1].timing.error is tracer.errors[0]
+    assert isinstance(tracer.errors[0], TransmissionError)
+
+
+def test_tracer_replaced():
+    tracer = RecordingTracer()
+    with FakeDaemon(torrents=1).client() as c:
+        c.session_stats()
+        c.tracer = tracer
+        c.session_stats()
+        c.tracer = None
+        c.session_stats()
+
+    assert [(name, event.method) for name, event in tracer.calls] == [
+        ("before_request", "session-stats"),
+        ("after_response", "session-stats"),
+    ]
+
+
+def test_tracer_exception(caplog):
+    class BrokenTracer(Tracer):
+        def before_request(self, event: RequestEvent) -> None:
+            raise RuntimeError("tracer")
+
+    with caplog.at_level(logging.ERROR, logger="transmission-rpc"), FakeDaemon().client(tracer=BrokenTracer()) as c:
+        c.session_stats()
+    assert caplog.records[0].exc_info[0] is RuntimeError
+
+
+def test_opentelemetry_tracer():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: PLC0415
+    from opentelemetry.trace import SpanKind, StatusCode  # noqa: PLC0415
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    daemon = FakeDaemon(torrents=2, error_rate=1, error_methods=["torrent-start"])
+    with daemon.client(tracer=OpenTelemetryTracer(provider)) as c:
+        c.get_torrents(ids=[1, 2])
+        with pytest.raises(TransmissionError):
+            c.start_torrent(1)
+
+    session, get, start = exporter.get_finished_spans()
+    assert session.name == "transmission session-get"
+    assert get.kind == SpanKind.CLIENT
+    assert get.attributes["rpc.method"] == "torrent-get"
+    assert get.attributes["transmission.ids"] == 2
+    assert get.attributes["transmission.response_bytes"] > 0
+    assert start.status.status_code == StatusCode.ERROR
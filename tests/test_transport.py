@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import http.server
+import json
+import socketserver
+import threading
+from typing import Any
+
+import pytest
+
+from transmission_rpc import Client, TransmissionAuthError, TransmissionConnectError
+from transmission_rpc.testing import FakeDaemon
+from transmission_rpc.transport import InMemoryTransport, SocketTransport, Transport, TransportResponse
+
+session = {"rpc-version": 17, "rpc-version-semver": "5.3.0", "version": "4.0.6"}
+
+
+large_torrents = [{"id": i, "name": "a" * 100} for i in range(20000)]
+
+
+def handler(request: dict[str, Any]) -> dict[str, Any]:
+    if request["method"] == "session-get":
+        return {"result": "success", "arguments": session}
+    if request["method"] == "torrent-get":
+        return {"result": "success", "arguments": {"torrents": [{"id": 1, "name": "a"}]}}
+    return {"result": "success", "arguments": {}}
+
+
+def test_in_memory_transport():
+    with Client(transport=InMemoryTransport(handler)) as c:
+        assert c.get_session().version == "4.0.6"
+        assert [t.name for t in c.get_torrents(arguments=["id", "name"])] == ["a"]
+
+
+def test_in_memory_transport_bytes():
+    def raw_handler(request: dict[str, Any]) -> bytes:
+        return b'{"result":"success","arguments":{"version":"4.0.6","rpc-version":17}}'
+
+    assert Client(transport=InMemoryTransport(raw_handler)).get_session().version == "4.0.6"
+
+
+class SessionTransport(Transport):
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.sent: list[str] = []
+
+    def request(self, path, headers, body, timeout) -> TransportResponse:
+        self.sent.append(headers["x-transmission-session-id"])
+        if headers["x-transmission-session-id"] != "s":
+            return TransportResponse(409, {"x-transmission-session-id": "s"}, b"")
+        return TransportResponse(self.status, {}, b'{"result":"success","arguments":{"version":"4","rpc-version":17}}')
+
+
+def test_custom_transport_session_id():
+    transport = SessionTransport()
+    c = Client(transport=transport)
+    c.get_session()
+    assert transport.sent == ["0", "s", "s"]
+
+
+def test_custom_transport_auth_error():
+    with pytest.raises(TransmissionAuthError):
+        Client(transport=SessionTransport(status=401))
+
+
+class RpcHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["content-length"]))
+        if self.headers["x-transmission-session-id"] != "s":
+            self.send_response(409)
+            self.send_header("X-Transmission-Session-Id", "s")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        request = json.loads(body)
+        chunk_size = 7
+        if self.path == "/chunked-large" and request["method"] == "torrent-get":
+            chunk_size = 300_000
+            data = json.dumps({"result": "success", "arguments": {"torrents": large_torrents}}).encode()
+        else:
+            data = json.dumps(handler(request)).encode()
+        self.send_response(200)
+        if self.path.startswith("/chunked"):
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(data), chunk_size):
+                part = data[i : i + chunk_size]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def unix_server(tmp_path):
+    path = str(tmp_path.joinpath("rpc.sock"))
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    class Handler(RpcHandler):
+        connections = 0
+
+        def address_string(self):
+            return "unix"
+
+    server = Server(path, Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path, Handler
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("path", ["/transmission/rpc", "/chunked"])
+def test_socket_transport(unix_server, path):
+    socket_path, handler_cls = unix_server
+    transport = SocketTransport(socket_path, timeout=5)
+    with Client(transport=transport, path=path) as c:
+        for _ in range(3):
+            assert [t.name for t in c.get_torrents(arguments=["id", "name"])] == ["a"]
+        assert handler_cls.connections == 1, "connection should be kept alive"
+
+
+def test_socket_transport_connect_error(tmp_path):
+    with pytest.raises(TransmissionConnectError):
+        Client(transport=SocketTransport(str(tmp_path.joinpath("missing.sock"))))
+
+
+def test_socket_transport_large_response(tmp_path):
+    with FakeDaemon(torrents=2000, files=3, peers=2).serve_unix(str(tmp_path.joinpath("rpc.sock"))) as daemon:
+        with daemon.client() as c:
+            expected = c.get_torrents_bytes()
+        assert len(expected) > 1 << 20
+
+        transport = SocketTransport(str(daemon.address))
+        with daemon.client(transport=transport) as c:
+            for _ in range(2):
+                assert c.get_torrents_bytes() == expected
+
+
+def test_socket_transport_large_chunks(unix_server):
+    socket_path, _ = unix_server
+    with Client(transport=SocketTransport(socket_path, timeout=5), path="/chunked-large") as c:
+        for _ in range(2):
+            assert [t.fields for t in c.get_torrents(arguments=["id", "name"])] == large_torrents
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import datetime as dt
+import typing
+from typing import ClassVar
+from unittest import mock
+
+import pytest
+
+from transmission_rpc import Priority, Status, TorrentView
+from transmission_rpc.client import Client
+
+
+class Row(TorrentView):
+    id: int
+    name: str
+    rate_download: int
+    status: Status
+    peer_limit: int
+    bandwidth_priority: Priority
+    added_date: dt.datetime
+
+
+def test_view_rpc_fields():
+    assert Row.rpc_fields == [
+        "id",
+        "name",
+        "rateDownload",
+        "status",
+        "peer-limit",
+        "bandwidthPriority",
+        "addedDate",
+    ]
+
+
+def test_view_from_fields():
+    row = Row.from_fields(
+        {
+            "id": 1,
+            "name": "ubuntu.iso",
+            "rateDownload": 10,
+            "status": 4,
+            "peer-limit": 5,
+            "bandwidthPriority": 1,
+            "addedDate": 0,
+            "hashString": "not requested",
+        }
+    )
+
+    assert row.id == 1
+    assert row.name == "ubuntu.iso"
+    assert row.rate_download == 10
+    assert row.status == Status.DOWNLOADING
+    assert row.peer_limit == 5
+    assert row.bandwidth_priority is Priority.High
+    assert row.added_date == dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+    assert not hasattr(row, "__dict__")
+
+
+def test_view_missing_field():
+    row = Row.from_fields({"id": 1})
+    with pytest.raises(AttributeError):
+        row.name  # noqa: B018
+    assert repr(row) == "Row(id=1)"
+
+
+def test_view_inherit():
+    class Sub(Row):
+        hash_string: str
+
+    assert Sub.rpc_fields == [*Row.rpc_fields, "hashString"]
+
+
+class ClassVarName:
+    pass
+
+
+def test_view_class_var():
+    class WithClassVar(TorrentView):
+        limit: ClassVar[int] = 10
+        default: typing.ClassVar[str] = "a"
+        name: ClassVarName
+
+    assert WithClassVar.rpc_fields == ["name"]
+
+    # annotations evaluated, without `from __future__ import annotations`
+    evaluated = type(TorrentView)(
+        "Evaluated", (TorrentView,), {"__annotations__": {"limit": ClassVar[int], "id": int}, "__module__": __name__}
+    )
+    assert evaluated.rpc_fields == ["id"]
+
+
+def test_view_unknown_field():
+    with pytest.raises(ValueError, match="not_a_field"):
+
+        class Bad(TorrentView):
+            not_a_field: int
+
+
+def test_get_torrents_view():
+    m = mock.Mock(return_value={"torrents": [{"id": 1, "name": "a", "status": 0}]})
+    with mock.patch("transmission_rpc.client.Client._request", m), mock.patch(
+        "transmission_rpc.client.Client.get_session"
+    ):
+        rows = Client().get_torrents(view=Row)
+
+    m.assert_called_with("torrent-get", {"fields": Row.rpc_fields}, None, timeout=None)
+    assert len(rows) == 1
+    assert isinstance(rows[0], Row)
+    assert rows[0].status == Status.STOPPED
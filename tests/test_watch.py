@@ -0,0 +1,121 @@
+import json
+import pathlib
+import threading
+from unittest import mock
+
+from transmission_rpc.error import TransmissionConnectError, TransmissionError, TransmissionTimeoutError
+from transmission_rpc.types import AddTorrentResult
+from transmission_rpc.watch import TorrentWatcher, WatchRule
+
+
+def fake_client(fail=(), errors=None):
+    client = mock.Mock()
+
+    def add_torrents(paths, **kwargs):
+        results = []
+        for p in paths:
+            if p.name in fail:
+                results.append(AddTorrentResult(p, "error", error=TransmissionError("invalid or corrupt torrent file")))
+            elif errors and errors.get(p.name):
+                results.append(AddTorrentResult(p, "error", error=errors[p.name].pop(0)))
+            else:
+                results.append(AddTorrentResult(p, "added"))
+        return results
+
+    client.add_torrents.side_effect = add_torrents
+    return client
+
+
+def test_scan_rules(tmp_path: pathlib.Path):
+    drop = tmp_path.joinpath("drop")
+    drop.mkdir()
+    for name in ["tv.a.torrent", "b.torrent", "c.txt", ".partial.torrent"]:
+        drop.joinpath(name).write_bytes(b"d4:infode")
+
+    client = fake_client()
+    watcher = TorrentWatcher(
+        client,
+        drop,
+        rules=[WatchRule("tv.*.torrent", download_dir="/tv", labels=["tv"]), WatchRule(paused=True)],
+        processed_dir=tmp_path.joinpath("done"),
+        settle=0,
+    )
+    results = watcher.scan()
+
+    assert sorted(r.source.name for r in results) == ["b.torrent", "tv.a.torrent"]
+    assert sorted(client.add_torrents.call_args_list, key=lambda c: str(c.kwargs)) == [
+        mock.call([drop.joinpath("tv.a.torrent")], workers=4, download_dir="/tv", labels=["tv"]),
+        mock.call([drop.joinpath("b.torrent")], workers=4, paused=True),
+    ]
+    assert sorted(p.name for p in drop.iterdir()) == [".partial.torrent", "c.txt"]
+    assert sorted(p.name for p in tmp_path.joinpath("done").iterdir()) == ["b.torrent", "tv.a.torrent"]
+
+
+def test_settle(tmp_path: pathlib.Path):
+    tmp_path.joinpath("a.torrent").write_bytes(b"d4:infode")
+    client = fake_client()
+    watcher = TorrentWatcher(client, tmp_path, settle=60, delete=True)
+
+    assert watcher.scan() == []
+    client.add_torrents.assert_not_called()
+
+
+def test_state(tmp_path: pathlib.Path):
+    drop = tmp_path.joinpath("drop")
+    drop.mkdir()
+    drop.joinpath("a.torrent").write_bytes(b"a")
+    drop.joinpath("b.torrent").write_bytes(b"b")
+    state = tmp_path.joinpath("state.json")
+
+    client = fake_client(fail={"b.torrent"})
+    watcher = TorrentWatcher(client, drop, state_file=state, settle=0)
+    assert [r.status for r in sorted(watcher.scan(), key=lambda r: r.source.name)] == ["added", "error"]
+    assert list(json.loads(state.read_text())["done"]) == ["a.torrent"]
+    assert watcher.scan() == [], "rejected file should not be retried before it's changed"
+
+    # restarted
+    client = fake_client()
+    watcher = TorrentWatcher(client, drop, state_file=state, settle=0)
+    assert [r.source.name for r in watcher.scan()] == ["b.torrent"]
+    assert client.add_torrents.call_count == 1
+
+
+def test_retry_connection_error(tmp_path: pathlib.Path):
+    tmp_path.joinpath("a.torrent").write_bytes(b"a")
+    client = fake_client(
+        errors={"a.torrent": [TransmissionConnectError("refused"), TransmissionTimeoutError("timeout")]}
+    )
+    watcher = TorrentWatcher(client, tmp_path, settle=0, delete=True)
+
+    now = 1000.0
+    with mock.patch("transmission_rpc.watch.time.monotonic", side_effect=lambda: now):
+        assert [r.status for r in watcher.scan()] == ["error"]
+        assert watcher.scan() == [], "should wait before retry"
+        now += 1
+        assert [r.status for r in watcher.scan()] == ["error"]
+        now += 1
+        assert watcher.scan() == [], "delay should be doubled"
+        now += 1
+        assert [r.status for r in watcher.scan()] == ["added"]
+
+    assert client.add_torrents.call_count == 3
+    assert not tmp_path.joinpath("a.torrent").exists()
+
+
+def test_run(tmp_path: pathlib.Path):
+    added = threading.Event()
+    client = fake_client()
+    watcher = TorrentWatcher(
+        client, tmp_path, settle=0, delete=True, poll_interval=0.05, on_result=lambda r: added.set()
+    )
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        tmp_path.joinpath("a.torrent").write_bytes(b"a")
+        assert added.wait(5)
+    finally:
+        watcher.stop()
+        thread.join(5)
+
+    assert not thread.is_alive()
+    assert not tmp_path.joinpath("a.torrent").exists()
@@ -1,34 +1,80 @@
+"""
+Names are imported from submodules on first access,
+so ``import transmission_rpc`` stays cheap for short-lived scripts, and urllib3 is only imported with the client.
+"""
+
+from __future__ import annotations
+
+import importlib
 import logging
 import urllib.parse
+from typing import TYPE_CHECKING, Any
+
+from transmission_rpc.constants import DEFAULT_TIMEOUT, LOGGER, IdleMode, Priority, RatioLimitMode
+
+if TYPE_CHECKING:
+    from transmission_rpc.client import Client, PreparedRequest, TorrentIds
+    from transmission_rpc.error import (
+        TransmissionAuthError,
+        TransmissionConnectError,
+        TransmissionError,
+        TransmissionTimeoutError,
+    )
+    from transmission_rpc.session import Session, SessionStats, Stats
+    from transmission_rpc.timing import RequestTiming
+    from transmission_rpc.torrent import FileStat, Status, Torrent, Tracker, TrackerStats
+    from transmission_rpc.types import AddTorrentResult, File, Group, PortTestResult, QueueMove, TorrentChangeBatch
+    from transmission_rpc.view import TorrentView
 
-from transmission_rpc.client import DEFAULT_TIMEOUT, Client
-from transmission_rpc.constants import LOGGER, IdleMode, Priority, RatioLimitMode
-from transmission_rpc.error import (
-    TransmissionAuthError,
-    TransmissionConnectError,
-    TransmissionError,
-    TransmissionTimeoutError,
-)
-from transmission_rpc.session import Session, SessionStats, Stats
-from transmission_rpc.torrent import FileStat, Status, Torrent, Tracker, TrackerStats
-from transmission_rpc.types import File, Group, PortTestResult
+_LAZY_ATTRIBUTES = {
+    "Client": "client",
+    "PreparedRequest": "client",
+    "TorrentIds": "client",
+    "TransmissionAuthError": "error",
+    "TransmissionConnectError": "error",
+    "TransmissionError": "error",
+    "TransmissionTimeoutError": "error",
+    "Session": "session",
+    "SessionStats": "session",
+    "Stats": "session",
+    "FileStat": "torrent",
+    "Status": "torrent",
+    "Torrent": "torrent",
+    "Tracker": "torrent",
+    "TrackerStats": "torrent",
+    "RequestTiming": "timing",
+    "AddTorrentResult": "types",
+    "File": "types",
+    "Group": "types",
+    "PortTestResult": "types",
+    "QueueMove": "types",
+    "TorrentChangeBatch": "types",
+    "TorrentView": "view",
+}
 
 __all__ = [
     "DEFAULT_TIMEOUT",
     "LOGGER",
+    "AddTorrentResult",
     "Client",
     "File",
     "FileStat",
     "Group",
     "IdleMode",
     "PortTestResult",
+    "PreparedRequest",
     "Priority",
+    "QueueMove",
     "RatioLimitMode",
+    "RequestTiming",
     "Session",
     "SessionStats",
     "Stats",
     "Status",
     "Torrent",
+    "TorrentChangeBatch",
+    "TorrentIds",
+    "TorrentView",
     "Tracker",
     "TrackerStats",
     "TransmissionAuthError",
@@ -39,6 +85,19 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
 def from_url(
     url: str,
     timeout: float = DEFAULT_TIMEOUT,
@@ -60,6 +119,8 @@ def from_url(
         ``path`` of ``http://127.0.0.1/`` is ``/``
 
     """
+    from transmission_rpc import Client  # noqa: PLC0415
+
     u = urllib.parse.urlparse(url)
 
     protocol = u.scheme
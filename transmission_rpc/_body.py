@@ -0,0 +1,84 @@
+"""
+Streaming torrent-add request body.
+
+The request body is built as json prefix, base64 of torrent content and json suffix,
+content is read and encoded block by block so the whole torrent is never held in memory.
+"""
+
+from __future__ import annotations
+
+import base64
+import mmap
+import os
+import pathlib
+from typing import IO, Iterator, Union
+
+#: multiple of 3 so each block is encoded to base64 without padding
+_BLOCK_SIZE = 3 * 64 * 1024
+
+_Source = Union[pathlib.Path, IO[bytes]]
+
+
+class Base64JsonBody:
+    """
+    Re-iterable request body with known length, so it can be sent again after a 409 response.
+    """
+
+    __slots__ = ("__length", "__offset", "__prefix", "__size", "__source", "__suffix")
+
+    def __init__(self, prefix: bytes, source: _Source, suffix: bytes):
+        self.__prefix = prefix
+        self.__suffix = suffix
+        self.__source = source
+        if isinstance(source, pathlib.Path):
+            self.__offset = 0
+            self.__size = source.stat().st_size
+        else:
+            self.__offset = source.tell()
+            self.__size = source.seek(0, os.SEEK_END) - self.__offset
+            source.seek(self.__offset)
+        self.__length = len(prefix) + (self.__size + 2) // 3 * 4 + len(suffix)
+
+    @property
+    def size(self) -> int:
+        """size of torrent content before encoding"""
+        return self.__size
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self.__prefix
+        total = 0
+        rest = b""
+        for block in self.__blocks():
+            total += len(block)
+            data = rest + block if rest else block
+            cut = len(data) - len(data) % 3
+            rest = data[cut:]
+            yield base64.b64encode(data[:cut])
+        if total != self.__size:
+            raise ValueError("torrent content changed while sending")
+        yield base64.b64encode(rest)
+        yield self.__suffix
+
+    def __blocks(self) -> Iterator[bytes]:
+        source = self.__source
+        if isinstance(source, pathlib.Path):
+            with source.open("rb") as f:
+                if not self.__size:
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    for start in range(0, len(m), _BLOCK_SIZE):
+                        yield m[start : start + _BLOCK_SIZE]
+            return
+
+        source.seek(self.__offset)
+        while True:
+            block = source.read(_BLOCK_SIZE)
+            if not block:
+                return
+            yield block
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} source={self.__source!r} length={self.__length}>"
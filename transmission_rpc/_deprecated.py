@@ -0,0 +1,33 @@
+"""
+Runtime replacement of ``typing_extensions.deprecated`` for functions.
+
+``typing_extensions.deprecated`` imports ``asyncio`` when it decorates a function,
+which is a noticeable part of the import time of the client.
+Type checkers still see ``typing_extensions.deprecated``.
+"""
+
+from __future__ import annotations
+
+import functools
+import warnings
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+if TYPE_CHECKING:
+    from typing_extensions import deprecated
+else:
+    _F = TypeVar("_F", bound=Callable[..., Any])
+
+    def deprecated(message: str, /, *, category: type[Warning] = DeprecationWarning, stacklevel: int = 1):
+        def decorator(fn: _F) -> _F:
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                warnings.warn(message, category=category, stacklevel=stacklevel + 1)
+                return fn(*args, **kwargs)
+
+            wrapper.__deprecated__ = fn.__deprecated__ = message
+            return wrapper
+
+        return decorator
+
+
+__all__ = ["deprecated"]
@@ -0,0 +1,127 @@
+"""
+Planning of the minimal set of requests to converge daemon state to a desired state.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Hashable, Mapping
+
+from transmission_rpc.constants import RpcMethod
+from transmission_rpc.types import QueueMove, TorrentChangeBatch
+
+#: ``Client.change_torrent`` argument -> torrent field name, same in torrent-get and torrent-set
+TORRENT_RECONCILE_FIELDS: dict[str, str] = {
+    "bandwidth_priority": "bandwidthPriority",
+    "download_limit": "downloadLimit",
+    "download_limited": "downloadLimited",
+    "upload_limit": "uploadLimit",
+    "upload_limited": "uploadLimited",
+    "honors_session_limits": "honorsSessionLimits",
+    "peer_limit": "peer-limit",
+    "seed_idle_limit": "seedIdleLimit",
+    "seed_idle_mode": "seedIdleMode",
+    "seed_ratio_limit": "seedRatioLimit",
+    "seed_ratio_mode": "seedRatioMode",
+    "labels": "labels",
+    "group": "group",
+    "sequential_download": "sequential_download",
+}
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        # only used as key, items may not be comparable with each other
+        return tuple(sorted((_freeze(v) for v in value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted(((k, _freeze(v)) for k, v in value.items()), key=repr))
+    return value
+
+
+def _normalize(name: str, value: Any) -> Any:
+    if name == "labels" and value is not None:
+        if isinstance(value, str):
+            return [value]
+        return list(value)
+    return value
+
+
+def plan_torrent_changes(
+    desired: Mapping[int, Mapping[str, Any]], current: Mapping[int, Mapping[str, Any]]
+) -> list[TorrentChangeBatch]:
+    """
+    Diff desired settings against current torrent fields,
+    and group torrents needing identical changes into one batch.
+
+    Parameters:
+        desired: ``{torrent_id: {change_torrent_argument: value}}``
+        current: ``{torrent_id: raw torrent fields}``, torrents missing here are skipped.
+    """
+    groups: dict[Hashable, TorrentChangeBatch] = {}
+    for torrent_id, settings in desired.items():
+        fields = current.get(torrent_id)
+        if fields is None:
+            continue
+
+        changes = {}
+        for name, raw_value in settings.items():
+            value = _normalize(name, raw_value)
+            if fields.get(TORRENT_RECONCILE_FIELDS[name]) != value:
+                changes[name] = value
+
+        if not changes:
+            continue
+
+        key = tuple(sorted((name, _freeze(value)) for name, value in changes.items()))
+        batch = groups.get(key)
+        if batch is None:
+            groups[key] = TorrentChangeBatch(ids=[torrent_id], arguments=changes)
+        else:
+            batch.ids.append(torrent_id)
+
+    return list(groups.values())
+
+
+def plan_queue_moves(target: list[int], positions: Mapping[int, int]) -> list[QueueMove]:
+    """
+    Plan queue-move-top/bottom requests to reorder the queue.
+
+    Queue moves with multiple ids keep the relative order of moved torrents,
+    so each request is a stable partition of the queue.
+    The queue is split into runs of torrents already in target order,
+    and sorted by run index as a binary radix sort, one request per bit.
+    This takes ``ceil(log2(runs))`` requests.
+
+    Parameters:
+        target: torrent ids in desired order, they are placed at the top of queue.
+            Other torrents are placed after them and keep their current order.
+        positions: ``{torrent_id: queuePosition}`` of all torrents.
+    """
+    current = sorted(positions, key=positions.__getitem__)
+    listed = list(dict.fromkeys(x for x in target if x in positions))
+    listed_set = set(listed)
+    order = listed + [x for x in current if x not in listed_set]
+
+    # run index of each torrent, a run is torrents in target order with increasing current position.
+    run: dict[int, int] = {}
+    k = 0
+    previous = -1
+    for torrent_id in order:
+        position = positions[torrent_id]
+        if position < previous:
+            k += 1
+        run[torrent_id] = k
+        previous = position
+
+    moves: list[QueueMove] = []
+    for bit in range(k.bit_length()):
+        top = [x for x in current if not run[x] >> bit & 1]
+        bottom = [x for x in current if run[x] >> bit & 1]
+        if len(top) <= len(bottom):
+            moves.append(QueueMove(RpcMethod.QueueMoveTop, top))
+        else:
+            moves.append(QueueMove(RpcMethod.QueueMoveBottom, bottom))
+        current = top + bottom
+
+    return moves
@@ -0,0 +1,245 @@
+"""
+Write-behind batching of mutating requests issued by many producers.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import types
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Hashable
+
+from typing_extensions import Self
+
+from transmission_rpc._reconcile import _freeze
+from transmission_rpc.client import _parse_torrent_ids
+from transmission_rpc.constants import RpcMethod
+
+if TYPE_CHECKING:
+    from transmission_rpc.client import Client, _TorrentIDs
+
+_START_METHODS = frozenset({RpcMethod.TorrentStart, RpcMethod.TorrentStartNow})
+
+#: methods canceling pending calls of each other for the same torrent
+_CONTRADICTIONS: dict[RpcMethod, frozenset[RpcMethod]] = {
+    RpcMethod.TorrentStart: frozenset({RpcMethod.TorrentStop}),
+    RpcMethod.TorrentStartNow: frozenset({RpcMethod.TorrentStop}),
+    RpcMethod.TorrentStop: _START_METHODS,
+}
+
+
+class _Batch:
+    __slots__ = ("arguments", "futures", "ids", "method")
+
+    def __init__(self, method: RpcMethod, arguments: dict[str, Any]):
+        self.method = method
+        self.arguments = arguments
+        # ordered, torrent id as given -> int id if it's known, to match a hash string with its id
+        self.ids: dict[int | str, int | str] = {}
+        # future of each call, with its ids not canceled yet
+        self.futures: list[tuple[Future[None], set[int | str]]] = []
+
+    def cancel(self, canceled: set[int | str]) -> list[Future[None]]:
+        """remove ids matching ``canceled`` known ids, returns futures of calls with all ids canceled"""
+        removed = {torrent_id for torrent_id, known_id in self.ids.items() if known_id in canceled}
+        if not removed:
+            return []
+        for torrent_id in removed:
+            del self.ids[torrent_id]
+
+        done: list[Future[None]] = []
+        futures: list[tuple[Future[None], set[int | str]]] = []
+        for future, ids in self.futures:
+            ids.difference_update(removed)
+            if ids:
+                futures.append((future, ids))
+            else:
+                done.append(future)
+        self.futures = futures
+        return done
+
+
+class MutationBatcher:
+    """
+    Buffer mutating calls for a short window and send them merged.
+
+    Calls of the same method with identical arguments are merged into a single request with all their ids.
+    A later start or stop of a torrent cancels the earlier pending stop or start of the same torrent,
+    the canceled call is resolved successfully, as the later call wins.
+    A hash string and an int id are matched as the same torrent
+    if the client is created with ``id_cache=True`` and the torrent is in the id cache.
+
+    Each call returns a ``concurrent.futures.Future``, resolved when the merged request returns.
+    Requests are sent from a background thread.
+
+    .. code-block:: python
+
+        with MutationBatcher(client, window=0.05) as batcher:
+            futures = [batcher.start_torrent(torrent_id) for torrent_id in ids]
+            for future in futures:
+                future.result()
+
+    Parameters:
+        client: client to send requests.
+        window: seconds to wait for more calls after the first buffered call.
+        max_ids: send buffered calls immediately when they have this many ids in total.
+    """
+
+    def __init__(self, client: Client, *, window: float = 0.05, max_ids: int = 1000):
+        self.client = client
+        self.window = window
+        self.max_ids = max_ids
+
+        self.__cond = threading.Condition()
+        # held while sending, so batches taken by `flush` and the background thread are sent in order
+        self.__send_lock = threading.Lock()
+        self.__pending: dict[Hashable, _Batch] = {}
+        self.__pending_ids = 0
+        self.__deadline: float | None = None
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__run, name="transmission-rpc-batcher", daemon=True)
+        self.__thread.start()
+
+    def start_torrent(self, ids: _TorrentIDs, bypass_queue: bool = False) -> Future[None]:
+        """buffered :py:meth:`Client.start_torrent`"""
+        return self.__submit(RpcMethod.TorrentStartNow if bypass_queue else RpcMethod.TorrentStart, ids)
+
+    def stop_torrent(self, ids: _TorrentIDs) -> Future[None]:
+        """buffered :py:meth:`Client.stop_torrent`"""
+        return self.__submit(RpcMethod.TorrentStop, ids)
+
+    def verify_torrent(self, ids: _TorrentIDs) -> Future[None]:
+        """buffered :py:meth:`Client.verify_torrent`"""
+        return self.__submit(RpcMethod.TorrentVerify, ids)
+
+    def reannounce_torrent(self, ids: _TorrentIDs) -> Future[None]:
+        """buffered :py:meth:`Client.reannounce_torrent`"""
+        return self.__submit(RpcMethod.TorrentReannounce, ids)
+
+    def change_torrent(self, ids: _TorrentIDs, **kwargs: Any) -> Future[None]:
+        """buffered :py:meth:`Client.change_torrent`, calls with identical ``kwargs`` are merged"""
+        if not kwargs:
+            raise ValueError("No arguments to set")
+        return self.__submit(RpcMethod.TorrentSet, ids, kwargs)
+
+    def flush(self) -> None:
+        """send all buffered calls now and wait for them"""
+        with self.__send_lock:
+            self.__send(self.__take_pending())
+
+    def close(self) -> None:
+        """send all buffered calls and stop the background thread"""
+        with self.__cond:
+            self.__closed = True
+            self.__cond.notify()
+        self.__thread.join()
+        self.flush()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __submit(self, method: RpcMethod, ids: _TorrentIDs, arguments: dict[str, Any] | None = None) -> Future[None]:
+        if ids == "recently-active":
+            raise ValueError("'recently-active' can't be batched")
+        parsed = _parse_torrent_ids(ids)
+        if not parsed:
+            raise ValueError("request require ids")
+
+        arguments = arguments or {}
+        key = (method, _freeze(arguments))
+        future: Future[None] = Future()
+        resolved = {torrent_id: self.__resolve(torrent_id) for torrent_id in parsed}
+
+        canceled_futures: list[Future[None]] = []
+        with self.__cond:
+            if self.__closed:
+                raise RuntimeError("batcher is closed")
+
+            contradicting = _CONTRADICTIONS.get(method)
+            if contradicting:
+                canceled = set(resolved.values())
+                for pending in self.__pending.values():
+                    if pending.method in contradicting:
+                        count = len(pending.ids)
+                        canceled_futures.extend(pending.cancel(canceled))
+                        self.__pending_ids -= count - len(pending.ids)
+
+            batch = self.__pending.get(key)
+            if batch is None:
+                batch = self.__pending[key] = _Batch(method, arguments)
+            for torrent_id, known_id in resolved.items():
+                if torrent_id not in batch.ids:
+                    batch.ids[torrent_id] = known_id
+                    self.__pending_ids += 1
+            batch.futures.append((future, set(resolved)))
+
+            if self.__deadline is None:
+                self.__deadline = time.monotonic() + self.window
+            if self.__pending_ids >= self.max_ids:
+                self.__deadline = 0
+            self.__cond.notify()
+
+        # resolved outside of lock, callbacks of futures may call the batcher
+        for canceled_future in canceled_futures:
+            canceled_future.set_result(None)
+        return future
+
+    def __resolve(self, torrent_id: int | str) -> int | str:
+        if isinstance(torrent_id, str):
+            known_id = self.client.cached_torrent_id(torrent_id)
+            if known_id is not None:
+                return known_id
+        return torrent_id
+
+    def __take_pending(self) -> list[_Batch]:
+        with self.__cond:
+            batches = list(self.__pending.values())
+            self.__pending = {}
+            self.__pending_ids = 0
+            self.__deadline = None
+        return batches
+
+    def __send(self, batches: list[_Batch]) -> None:
+        for batch in batches:
+            try:
+                if batch.ids:
+                    self.__call(batch.method, list(batch.ids), batch.arguments)
+            except Exception as e:
+                for future, _ in batch.futures:
+                    future.set_exception(e)
+            else:
+                for future, _ in batch.futures:
+                    future.set_result(None)
+
+    def __call(self, method: RpcMethod, ids: list[int | str], arguments: dict[str, Any]) -> None:
+        client = self.client
+        if method == RpcMethod.TorrentSet:
+            client.change_torrent(ids, **arguments)
+        elif method in _START_METHODS:
+            client.start_torrent(ids, bypass_queue=method == RpcMethod.TorrentStartNow)
+        elif method == RpcMethod.TorrentStop:
+            client.stop_torrent(ids)
+        elif method == RpcMethod.TorrentVerify:
+            client.verify_torrent(ids)
+        else:
+            client.reannounce_torrent(ids)
+
+    def __run(self) -> None:
+        while True:
+            with self.__cond:
+                while not self.__closed and (self.__deadline is None or self.__deadline > time.monotonic()):
+                    timeout = None if self.__deadline is None else self.__deadline - time.monotonic()
+                    self.__cond.wait(timeout)
+                if self.__closed:
+                    return
+            with self.__send_lock:
+                self.__send(self.__take_pending())
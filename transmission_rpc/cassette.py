@@ -0,0 +1,329 @@
+"""
+Record responses of transmission daemon to disk, and replay them without network.
+
+A cassette is a directory with ``index.jsonl``, one json line per request,
+and ``bodies.bin``, request and response bodies appended one after another.
+When replayed, ``bodies.bin`` is memory-mapped instead of read, a response body is copied out
+the first time it's replayed and kept for later replays, bodies never replayed are not loaded.
+
+.. code-block:: python
+
+    from transmission_rpc import Client
+    from transmission_rpc.cassette import RecordingTransport, ReplayTransport
+    from transmission_rpc.transport import Urllib3Transport
+
+    # record
+    transport = RecordingTransport(Urllib3Transport("http", "127.0.0.1", 9091), "cassettes/big-daemon", anonymize=True)
+    with Client(transport=transport) as client:
+        client.get_torrents()
+
+    # replay, with recorded response time
+    with Client(transport=ReplayTransport("cassettes/big-daemon", timing=1.0)) as client:
+        client.get_torrents()
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import hashlib
+import hmac
+import ipaddress
+import json
+import mmap
+import pathlib
+import secrets
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from transmission_rpc.error import TransmissionError
+from transmission_rpc.transport import Transport, TransportResponse, _Timeout
+
+if TYPE_CHECKING:
+    from transmission_rpc._body import Base64JsonBody
+
+_INDEX = "index.jsonl"
+_BODIES = "bodies.bin"
+
+_header_session_id_key = "x-transmission-session-id"
+
+#: file system paths, each path component is replaced
+_PATH_KEYS = frozenset(
+    {
+        "config-dir",
+        "download-dir",
+        "downloadDir",
+        "incomplete-dir",
+        "location",
+        "name",
+        "path",
+        "script-torrent-added-filename",
+        "script-torrent-done-filename",
+        "script-torrent-done-seeding-filename",
+        "torrentFile",
+    }
+)
+
+#: free text, replaced as a whole
+_TEXT_KEYS = frozenset({"comment", "creator", "errorString", "group", "labels", "sitename"})
+
+#: urls, may contain tracker host and passkey
+_URL_KEYS = frozenset({"announce", "blocklist-url", "host", "scrape", "webseeds"})
+
+#: newline separated urls
+_URL_LIST_KEYS = frozenset({"default-trackers", "trackerList"})
+
+
+def _request_key(request: dict[str, Any]) -> str:
+    canonical = json.dumps(
+        {"method": request.get("method"), "arguments": request.get("arguments")}, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class _Anonymizer:
+    """replace names, paths, urls and peer addresses with keyed hashes, same value is always replaced the same"""
+
+    def __init__(self, key: bytes):
+        self.key = key
+
+    def token(self, value: str, size: int = 12) -> str:
+        return hmac.new(self.key, value.encode(), hashlib.sha256).hexdigest()[:size]
+
+    def path(self, value: str) -> str:
+        parts = value.split("/")
+        for i, part in enumerate(parts):
+            if part:
+                stem, dot, ext = part.rpartition(".")
+                # keep short file extension
+                parts[i] = self.token(stem) + dot + ext if dot and stem and len(ext) <= 5 else self.token(part)
+        return "/".join(parts)
+
+    def url(self, value: str) -> str:
+        u = urlparse(value)
+        if not u.scheme:
+            return self.token(value)
+        last = u.path.rsplit("/", 1)[-1]
+        return f"{u.scheme}://{self.token(u.netloc)}.invalid" + (f"/{last}" if last in {"announce", "scrape"} else "")
+
+    def magnet(self, value: str) -> str:
+        query = [(k, v) for k, v in parse_qsl(urlparse(value).query) if k == "xt"]
+        return "magnet:?" + urlencode(query, safe=":")
+
+    def address(self, value: str) -> str:
+        digest = hmac.new(self.key, value.encode(), hashlib.sha256).digest()
+        try:
+            version = ipaddress.ip_address(value).version
+        except ValueError:
+            return self.token(value)
+        if version == 4:
+            return str(ipaddress.IPv4Address(b"\x0a" + digest[:3]))
+        return str(ipaddress.IPv6Address(b"\xfd" + digest[:15]))
+
+    def filename(self, value: str) -> str:
+        if value.startswith("magnet:"):
+            return self.magnet(value)
+        if "://" in value:
+            return self.url(value)
+        return self.path(value)
+
+    def value(self, key: str | None, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: self.value(k, v) for k, v in value.items()}
+        if isinstance(value, list):
+            if key == "torrents" and value and isinstance(value[0], list):
+                # table format, first row is field names
+                header = value[0]
+                return [header, *([self.value(h, v) for h, v in zip(header, row)] for row in value[1:])]
+            return [self.value(key, v) for v in value]
+        if not isinstance(value, str) or key is None:
+            return value
+
+        if key in _PATH_KEYS:
+            return self.path(value)
+        if key in _TEXT_KEYS:
+            return self.token(value)
+        if key in _URL_KEYS:
+            return self.url(value)
+        if key in _URL_LIST_KEYS:
+            return "\n".join(self.url(line) if line else "" for line in value.split("\n"))
+        if key == "magnetLink":
+            return self.magnet(value)
+        if key == "address":
+            return self.address(value)
+        if key == "filename":
+            return self.filename(value)
+        if key == "metainfo":
+            return ""
+        return value
+
+
+class RecordingTransport(Transport):
+    """
+    Send requests with ``transport`` and record responses to cassette directory ``path``.
+
+    Recorded requests are appended to existing cassette.
+
+    Parameters:
+        transport: transport to send requests.
+        path: cassette directory, created if not exists.
+        anonymize: replace torrent names, file paths, labels, tracker urls and peer addresses in recorded
+            requests and responses with keyed hashes. Same value is replaced with same hash in a recording,
+            so the shape of the data is kept. Recorded requests can only be replayed by method, not by arguments.
+    """
+
+    def __init__(self, transport: Transport, path: str | pathlib.Path, *, anonymize: bool = False):
+        self.transport = transport
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.__anonymizer = _Anonymizer(secrets.token_bytes(32)) if anonymize else None
+        self.__lock = threading.Lock()
+        self.__index = self.path.joinpath(_INDEX).open("a", encoding="utf-8")
+        self.__bodies = self.path.joinpath(_BODIES).open("ab")
+
+    def request(
+        self,
+        path: str,
+        headers: dict[str, str],
+        body: bytes | Base64JsonBody,
+        timeout: _Timeout | None,
+    ) -> TransportResponse:
+        start = time.perf_counter()
+        r = self.transport.request(path, headers, body, timeout)
+        elapsed = time.perf_counter() - start
+
+        if r.status == 409:
+            # session id negotiation is not replayed
+            return r
+
+        request_data = body if isinstance(body, bytes) else b"".join(body)
+        request = json.loads(request_data)
+        response_data = r.data
+        key: str | None = _request_key(request)
+        if self.__anonymizer is not None:
+            key = None
+            request_data = json.dumps(self.__anonymizer.value(None, request)).encode()
+            if r.status == 200:
+                response_data = json.dumps(self.__anonymizer.value(None, json.loads(response_data))).encode()
+
+        with self.__lock:
+            offset = self.__bodies.tell()
+            self.__bodies.write(request_data)
+            self.__bodies.write(response_data)
+            self.__bodies.flush()
+            entry = {
+                "method": request.get("method"),
+                "key": key,
+                "status": r.status,
+                "session_id": r.headers.get(_header_session_id_key),
+                "request": [offset, len(request_data)],
+                "response": [offset + len(request_data), len(response_data)],
+                "elapsed": elapsed,
+            }
+            self.__index.write(json.dumps(entry) + "\n")
+            self.__index.flush()
+
+        return r
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__index.close()
+            self.__bodies.close()
+        self.transport.close()
+
+
+class _Entry(NamedTuple):
+    method: str
+    key: str | None
+    status: int
+    session_id: str | None
+    offset: int
+    length: int
+    elapsed: float
+
+
+class ReplayTransport(Transport):
+    """
+    Respond requests with responses recorded by :py:class:`RecordingTransport`.
+
+    A request is answered with the response recorded for a request with same method and arguments,
+    or, if there is no such response and ``strict`` is ``False``, a response recorded for same method.
+    Responses of same request are replayed in recorded order, and start over when all are used.
+    Each response body is copied from the memory-mapped cassette once, and the same ``bytes`` is returned again.
+
+    Parameters:
+        path: cassette directory.
+        timing: sleep recorded response time multiplied by ``timing`` before responding.
+            ``0`` responds immediately, ``1.0`` simulates original timing.
+        strict: raise :py:class:`~transmission_rpc.TransmissionError` if there is no response
+            recorded for same method and arguments.
+    """
+
+    def __init__(self, path: str | pathlib.Path, *, timing: float = 0.0, strict: bool = False):
+        self.path = pathlib.Path(path)
+        self.timing = timing
+        self.strict = strict
+        self.__lock = threading.Lock()
+        self.__by_key: dict[str, collections.deque[_Entry]] = {}
+        self.__by_method: dict[str, collections.deque[_Entry]] = {}
+        # response body by offset, copied from mmap on first replay
+        self.__data: dict[int, bytes] = {}
+
+        with self.path.joinpath(_INDEX).open(encoding="utf-8") as f:
+            for line in f:
+                item = json.loads(line)
+                entry = _Entry(
+                    method=item["method"],
+                    key=item["key"],
+                    status=item["status"],
+                    session_id=item["session_id"],
+                    offset=item["response"][0],
+                    length=item["response"][1],
+                    elapsed=item["elapsed"],
+                )
+                if entry.key is not None:
+                    self.__by_key.setdefault(entry.key, collections.deque()).append(entry)
+                self.__by_method.setdefault(entry.method, collections.deque()).append(entry)
+
+        self.__file = self.path.joinpath(_BODIES).open("rb")
+        self.__bodies: mmap.mmap | None = None
+        # empty file can't be memory-mapped
+        with contextlib.suppress(ValueError):
+            self.__bodies = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def request(
+        self,
+        path: str,
+        headers: dict[str, str],
+        body: bytes | Base64JsonBody,
+        timeout: _Timeout | None,
+    ) -> TransportResponse:
+        request = json.loads(body if isinstance(body, bytes) else b"".join(body))
+        method = request.get("method")
+
+        with self.__lock:
+            entries = self.__by_key.get(_request_key(request))
+            if entries is None and not self.strict:
+                entries = self.__by_method.get(method)
+            if not entries:
+                raise TransmissionError(f"no recorded response for method {method!r} in {self.path}")
+            entry = entries[0]
+            entries.rotate(-1)
+
+        if self.timing > 0:
+            time.sleep(entry.elapsed * self.timing)
+
+        data = self.__data.get(entry.offset)
+        if data is None:
+            data = b"" if self.__bodies is None else self.__bodies[entry.offset : entry.offset + entry.length]
+            self.__data[entry.offset] = data
+        response_headers = {} if entry.session_id is None else {_header_session_id_key: entry.session_id}
+        return TransportResponse(status=entry.status, headers=response_headers, data=data)
+
+    def close(self) -> None:
+        if self.__bodies is not None:
+            self.__bodies.close()
+            self.__bodies = None
+        self.__file.close()
@@ -1,52 +1,76 @@
 from __future__ import annotations
 
 import base64
-import importlib.metadata
+import concurrent.futures
+import functools
+import inspect
 import json
 import logging
 import pathlib
-import string
+import threading
 import time
 import types
-from typing import Any, BinaryIO, Iterable, List, TypeVar, Union
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterable, Mapping, Tuple, TypeVar, Union, cast, overload
 from urllib.parse import urlparse
 
-import certifi
-import urllib3
-from typing_extensions import Literal, Self, TypedDict, deprecated
+from typing_extensions import Literal, Self, TypedDict
 from urllib3 import Timeout
 from urllib3.util import make_headers
 
-from transmission_rpc._unix_socket import UnixHTTPConnectionPool
-from transmission_rpc.constants import LOGGER, RpcMethod, get_torrent_arguments
+from transmission_rpc._body import Base64JsonBody
+from transmission_rpc._deprecated import deprecated
+from transmission_rpc._reconcile import TORRENT_RECONCILE_FIELDS, plan_queue_moves, plan_torrent_changes
+from transmission_rpc.constants import DEFAULT_TIMEOUT, LOGGER, RpcMethod, get_torrent_arguments
 from transmission_rpc.error import (
     TransmissionAuthError,
-    TransmissionConnectError,
     TransmissionError,
-    TransmissionTimeoutError,
 )
+from transmission_rpc.metainfo import TorrentMetainfo, parse_magnet
 from transmission_rpc.session import Session, SessionStats
+from transmission_rpc.timing import RequestTiming, TimingHook, _Timings
 from transmission_rpc.torrent import Torrent
-from transmission_rpc.types import Group, PortTestResult
+from transmission_rpc.transport import Transport, Urllib3Transport, _Timeout
+from transmission_rpc.types import AddTorrentResult, Group, PortTestResult, QueueMove, TorrentChangeBatch
+from transmission_rpc.view import TorrentView
 
-try:
-    __version__ = importlib.metadata.version("transmission-rpc")
-except ImportError:
-    __version__ = "develop"
+if TYPE_CHECKING:
+    from transmission_rpc.metrics import Metrics
+    from transmission_rpc.tracing import Tracer
 
-__USER_AGENT__ = f"transmission-rpc/{__version__} (https://github.com/trim21/transmission-rpc)"
 
-_hex_chars = frozenset(string.hexdigits.lower())
+@functools.lru_cache(maxsize=None)
+def _version() -> str:
+    # importlib.metadata is slow to import and to look up, only do it when the first client is created
+    import importlib.metadata  # noqa: PLC0415
 
-_TorrentID = Union[int, str]
-_TorrentIDs = Union[_TorrentID, List[_TorrentID], None]
+    try:
+        return importlib.metadata.version("transmission-rpc")
+    except ImportError:
+        return "develop"
+
+
+def _user_agent() -> str:
+    return f"transmission-rpc/{_version()} (https://github.com/trim21/transmission-rpc)"
+
+
+def __getattr__(name: str) -> str:
+    if name == "__version__":
+        return _version()
+    if name == "__USER_AGENT__":
+        return _user_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_hex_chars = b"0123456789abcdef"
+
+_TorrentID = Union[int, str, Torrent]
+_TorrentIDs = Union[_TorrentID, Iterable[_TorrentID], "TorrentIds", None]
 
 _header_session_id_key = "x-transmission-session-id"
 
-DEFAULT_TIMEOUT = 30.0
+_View = TypeVar("_View", bound=TorrentView)
 
-# urllib3 may remove support for int/float in the future
-_Timeout = Union[Timeout, int, float]
+_F = TypeVar("_F", bound=Callable[..., Any])
 
 
 class ResponseData(TypedDict):
@@ -55,6 +79,62 @@ class ResponseData(TypedDict):
     result: str
 
 
+class _SessionChangedError(Exception):
+    """daemon responded 409 with a new session id to a request with ids resolved by id cache"""
+
+
+def _encode_query(query: dict[str, Any]) -> bytes:
+    return json.dumps(query, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _timed_build(fn: _F) -> _F:
+    """count time spent to build result after the last request as its build time"""
+
+    @functools.wraps(fn)
+    def wrapper(self: Client, *args: Any, **kwargs: Any) -> Any:
+        timings = self._timings
+        if not timings.enabled or timings.building():
+            return fn(self, *args, **kwargs)
+        with timings.build():
+            return fn(self, *args, **kwargs)
+
+    return cast("_F", wrapper)
+
+
+class PreparedRequest:
+    """
+    A json-rpc request with encoded body, created by :py:meth:`Client.prepare`.
+    """
+
+    __slots__ = ("__sender", "arguments", "body", "method")
+
+    method: RpcMethod
+    arguments: dict[str, Any]
+    body: bytes  #: encoded request body
+
+    def __init__(
+        self,
+        *,
+        method: RpcMethod,
+        arguments: dict[str, Any],
+        body: bytes,
+        sender: Callable[[PreparedRequest, _Timeout | None], dict[str, Any]],
+    ):
+        self.method = method
+        self.arguments = arguments
+        self.body = body
+        self.__sender = sender
+
+    def send(self, timeout: _Timeout | None = None) -> dict[str, Any]:
+        """send this request, returns the ``arguments`` of response"""
+        return self.__sender(self, timeout)
+
+    __call__ = send
+
+    def __repr__(self) -> str:
+        return f"<PreparedRequest method={self.method!r}>"
+
+
 def ensure_location_str(s: str | pathlib.Path) -> str:
     if isinstance(s, pathlib.Path):
         if s.is_absolute():
@@ -67,31 +147,129 @@ def ensure_location_str(s: str | pathlib.Path) -> str:
     return str(s)
 
 
+def _is_lower_hex(s: str) -> bool:
+    # deleting all hex digits from the ascii bytes is much faster than building a set of chars.
+    return s.isascii() and not s.encode("ascii").translate(None, _hex_chars)
+
+
 def _parse_torrent_id(raw_torrent_id: Any) -> int | str:
     if isinstance(raw_torrent_id, int):
         if raw_torrent_id >= 0:
             return raw_torrent_id
     elif isinstance(raw_torrent_id, str):
-        if len(raw_torrent_id) != 40 or (set(raw_torrent_id) - _hex_chars):
+        if len(raw_torrent_id) != 40 or not _is_lower_hex(raw_torrent_id):
             raise ValueError(f"torrent ids {raw_torrent_id} is not valid torrent id, should be a hex str for sha1 hash")
         return raw_torrent_id
+    elif isinstance(raw_torrent_id, Torrent):
+        fields = raw_torrent_id.fields
+        if "hashString" in fields:
+            return fields["hashString"]
+        if "id" in fields:
+            return fields["id"]
+        raise ValueError("torrent has neither hashString nor id, it can't be used as torrent id")
     raise ValueError(f"{raw_torrent_id} is not valid torrent id")
 
 
+def _parse_torrent_id_list(items: list[Any] | tuple[Any, ...]) -> list[str | int]:
+    # fast path for bulk operations, validate all hash strings at once.
+    try:
+        joined = "".join(items)
+    except TypeError:
+        pass
+    else:
+        if len(joined) == 40 * len(items) and set(map(len, items)) <= {40} and _is_lower_hex(joined):
+            return list(items)
+    return [_parse_torrent_id(item) for item in items]
+
+
 def _parse_torrent_ids(args: Any) -> str | list[str | int]:
     if args is None:
         return []
-    if isinstance(args, int):
+    if isinstance(args, TorrentIds):
+        return list(args)
+    if isinstance(args, (int, Torrent)):
         return [_parse_torrent_id(args)]
     if isinstance(args, str):
         if args == "recently-active":
             return args
         return [_parse_torrent_id(args)]
     if isinstance(args, (list, tuple)):
-        return [_parse_torrent_id(item) for item in args]
+        return _parse_torrent_id_list(args)
+    if isinstance(args, Iterable) and not isinstance(args, bytes):
+        # sets, generators and ``{torrent_id: Torrent}`` index like the one used by ``refresh_torrents``
+        return _parse_torrent_id_list(list(args))
     raise ValueError(f"Invalid torrent id {args}")
 
 
+class _TorrentIdCache:
+    """``hashString`` -> torrent ``id`` mapping, valid in a single daemon session."""
+
+    __slots__ = ("hashes", "ids", "session_count")
+
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.hashes: dict[int, str] = {}
+        self.session_count: int | None = None
+
+    def add(self, hash_string: str, torrent_id: int) -> None:
+        self.ids[hash_string] = torrent_id
+        self.hashes[torrent_id] = hash_string
+
+    def discard(self, ids: Iterable[str | int]) -> None:
+        for torrent_id in ids:
+            if isinstance(torrent_id, int):
+                hash_string = self.hashes.pop(torrent_id, None)
+                if hash_string is not None:
+                    self.ids.pop(hash_string, None)
+            else:
+                known_id = self.ids.pop(torrent_id, None)
+                if known_id is not None:
+                    self.hashes.pop(known_id, None)
+
+    def clear(self) -> None:
+        self.ids.clear()
+        self.hashes.clear()
+
+    def check_session_count(self, session_count: int | None) -> None:
+        """``sessionCount`` is increased on each daemon start"""
+        if session_count is None:
+            return
+        if self.session_count is not None and session_count != self.session_count:
+            self.clear()
+        self.session_count = session_count
+
+    def resolve(self, ids: list[str | int]) -> list[str | int]:
+        known = self.ids
+        if not known:
+            return ids
+        return [known.get(x, x) if isinstance(x, str) else x for x in ids]
+
+
+class TorrentIds(Tuple[Union[int, str], ...]):
+    """
+    An immutable collection of torrent ids, validated once when it's created.
+
+    It can be passed as ``ids`` to any ``Client`` method, and no validation will happen again.
+    Items can be anything accepted as torrent id, including :py:class:`~transmission_rpc.Torrent` objects.
+
+    .. code-block:: python
+
+        ids = TorrentIds(torrent.hashString for torrent in torrents)
+        c.stop_torrent(ids)
+        c.change_torrent(ids, labels=["stopped"])
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, ids: _TorrentIDs) -> Self:
+        if ids == "recently-active":
+            raise ValueError(f"{ids!r} can't be used in TorrentIds")
+        return super().__new__(cls, _parse_torrent_ids(ids))
+
+    def __repr__(self) -> str:
+        return f"TorrentIds({list(self)!r})"
+
+
 class Client:
     __query_timeout: Timeout | None
 
@@ -106,6 +284,12 @@ class Client:
         path: str = "/transmission/rpc",
         timeout: float | Timeout | None = DEFAULT_TIMEOUT,
         logger: logging.Logger = LOGGER,
+        id_cache: bool = False,
+        pool_maxsize: int = 1,
+        transport: Transport | None = None,
+        timing_history: int = 0,
+        metrics: Metrics | None = None,
+        tracer: Tracer | None = None,
     ):
         """
 
@@ -118,6 +302,21 @@ class Client:
             path: rpc request target path, default ``/transmission/rpc``
             timeout:
             logger:
+            id_cache: remember ``hashString`` -> ``id`` of torrents seen in torrent-get and torrent-add responses,
+                and send known hash strings as the much shorter session torrent ids.
+                The cache is cleared when a daemon restart is detected by a changed session id
+                or ``sessionCount`` in :py:meth:`Client.session_stats`.
+                Torrents removed and added again by another client between two of these checks
+                get a new id, requests sent with the old id won't match any torrent.
+            pool_maxsize: number of connections kept open for reuse,
+                increase it when the client is used from multiple threads, like :py:meth:`add_torrents`.
+            transport: send requests with this transport instead of the default urllib3 based one,
+                ``protocol``, ``host``, ``port`` and ``pool_maxsize`` are ignored when it's set.
+                See :py:mod:`transmission_rpc.transport`.
+            timing_history: keep timings of last ``timing_history`` requests in :py:attr:`recent_timings`.
+                See :py:mod:`transmission_rpc.timing`.
+            metrics: collect request metrics in this registry, see :py:mod:`transmission_rpc.metrics`.
+            tracer: call hooks of this tracer for each request, see :py:mod:`transmission_rpc.tracing`.
 
         To connect to a Unix socket, pass "http+unix" as `protocol` and the path to
         the socket as `host`.
@@ -136,9 +335,10 @@ class Client:
             raise TypeError(f"unsupported value {timeout!r}, only Timeout/float/int are supported")
 
         if username or password:
-            self.__auth_headers = make_headers(basic_auth=f"{username}:{password}", user_agent=__USER_AGENT__)
+            self.__auth_headers = make_headers(basic_auth=f"{username}:{password}", user_agent=_user_agent())
         else:
-            self.__auth_headers = make_headers(user_agent=__USER_AGENT__)
+            self.__auth_headers = make_headers(user_agent=_user_agent())
+        self.__auth_headers["content-type"] = "application/json"
 
         if path == "/transmission/":
             path = "/transmission/rpc"
@@ -150,20 +350,22 @@ class Client:
 
         self.__raw_session: dict[str, Any] = {}
         self.__session_id = "0"
+        self.__id_cache: _TorrentIdCache | None = _TorrentIdCache() if id_cache else None
+        # per thread flag, set when the request being sent has ids resolved by id cache
+        self.__cached_ids = threading.local()
 
         self.__server_version: str = "(unknown)"
         self.__protocol_version: int = 17  # default 17
         self.__semver_version = None
-
-        common_args: dict[str, Any] = {"host": host, "timeout": self.timeout, "retries": False}
-        if protocol == "http":
-            self.__http_client = urllib3.HTTPConnectionPool(port=port, **common_args)
-        elif protocol == "https":
-            self.__http_client = urllib3.HTTPSConnectionPool(port=port, ca_certs=certifi.where(), **common_args)
-        elif protocol == "http+unix":
-            self.__http_client = UnixHTTPConnectionPool(**common_args)
-        else:
-            raise ValueError(f"Unknown protocol {protocol!r}, only 'http', 'https' or 'http+unix' is supported")
+        self._timings = _Timings(timing_history, self.logger)
+        self.__metrics = metrics
+        if metrics is not None:
+            self._timings.add_hook(metrics.observe)
+        self._timings.set_tracer(tracer)
+
+        if transport is None:
+            transport = Urllib3Transport(protocol, host, port, timeout=self.timeout, pool_maxsize=pool_maxsize)
+        self.__transport = transport
         self.get_session(arguments=["rpc-version", "rpc-version-semver", "version"])
         self.__torrent_get_arguments = get_torrent_arguments(self.__protocol_version)
 
@@ -216,6 +418,57 @@ class Client:
         """
         self.__query_timeout = Timeout(DEFAULT_TIMEOUT)
 
+    @property
+    def metrics(self) -> Metrics | None:
+        """metrics registry passed to the client"""
+        return self.__metrics
+
+    @property
+    def tracer(self) -> Tracer | None:
+        """tracer called for each request, can be replaced or set to ``None`` at any time"""
+        return self._timings.tracer
+
+    @tracer.setter
+    def tracer(self, value: Tracer | None) -> None:
+        self._timings.set_tracer(value)
+
+    def cached_torrent_id(self, hash_string: str) -> int | None:
+        """
+        id of torrent with ``hash_string`` in id cache.
+
+        ``None`` if it's not cached, or the client is created without ``id_cache``.
+        """
+        if self.__id_cache is None:
+            return None
+        return self.__id_cache.ids.get(hash_string)
+
+    @property
+    def recent_timings(self) -> list[RequestTiming]:
+        """
+        Timings of last requests, oldest first.
+
+        Always empty if the client is created without ``timing_history``.
+        """
+        history = self._timings.history
+        return [] if history is None else list(history)
+
+    def add_timing_hook(self, hook: TimingHook) -> None:
+        """
+        Call ``hook`` with :py:class:`~transmission_rpc.RequestTiming` of each request after it finishes.
+
+        Hooks are called in the thread sending the request, exceptions raised by hooks are logged and ignored.
+        """
+        self._timings.add_hook(hook)
+
+    def remove_timing_hook(self, hook: TimingHook) -> None:
+        """
+        Remove a hook added by :py:meth:`add_timing_hook`.
+
+        Raises:
+            ValueError: if ``hook`` is not added.
+        """
+        self._timings.remove_hook(hook)
+
     def __get_headers(self) -> dict[str, str]:
         self.__auth_headers[_header_session_id_key] = self.__session_id
 
@@ -225,7 +478,26 @@ class Client:
         """
         Query Transmission through HTTP.
         """
+        return self.__decode_timed(self._timings.current(), self._http_send(query, timeout))
+
+    def _http_send(self, query: dict[str, Any], timeout: _Timeout | None = None) -> bytes:
+        """
+        Query Transmission through HTTP, returns raw response body.
+        """
+        timing = self._timings.current()
+        if timing is None:
+            return self._http_post(_encode_query(query), timeout)
+        start = time.perf_counter()
+        body = _encode_query(query)
+        timing.serialize += time.perf_counter() - start
+        return self._http_post(body, timeout)
+
+    def _http_post(self, body: bytes | Base64JsonBody, timeout: _Timeout | None = None) -> bytes:
+        """
+        POST an encoded json-rpc request body to Transmission, handling session id negotiation.
+        """
         request_count = 0
+        timing = self._timings.current()
 
         if timeout is None:
             timeout = self.__query_timeout
@@ -235,32 +507,47 @@ class Client:
                 raise TransmissionError("too much request, try enable logger to see what happened")
 
             headers = self.__get_headers()
-            self.logger.debug({"path": self._path, "headers": headers, "data": query, "timeout": timeout})
+            if not isinstance(body, bytes):
+                # streaming body is sent with explicit length instead of chunked transfer encoding
+                headers = {**headers, "content-length": str(len(body))}
+            self.logger.debug({"path": self._path, "headers": headers, "data": body, "timeout": timeout})
 
             request_count += 1
-            try:
-                r = self.__http_client.request(
-                    "POST",
-                    url=self._path,
-                    headers=headers,
-                    json=query,
-                    timeout=timeout,
-                )
-            except urllib3.exceptions.TimeoutError as e:
-                raise TransmissionTimeoutError("timeout when connection to transmission daemon") from e
-            except urllib3.exceptions.ConnectionError as e:
-                raise TransmissionConnectError(f"can't connect to transmission daemon: {e!s}") from e
+            if timing is None:
+                r = self.__transport.request(self._path, headers, body, timeout)
+            else:
+                start = time.perf_counter()
+                try:
+                    r = self.__transport.request(self._path, headers, body, timeout)
+                finally:
+                    timing.network += time.perf_counter() - start
+                timing.request_bytes += len(body)
+                timing.response_bytes += len(r.data)
+                timing.connection_reused = r.connection_reused
+                if r.status == 409:
+                    timing.retries += 1
+                    self._timings.retry()
 
             self.logger.debug(r.data)
             if r.status in {401, 403}:
                 self.logger.debug(headers)
-                raise TransmissionAuthError("transmission daemon require auth", original=r)
+                raise TransmissionAuthError("transmission daemon require auth", original=r.original)
 
             if _header_session_id_key in r.headers:
-                self.__session_id = r.headers[_header_session_id_key]
+                session_id = r.headers[_header_session_id_key]
+                if session_id != self.__session_id:
+                    if self.__id_cache is not None:
+                        # torrent ids are only valid in a single daemon session.
+                        self.__id_cache.clear()
+                    if timing is not None and self.__session_id != "0":
+                        timing.session_id_rotations += 1
+                    self.__session_id = session_id
+                    if r.status == 409 and getattr(self.__cached_ids, "value", False):
+                        # body contains ids of the old session, it can't be sent again as is
+                        raise _SessionChangedError
 
             if r.status != 409:
-                return r.data.decode("utf-8")
+                return r.data
 
     def _request(
         self,
@@ -281,25 +568,94 @@ class Client:
             raise TypeError("request takes arguments should be dict")
 
         ids = _parse_torrent_ids(ids)
+        original_ids: list[str | int] | None = None
         if len(ids) > 0:
+            if self.__id_cache is not None and isinstance(ids, list):
+                resolved = self.__id_cache.resolve(ids)
+                if resolved != ids:
+                    original_ids = ids
+                    ids = resolved
             arguments["ids"] = ids
         elif require_ids:
             raise ValueError("request require ids")
 
         query = {"method": method, "arguments": arguments}
 
+        if not self._timings.enabled:
+            return self._parse_response(method, arguments, self.__query(query, timeout, original_ids))
+
+        with self._timings.request(method, arguments) as timing:
+            return self.__parse_timed(timing, method, arguments, self.__query(query, timeout, original_ids))
+
+    def __query(self, query: dict[str, Any], timeout: _Timeout | None, original_ids: list[str | int] | None) -> str:
         start = time.monotonic()
         try:
-            http_data = self._http_query(query, timeout)
+            if original_ids is None:
+                return self._http_query(query, timeout)
+            # ids resolved by id cache are only valid in current daemon session,
+            # if the daemon is restarted, send the request again with original ids.
+            self.__cached_ids.value = True
+            try:
+                return self._http_query(query, timeout)
+            except _SessionChangedError:
+                query["arguments"]["ids"] = original_ids
+            finally:
+                self.__cached_ids.value = False
+            return self._http_query(query, timeout)
         finally:
             elapsed = time.monotonic() - start
             self.logger.debug("http request took %.3f s", elapsed)
 
+    def _send_prepared(self, prepared: PreparedRequest, timeout: _Timeout | None = None) -> dict[str, Any]:
+        with self._timings.request(prepared.method, prepared.arguments) as timing:
+            start = time.monotonic()
+            try:
+                http_data = self.__decode_timed(timing, self._http_post(prepared.body, timeout))
+            finally:
+                elapsed = time.monotonic() - start
+                self.logger.debug("http request took %.3f s", elapsed)
+
+            return self.__parse_timed(timing, prepared.method, prepared.arguments, http_data)
+
+    def __decode_timed(self, timing: RequestTiming | None, data: bytes) -> str:
+        if timing is None:
+            return data.decode("utf-8")
+        start = time.perf_counter()
+        try:
+            return data.decode("utf-8")
+        finally:
+            timing.decode += time.perf_counter() - start
+
+    def __parse_timed(
+        self,
+        timing: RequestTiming | None,
+        method: RpcMethod,
+        arguments: dict[str, Any],
+        http_data: str,
+        *,
+        raw: bool = False,
+    ) -> dict[str, Any]:
+        if timing is None:
+            return self._parse_response(method, arguments, http_data, raw=raw)
+        start = time.perf_counter()
+        try:
+            return self._parse_response(method, arguments, http_data, raw=raw)
+        finally:
+            timing.decode += time.perf_counter() - start
+
+    def _parse_response(
+        self, method: RpcMethod, arguments: dict[str, Any], http_data: str, *, raw: bool = False
+    ) -> dict[str, Any]:
+        """
+        Decode json-rpc response of Transmission and check its result.
+
+        With ``raw=True``, response arguments are returned without method specific processing.
+        """
         try:
             data: ResponseData = json.loads(http_data)
         except json.JSONDecodeError as error:
             self.logger.exception("Error:")
-            self.logger.exception('Request: "%s"', query)
+            self.logger.exception('Request: "%s"', {"method": method, "arguments": arguments})
             self.logger.exception('HTTP data: "%s"', http_data)
             raise TransmissionError(
                 "failed to parse response as json", method=method, argument=arguments, raw_response=http_data
@@ -328,7 +684,10 @@ class Client:
 
         res = data["arguments"]
 
-        if method == RpcMethod.TorrentGet:
+        if self.__id_cache is not None:
+            self.__update_id_cache(method, arguments, res)
+
+        if raw or method == RpcMethod.TorrentGet:
             return res
         if method == RpcMethod.TorrentAdd:
             results: dict[str, Any] = {}
@@ -358,6 +717,65 @@ class Client:
 
         return res
 
+    def __update_id_cache(self, method: RpcMethod, arguments: dict[str, Any], res: dict[str, Any]) -> None:
+        cache = self.__id_cache
+        if cache is None:
+            return
+        if method == RpcMethod.TorrentGet:
+            for torrent in res.get("torrents", ()):
+                if isinstance(torrent, dict) and "hashString" in torrent and "id" in torrent:
+                    cache.add(torrent["hashString"], torrent["id"])
+            cache.discard(res.get("removed", ()))
+        elif method == RpcMethod.TorrentAdd:
+            item = res.get("torrent-added") or res.get("torrent-duplicate")
+            if item and "hashString" in item:
+                cache.add(item["hashString"], item["id"])
+        elif method == RpcMethod.TorrentRemove:
+            cache.discard(arguments.get("ids", ()))
+        elif method == RpcMethod.SessionStats:
+            stats = res.get("session-stats", res)
+            cache.check_session_count(stats.get("cumulative-stats", {}).get("sessionCount"))
+
+    def prepare(
+        self,
+        method: RpcMethod,
+        arguments: dict[str, Any] | None = None,
+        ids: _TorrentIDs | None = None,
+    ) -> PreparedRequest:
+        """
+        Prepare a request to be sent repeatedly, for example by a poller.
+
+        ``ids`` are validated and the request body is encoded only once,
+        each :py:meth:`PreparedRequest.send` only does the network round trip and response decoding.
+
+        .. code-block:: python
+
+            from transmission_rpc import Client, Torrent
+            from transmission_rpc.constants import RpcMethod
+
+            c = Client()
+            poll = c.prepare(RpcMethod.TorrentGet, {"fields": ["id", "name", "rateDownload"]})
+
+            while True:
+                torrents = [Torrent(fields=x) for x in poll.send()["torrents"]]
+
+        Returns:
+            a :py:class:`PreparedRequest`, it returns the same value as the matching ``Client`` internal request.
+        """
+        if not isinstance(method, str):
+            raise TypeError("request takes method as string")
+        arguments = {} if arguments is None else dict(arguments)
+        parsed_ids = _parse_torrent_ids(ids)
+        if parsed_ids:
+            arguments["ids"] = parsed_ids
+
+        return PreparedRequest(
+            method=method,
+            arguments=arguments,
+            body=_encode_query({"method": method, "arguments": arguments}),
+            sender=self._send_prepared,
+        )
+
     def _update_server_version(self) -> None:
         """Decode the Transmission version string, if available."""
         self.__semver_version = self.__raw_session.get("rpc-version-semver")
@@ -412,6 +830,7 @@ class Client:
         labels: Iterable[str] | None = None,
         bandwidthPriority: int | None = None,
         sequential_download: bool | None = None,
+        skip_known: bool = False,
     ) -> Torrent:
         """
         Add torrent to transfers list. ``torrent`` can be:
@@ -421,9 +840,21 @@ class Client:
         - bytes of torrent content
         - ``pathlib.Path`` for local torrent file, will be read and encoded as base64.
 
+        Content of ``pathlib.Path`` and seekable file-like objects is encoded block by block
+        while the request is sent, so memory usage doesn't grow with torrent size.
+
         Warnings:
             base64 string or ``file://`` protocol URL are not supported in v4.
 
+        If ``skip_known`` is ``True``, client is created with ``id_cache=True``,
+        and the info hash of a local torrent or magnet link is already known,
+        for example from a previous :py:meth:`get_torrents` call,
+        no request is sent and a torrent with ``id``, ``hashString`` and ``name`` is returned,
+        like the ``torrent-duplicate`` response of transmission daemon.
+        The id cache may be stale, the torrent may have been removed by other clients since it's cached.
+        Seekable file-like objects are always sent, they are not read at once to compute info hash.
+        See :py:class:`~transmission_rpc.metainfo.TorrentMetainfo` to compute file ids before adding.
+
         Parameters:
             torrent:
                 torrent to add
@@ -456,39 +887,223 @@ class Client:
             sequential_download:
                 download torrent pieces sequentially.
                 Add in rpc 18.
+            skip_known:
+                don't add torrent already in id cache.
         """
-        if labels is not None:
+        arguments = self.__torrent_add_arguments(
+            torrent,
+            _torrent_add_kwargs(
+                download_dir=download_dir,
+                files_unwanted=files_unwanted,
+                files_wanted=files_wanted,
+                paused=paused,
+                peer_limit=peer_limit,
+                priority_high=priority_high,
+                priority_low=priority_low,
+                priority_normal=priority_normal,
+                cookies=cookies,
+                labels=labels,
+                bandwidthPriority=bandwidthPriority,
+                sequential_download=sequential_download,
+            ),
+            skip_known=skip_known,
+        )
+        if isinstance(arguments, Torrent):
+            return arguments
+
+        if isinstance(arguments.get("metainfo"), str) or "filename" in arguments:
+            return next(iter(self._request(RpcMethod.TorrentAdd, arguments, timeout=timeout).values()))
+
+        with self._timings.request(RpcMethod.TorrentAdd, arguments) as timing:
+            arguments, http_data = self.__send_torrent_add(arguments, timeout)
+            return next(iter(self.__parse_timed(timing, RpcMethod.TorrentAdd, arguments, http_data).values()))
+
+    def add_torrents(
+        self,
+        torrents: Iterable[BinaryIO | str | bytes | pathlib.Path],
+        timeout: _Timeout | None = None,
+        *,
+        workers: int = 4,
+        max_pending: int | None = None,
+        skip_known: bool = False,
+        **kwargs: Any,
+    ) -> list[AddTorrentResult]:
+        """
+        Add many torrents concurrently.
+
+        Torrents are read, encoded and added in a pool of ``workers`` threads.
+        ``torrents`` is consumed lazily and at most ``max_pending`` torrents (default ``2 * workers``)
+        are read but not added yet, so memory usage doesn't grow with the number of torrents.
+        Create the client with ``pool_maxsize`` no smaller than ``workers`` to reuse connections.
+
+        .. code-block:: python
+
+            client = Client(pool_maxsize=8, id_cache=True)
+            results = client.add_torrents(pathlib.Path("watch").glob("*.torrent"), workers=8, skip_known=True)
+            failed = [r for r in results if r.status == "error"]
+
+        Parameters:
+            torrents: torrents to add, each item is same as ``torrent`` in :py:meth:`add_torrent`.
+            timeout: request timeout of each torrent-add request.
+            workers: number of concurrent requests.
+            max_pending: max number of torrents read but not added yet.
+            skip_known: same as ``skip_known`` in :py:meth:`add_torrent`.
+            kwargs: keyword arguments of :py:meth:`add_torrent`, applied to all torrents.
+
+        Returns:
+            result of each torrent, in order of ``torrents``.
+            Errors of a single torrent are returned in its result instead of raised.
+        """
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        if max_pending is None:
+            max_pending = 2 * workers
+        elif max_pending < workers:
+            raise ValueError("max_pending must not be less than workers")
+
+        shared = _torrent_add_kwargs(**kwargs)
+
+        def add(torrent: BinaryIO | str | bytes | pathlib.Path) -> AddTorrentResult:
+            try:
+                arguments = self.__torrent_add_arguments(torrent, dict(shared), skip_known=skip_known)
+                if isinstance(arguments, Torrent):
+                    return AddTorrentResult(torrent, "duplicate", arguments)
+
+                with self._timings.request(RpcMethod.TorrentAdd, arguments) as timing:
+                    arguments, http_data = self.__send_torrent_add(arguments, timeout)
+                    res = self.__parse_timed(timing, RpcMethod.TorrentAdd, arguments, http_data, raw=True)
+                if res.get("torrent-added"):
+                    return AddTorrentResult(torrent, "added", Torrent(fields=res["torrent-added"]))
+                if res.get("torrent-duplicate"):
+                    return AddTorrentResult(torrent, "duplicate", Torrent(fields=res["torrent-duplicate"]))
+                raise TransmissionError(
+                    "Invalid torrent-add response.",
+                    method=RpcMethod.TorrentAdd,
+                    argument=arguments,
+                    response=res,
+                    raw_response=http_data,
+                )
+            except Exception as e:
+                return AddTorrentResult(torrent, "error", error=e)
+
+        results: list[AddTorrentResult | None] = []
+        pending: dict[concurrent.futures.Future[AddTorrentResult], int] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transmission-rpc") as pool:
+            for torrent in torrents:
+                if len(pending) >= max_pending:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        results[pending.pop(future)] = future.result()
+                pending[pool.submit(add, torrent)] = len(results)
+                results.append(None)
+
+            for future, index in pending.items():
+                results[index] = future.result()
+
+        return cast("list[AddTorrentResult]", results)
+
+    def __torrent_add_arguments(
+        self, torrent: BinaryIO | str | bytes | pathlib.Path, arguments: dict[str, Any], *, skip_known: bool
+    ) -> dict[str, Any] | Torrent:
+        """
+        torrent-add arguments with torrent content encoded, or a known torrent if it doesn't need to be added.
+        """
+        if "labels" in arguments:
             self._rpc_version_warning(17)
 
-        if sequential_download is not None:
+        if "sequential_download" in arguments:
             self._rpc_version_warning(18)
 
-        kwargs: dict[str, Any] = remove_unset_value(
-            {
-                "download-dir": download_dir,
-                "files-unwanted": files_unwanted,
-                "files-wanted": files_wanted,
-                "paused": paused,
-                "peer-limit": peer_limit,
-                "priority-high": priority_high,
-                "priority-low": priority_low,
-                "priority-normal": priority_normal,
-                "bandwidthPriority": bandwidthPriority,
-                "sequential_download": sequential_download,
-                "cookies": cookies,
-                "labels": list_or_none(_single_str_as_list(labels)),
-            }
-        )
+        if isinstance(torrent, pathlib.Path) or _is_seekable(torrent):
+            # content is read and encoded when request is sent, see `__send_torrent_add`
+            if skip_known and isinstance(torrent, pathlib.Path):
+                known = self.__find_known_torrent(torrent)
+                if known is not None:
+                    return known
+            arguments["metainfo"] = torrent
+            return arguments
+
+        torrent_data = _read_torrent(torrent)
+        if torrent_data is not None and not torrent_data:
+            raise ValueError("Torrent metadata is empty")
+
+        if skip_known:
+            # not seekable file-like object is already read, string may be a magnet link
+            known = self.__find_known_torrent(torrent if isinstance(torrent, str) else torrent_data)
+            if known is not None:
+                return known
 
-        torrent_data = _try_read_torrent(torrent)
         if torrent_data is None:
-            kwargs["filename"] = torrent
+            arguments["filename"] = torrent
         else:
-            if not torrent_data:
-                raise ValueError("Torrent metadata is empty")
-            kwargs["metainfo"] = torrent_data
+            arguments["metainfo"] = base64.b64encode(torrent_data).decode("utf-8")
+
+        return arguments
+
+    def __send_torrent_add(self, arguments: dict[str, Any], timeout: _Timeout | None) -> tuple[dict[str, Any], str]:
+        """
+        send torrent-add request, local torrent file in ``metainfo`` is streamed as base64 without reading it at once.
+
+        Returns arguments without torrent file and the response body.
+        """
+        source = arguments.get("metainfo")
+        if source is None or isinstance(source, str):
+            return arguments, self._http_query({"method": RpcMethod.TorrentAdd, "arguments": arguments}, timeout)
+
+        arguments = {key: value for key, value in arguments.items() if key != "metainfo"}
+        # metainfo is the last key, encoded as `..."metainfo":""}}`
+        envelope = _encode_query({"method": RpcMethod.TorrentAdd, "arguments": {**arguments, "metainfo": ""}})
+        body = Base64JsonBody(envelope[:-3], source, envelope[-3:])
+        if not body.size:
+            raise ValueError("Torrent metadata is empty")
+
+        start = time.monotonic()
+        try:
+            http_data = self.__decode_timed(self._timings.current(), self._http_post(body, timeout))
+        finally:
+            elapsed = time.monotonic() - start
+            self.logger.debug("http request took %.3f s", elapsed)
+
+        return arguments, http_data
+
+    def __find_known_torrent(self, torrent: str | bytes | pathlib.Path | None) -> Torrent | None:
+        """
+        torrent already known in id cache, found by info hash of local torrent content or magnet link.
+
+        Seekable file-like objects are not checked, reading them at once would defeat streaming them.
+        """
+        cache = self.__id_cache
+        if cache is None or not cache.ids or torrent is None:
+            return None
+
+        info_hash: str | None
+        name: str | None
+        try:
+            if isinstance(torrent, str):
+                if not torrent.startswith("magnet:"):
+                    return None
+                magnet = parse_magnet(torrent)
+                info_hash, name = magnet.info_hash, magnet.name
+            else:
+                if isinstance(torrent, pathlib.Path):
+                    meta = TorrentMetainfo.from_file(torrent)
+                else:
+                    meta = TorrentMetainfo(torrent)
+                info_hash, name = meta.info_hash, meta.name
+        except ValueError:
+            # let transmission daemon report invalid torrent
+            return None
 
-        return next(iter(self._request(RpcMethod.TorrentAdd, kwargs, timeout=timeout).values()))
+        if info_hash is None:
+            return None
+        torrent_id = cache.ids.get(info_hash)
+        if torrent_id is None:
+            return None
+
+        fields: dict[str, Any] = {"id": torrent_id, "hashString": info_hash}
+        if name:
+            fields["name"] = name
+        return Torrent(fields=fields)
 
     def remove_torrent(self, ids: _TorrentIDs, delete_data: bool = False, timeout: _Timeout | None = None) -> None:
         """
@@ -537,6 +1152,7 @@ class Client:
         """Reannounce torrent(s) with provided id(s)"""
         self._request(RpcMethod.TorrentReannounce, {}, ids, True, timeout=timeout)
 
+    @_timed_build
     def get_torrent(
         self,
         torrent_id: _TorrentID,
@@ -593,17 +1209,77 @@ class Client:
                 return Torrent(fields=torrent)
         raise KeyError("Torrent not found in result")
 
+    @overload
+    def get_torrents(
+        self,
+        ids: _TorrentIDs | None = None,
+        arguments: Iterable[str] | None = None,
+        timeout: _Timeout | None = None,
+        *,
+        view: None = None,
+        raw: Literal[False] = False,
+    ) -> list[Torrent]: ...
+
+    @overload
+    def get_torrents(
+        self,
+        ids: _TorrentIDs | None = None,
+        arguments: None = None,
+        timeout: _Timeout | None = None,
+        *,
+        view: type[_View],
+        raw: Literal[False] = False,
+    ) -> list[_View]: ...
+
+    @overload
+    def get_torrents(
+        self,
+        ids: _TorrentIDs | None = None,
+        arguments: Iterable[str] | None = None,
+        timeout: _Timeout | None = None,
+        *,
+        view: None = None,
+        raw: Literal[True],
+    ) -> list[dict[str, Any]]: ...
+
+    @_timed_build
     def get_torrents(
         self,
         ids: _TorrentIDs | None = None,
         arguments: Iterable[str] | None = None,
         timeout: _Timeout | None = None,
-    ) -> list[Torrent]:
+        *,
+        view: type[TorrentView] | None = None,
+        raw: bool = False,
+    ) -> list[Torrent] | list[Any]:
         """
         Get information for torrents with provided ids. For more information see :py:meth:`Client.get_torrent`.
 
         Returns a list of Torrent object.
+
+        Parameters:
+            ids: torrent(s) to fetch, all torrents if not set.
+            arguments: fetched torrent arguments.
+            timeout: request timeout.
+            view: a :py:class:`~transmission_rpc.TorrentView` subclass.
+                Only fields declared by the view are requested,
+                and a list of view instances is returned instead of ``Torrent``.
+            raw: return decoded torrent dicts as-is, without wrapping them in ``Torrent``.
+                ``arguments`` are requested as given, ``id`` and ``hashString`` are not added.
         """
+        if raw:
+            if view is not None:
+                raise ValueError("`raw` can't be used together with `view`")
+            fields = list(arguments) if arguments else self.__torrent_get_arguments
+            return self._request(RpcMethod.TorrentGet, {"fields": fields}, ids, timeout=timeout)["torrents"]
+
+        if view is not None:
+            if arguments:
+                raise ValueError("`arguments` can't be used together with `view`")
+            result = self._request(RpcMethod.TorrentGet, {"fields": view.rpc_fields}, ids, timeout=timeout)
+            build = view.from_fields
+            return [build(x) for x in result["torrents"]]
+
         if arguments:
             arguments = list(set(arguments) | {"id", "hashString"})
         else:
@@ -613,6 +1289,73 @@ class Client:
             for x in self._request(RpcMethod.TorrentGet, {"fields": arguments}, ids, timeout=timeout)["torrents"]
         ]
 
+    def get_torrents_bytes(
+        self,
+        ids: _TorrentIDs | None = None,
+        arguments: Iterable[str] | None = None,
+        timeout: _Timeout | None = None,
+    ) -> bytes:
+        """
+        Send a torrent-get request and return the response body untouched, for proxies.
+
+        The response is not decoded, so ``result`` of the response is not checked.
+        ``arguments`` are requested as given, ``id`` and ``hashString`` are not added.
+        """
+        args: dict[str, Any] = {"fields": list(arguments) if arguments else self.__torrent_get_arguments}
+        parsed_ids = _parse_torrent_ids(ids)
+        if parsed_ids:
+            args["ids"] = parsed_ids
+        # timed like other requests, decode time is left empty as the response is not decoded
+        with self._timings.request(RpcMethod.TorrentGet, args):
+            return self._http_send({"method": RpcMethod.TorrentGet, "arguments": args}, timeout)
+
+    @_timed_build
+    def refresh_torrents(
+        self,
+        torrents: dict[int, Torrent],
+        ids: _TorrentIDs | None = None,
+        arguments: Iterable[str] | None = None,
+        timeout: _Timeout | None = None,
+    ) -> dict[int, set[str]]:
+        """
+        Update a ``{torrent.id: torrent}`` snapshot in-place.
+
+        Existing ``Torrent`` objects are kept and updated with :py:meth:`Torrent.update`,
+        new torrents are added to ``torrents``.
+        When ``ids`` is not set, all torrents are fetched and torrents no longer in the daemon
+        are removed from ``torrents``.
+
+        Returns:
+            ``{torrent_id: changed_fields}`` for torrents that changed or were added.
+        """
+        if arguments:
+            arguments = list(set(arguments) | {"id", "hashString"})
+        else:
+            arguments = self.__torrent_get_arguments
+
+        result = self._request(RpcMethod.TorrentGet, {"fields": arguments}, ids, timeout=timeout)
+
+        changes: dict[int, set[str]] = {}
+        seen: set[int] = set()
+        for fields in result["torrents"]:
+            torrent_id = fields["id"]
+            seen.add(torrent_id)
+            torrent = torrents.get(torrent_id)
+            if torrent is None:
+                torrents[torrent_id] = Torrent(fields=fields)
+                changes[torrent_id] = set(fields)
+                continue
+            changed = torrent.update(fields)
+            if changed:
+                changes[torrent_id] = changed
+
+        if ids is None:
+            for torrent_id in torrents.keys() - seen:
+                del torrents[torrent_id]
+
+        return changes
+
+    @_timed_build
     def get_recently_active_torrents(
         self, arguments: Iterable[str] | None = None, timeout: _Timeout | None = None
     ) -> tuple[list[Torrent], list[int]]:
@@ -765,6 +1508,74 @@ class Client:
         else:
             raise ValueError("No arguments to set")
 
+    def reconcile_torrents(
+        self,
+        desired: Mapping[_TorrentID, Mapping[str, Any]],
+        timeout: _Timeout | None = None,
+        *,
+        dry_run: bool = False,
+    ) -> list[TorrentChangeBatch]:
+        """
+        Converge per-torrent settings to a desired state with as few torrent-set requests as possible.
+
+        Current values are fetched in a single torrent-get request,
+        torrents needing identical changes are grouped and changed by one torrent-set request.
+
+        .. code-block:: python
+
+            c.reconcile_torrents(
+                {
+                    "51ba7d0dd45ab9b9564329c33f4f97493b677924": {"labels": ["linux"], "seed_ratio_limit": 2.0},
+                    3: {"labels": ["linux"], "seed_ratio_limit": 2.0},
+                    5: {"bandwidth_priority": Priority.High},
+                }
+            )
+
+        Parameters:
+            desired: ``{torrent_id: {argument: value}}``, arguments are keyword arguments of
+                :py:meth:`Client.change_torrent`. Supported arguments are
+                ``bandwidth_priority``, ``download_limit``, ``download_limited``, ``upload_limit``,
+                ``upload_limited``, ``honors_session_limits``, ``peer_limit``, ``seed_idle_limit``,
+                ``seed_idle_mode``, ``seed_ratio_limit``, ``seed_ratio_mode``, ``labels``, ``group``
+                and ``sequential_download``.
+            timeout: request timeout of each request.
+            dry_run: only compute the changes, don't send torrent-set requests.
+
+        Returns:
+            torrent-set requests sent, or would be sent when ``dry_run`` is ``True``.
+            Torrents not found in daemon are skipped.
+        """
+        fields = {"id", "hashString"}
+        for settings in desired.values():
+            for name in settings:
+                if name not in TORRENT_RECONCILE_FIELDS:
+                    raise ValueError(f"unsupported argument {name!r} to reconcile")
+                fields.add(TORRENT_RECONCILE_FIELDS[name])
+
+        if not desired:
+            return []
+
+        ids = list(desired)
+        current = self.get_torrents(ids, arguments=sorted(fields), timeout=timeout, raw=True)
+
+        by_key: dict[int | str, dict[str, Any]] = {}
+        for torrent in current:
+            by_key[torrent["id"]] = torrent
+            by_key[torrent["hashString"]] = torrent
+
+        desired_by_id: dict[int, Mapping[str, Any]] = {}
+        for torrent_id, parsed_id in zip(ids, _parse_torrent_id_list(ids)):
+            found = by_key.get(parsed_id)
+            if found is not None:
+                desired_by_id[found["id"]] = desired[torrent_id]
+
+        batches = plan_torrent_changes(desired_by_id, {t["id"]: t for t in current})
+        if not dry_run:
+            for batch in batches:
+                self.change_torrent(batch.ids, timeout=timeout, **batch.arguments)
+
+        return batches
+
     def move_torrent_data(
         self,
         ids: _TorrentIDs,
@@ -840,6 +1651,45 @@ class Client:
         """Move transfer down in the queue."""
         self._request(RpcMethod.QueueMoveDown, ids=ids, require_ids=True, timeout=timeout)
 
+    def reorder_queue(self, ids: _TorrentIDs, timeout: _Timeout | None = None) -> list[QueueMove]:
+        """
+        Reorder the queue so torrents in ``ids`` are at the top of queue in the given order,
+        other torrents are placed after them and keep their current order.
+
+        Instead of moving torrents one by one, a few queue-move-top/bottom requests with multiple ids are sent,
+        ``log2(n)`` at most for n torrents. Queue positions are verified after moving.
+
+        Raises:
+            TransmissionError: queue order is not the expected order after moving,
+                for example torrents are added or moved by others at the same time.
+
+        Returns:
+            queue movement requests sent.
+        """
+        if ids == "recently-active":
+            raise ValueError(f"{ids!r} can't be used to reorder queue")
+        order = _parse_torrent_ids(ids)
+
+        fields = ["id", "hashString", "queuePosition"]
+        torrents = self.get_torrents(arguments=fields, timeout=timeout, raw=True)
+        by_hash = {t["hashString"]: t["id"] for t in torrents}
+        target = [by_hash.get(x, x) if isinstance(x, str) else x for x in order]
+        positions = {t["id"]: t["queuePosition"] for t in torrents}
+
+        moves = plan_queue_moves(target, positions)
+        for move in moves:
+            self._request(move.method, ids=move.ids, require_ids=True, timeout=timeout)
+
+        if moves:
+            positions = {
+                t["id"]: t["queuePosition"] for t in self.get_torrents(arguments=fields, timeout=timeout, raw=True)
+            }
+        if plan_queue_moves(target, positions):
+            raise TransmissionError("queue order is not the expected order after moving torrents")
+
+        return moves
+
+    @_timed_build
     def get_session(
         self,
         timeout: _Timeout | None = None,
@@ -1088,6 +1938,53 @@ class Client:
 
         if args:
             self._request(RpcMethod.SessionSet, args, timeout=timeout)
+            self.__raw_session.update(args)
+
+    def reconcile_session(
+        self,
+        desired: Mapping[str, Any],
+        timeout: _Timeout | None = None,
+        *,
+        refresh: bool = False,
+    ) -> dict[str, tuple[Any, Any]]:
+        """
+        Set session parameters, but only send parameters different from current session.
+
+        Current values are taken from the session cached by :py:meth:`Client.get_session`,
+        parameters not cached yet are fetched in one session-get request.
+        No session-set request is sent if nothing differs.
+
+        .. code-block:: python
+
+            c.reconcile_session({"download_dir": "/data", "speed_limit_down": 1000, "speed_limit_down_enabled": True})
+
+        Parameters:
+            desired: keyword arguments of :py:meth:`Client.set_session`.
+            timeout: request timeout.
+            refresh: fetch all parameters in ``desired`` from daemon instead of using cached values.
+
+        Returns:
+            ``{argument: (old value, new value)}`` of changed parameters.
+        """
+        rpc_names = {name: _session_rpc_name(name) for name in desired}
+
+        missing = (
+            list(rpc_names.values()) if refresh else [x for x in rpc_names.values() if x not in self.__raw_session]
+        )
+        if missing:
+            self.get_session(timeout=timeout, arguments=missing)
+
+        changes: dict[str, tuple[Any, Any]] = {}
+        for name, value in desired.items():
+            old = self.__raw_session.get(rpc_names[name])
+            new = "\n".join(value) if name == "default_trackers" and value is not None else value
+            if old != new:
+                changes[name] = (old, value)
+
+        if changes:
+            self.set_session(timeout, **{name: new for name, (_, new) in changes.items()})
+
+        return changes
 
     def blocklist_update(self, timeout: _Timeout | None = None) -> int | None:
         """Update block list. Returns the size of the block list."""
@@ -1123,6 +2020,7 @@ class Client:
             return result["size-bytes"]
         return None
 
+    @_timed_build
     def session_stats(self, timeout: _Timeout | None = None) -> SessionStats:
         """Get session statistics"""
         result = self._request(RpcMethod.SessionStats, timeout=timeout)
@@ -1176,6 +2074,7 @@ class Client:
 
         self._request(RpcMethod.GroupSet, arguments, timeout=timeout)
 
+    @_timed_build
     def get_group(self, name: str, *, timeout: _Timeout | None = None) -> Group | None:
         self._rpc_version_warning(17)
         result: dict[str, Any] = self._request(RpcMethod.GroupGet, {"group": name}, timeout=timeout)
@@ -1185,6 +2084,7 @@ class Client:
 
         return None
 
+    @_timed_build
     def get_groups(self, name: list[str] | None = None, *, timeout: _Timeout | None = None) -> dict[str, Group]:
         payload = {}
         if name is not None:
@@ -1195,7 +2095,7 @@ class Client:
         return {x["name"]: Group(fields=x) for x in result["group"]}
 
     def close(self) -> None:
-        self.__http_client.close()
+        self.__transport.close()
 
     def __enter__(self) -> Self:
         return self
@@ -1212,6 +2112,17 @@ class Client:
 T = TypeVar("T")
 
 
+def _session_rpc_name(name: str) -> str:
+    if name in {"timeout", "kwargs"}:
+        raise ValueError(f"{name!r} is not a session parameter")
+    if name not in inspect.signature(Client.set_session).parameters:
+        raise ValueError(f"unknown session parameter {name!r}")
+    if name.startswith("seed_ratio_limit"):
+        # seedRatioLimit and seedRatioLimited
+        return "seedRatio" + name[len("seed_ratio_") :].title()
+    return name.replace("_", "-")
+
+
 def _single_str_as_list(v: Iterable[str] | None) -> list[str] | None:
     if v is None:
         return v
@@ -1230,10 +2141,58 @@ def remove_unset_value(data: dict[str, Any]) -> dict[str, Any]:
     return {key: value for key, value in data.items() if value is not None}
 
 
+def _torrent_add_kwargs(
+    *,
+    download_dir: str | None = None,
+    files_unwanted: list[int] | None = None,
+    files_wanted: list[int] | None = None,
+    paused: bool | None = None,
+    peer_limit: int | None = None,
+    priority_high: list[int] | None = None,
+    priority_low: list[int] | None = None,
+    priority_normal: list[int] | None = None,
+    cookies: str | None = None,
+    labels: Iterable[str] | None = None,
+    bandwidthPriority: int | None = None,
+    sequential_download: bool | None = None,
+) -> dict[str, Any]:
+    return remove_unset_value(
+        {
+            "download-dir": download_dir,
+            "files-unwanted": files_unwanted,
+            "files-wanted": files_wanted,
+            "paused": paused,
+            "peer-limit": peer_limit,
+            "priority-high": priority_high,
+            "priority-low": priority_low,
+            "priority-normal": priority_normal,
+            "bandwidthPriority": bandwidthPriority,
+            "sequential_download": sequential_download,
+            "cookies": cookies,
+            "labels": list_or_none(_single_str_as_list(labels)),
+        }
+    )
+
+
 def _try_read_torrent(torrent: BinaryIO | str | bytes | pathlib.Path) -> str | None:
     """
     if torrent should be encoded with base64, return a non-None value.
     """
+    content = _read_torrent(torrent)
+    if content is None:
+        return None
+    return base64.b64encode(content).decode("utf-8")
+
+
+def _is_seekable(torrent: Any) -> bool:
+    seekable = getattr(torrent, "seekable", None)
+    return hasattr(torrent, "read") and seekable is not None and seekable()
+
+
+def _read_torrent(torrent: BinaryIO | str | bytes | pathlib.Path) -> bytes | None:
+    """
+    return content of a local torrent, or ``None`` if torrent should be passed to daemon as ``filename``.
+    """
     # torrent is a str, may be a url
     if isinstance(torrent, str):
         parsed_uri = urlparse(torrent)
@@ -1244,11 +2203,11 @@ def _try_read_torrent(torrent: BinaryIO | str | bytes | pathlib.Path) -> str | N
         if parsed_uri.scheme in ["file"]:
             raise ValueError("support for `file://` URL has been removed.")
     elif isinstance(torrent, pathlib.Path):
-        return base64.b64encode(torrent.read_bytes()).decode("utf-8")
+        return torrent.read_bytes()
     elif isinstance(torrent, bytes):
-        return base64.b64encode(torrent).decode("utf-8")
+        return torrent
     # maybe a file, try read content and encode it.
     elif hasattr(torrent, "read"):
-        return base64.b64encode(torrent.read()).decode("utf-8")
+        return torrent.read()
 
     return None
@@ -10,6 +10,8 @@ from typing import NamedTuple
 LOGGER = logging.getLogger("transmission-rpc")
 LOGGER.setLevel(logging.ERROR)
 
+DEFAULT_TIMEOUT = 30.0
+
 
 class Priority(enum.IntEnum):
     Low = -1
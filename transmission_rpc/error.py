@@ -4,10 +4,12 @@ exception raise by this package
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import typing_extensions
-from urllib3 import BaseHTTPResponse
+from transmission_rpc._deprecated import deprecated
+
+if TYPE_CHECKING:
+    from urllib3 import BaseHTTPResponse
 
 
 class TransmissionError(Exception):
@@ -47,7 +49,7 @@ class TransmissionError(Exception):
         return self.message
 
     @property
-    @typing_extensions.deprecated("use .raw_response instead")
+    @deprecated("use .raw_response instead")
     def rawResponse(self) -> str | None:
         return self.raw_response
 
@@ -0,0 +1,255 @@
+"""
+Local parsing of torrent metainfo (.torrent files) and magnet links.
+
+It's used to compute info hash of a torrent before it's added,
+so uploading a torrent that transmission daemon already has can be skipped,
+and to list files so ``files_wanted`` or ``priority_*`` indices can be computed before adding.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import mmap
+import pathlib
+from typing import Any, NamedTuple, Union
+from urllib.parse import parse_qs, urlparse
+
+_Buffer = Union[bytes, bytearray, mmap.mmap]
+
+_DIGITS = frozenset(b"0123456789")
+
+# real torrents nest a few levels, v2 file tree one level per directory
+_MAX_DEPTH = 256
+
+
+class _Decoder:
+    __slots__ = ("data", "info_span", "size")
+
+    def __init__(self, data: _Buffer):
+        self.data = data
+        self.size = len(data)
+        self.info_span: tuple[int, int] | None = None
+
+    def decode(self, i: int, depth: int) -> tuple[Any, int]:
+        data = self.data
+        if i >= self.size:
+            raise ValueError("invalid bencode data, unexpected end of data")
+        if depth > _MAX_DEPTH:
+            raise ValueError(f"invalid bencode data, nested deeper than {_MAX_DEPTH} levels")
+        c = data[i]
+        if c == 0x69:  # i
+            end = data.find(b"e", i + 1)
+            if end < 0:
+                raise ValueError("invalid bencode data, unterminated integer")
+            return int(data[i + 1 : end]), end + 1
+        if c == 0x6C:  # l
+            items = []
+            i += 1
+            while i < self.size and data[i] != 0x65:  # e
+                item, i = self.decode(i, depth + 1)
+                items.append(item)
+            if i >= self.size:
+                raise ValueError("invalid bencode data, unterminated list")
+            return items, i + 1
+        if c == 0x64:  # d
+            result: dict[bytes, Any] = {}
+            i += 1
+            while i < self.size and data[i] != 0x65:  # e
+                key, i = self.decode(i, depth + 1)
+                if not isinstance(key, bytes):
+                    raise ValueError("invalid bencode data, dict key must be a string")  # noqa: TRY004
+                start = i
+                result[key], i = self.decode(i, depth + 1)
+                if depth == 0 and key == b"info":
+                    self.info_span = (start, i)
+            if i >= self.size:
+                raise ValueError("invalid bencode data, unterminated dict")
+            return result, i + 1
+        if c in _DIGITS:
+            colon = data.find(b":", i)
+            if colon < 0:
+                raise ValueError("invalid bencode data, missing string length")
+            length = bytes(data[i:colon])
+            if not length.isdigit():
+                raise ValueError(f"invalid bencode data, invalid string length {length!r} at {i}")
+            end = colon + 1 + int(length)
+            if end > self.size:
+                raise ValueError("invalid bencode data, string length overflow")
+            return bytes(data[colon + 1 : end]), end
+        raise ValueError(f"invalid bencode data, unexpected byte {c!r} at {i}")
+
+
+def bdecode(data: _Buffer) -> Any:
+    """
+    Decode bencoded data from bytes or ``mmap``. Strings are returned as ``bytes``, including dict keys.
+    """
+    value, end = _Decoder(data).decode(0, 0)
+    if end != len(data):
+        raise ValueError("invalid bencode data, trailing data")
+    return value
+
+
+class MetainfoFile(NamedTuple):
+    id: int
+    """index of file, same as the file id in :py:meth:`transmission_rpc.Client.add_torrent`"""
+
+    name: str
+    """path of file, including the torrent name as first component for multi-file torrent"""
+
+    size: int
+    """file size in bytes"""
+
+
+def _text(d: dict[bytes, Any], key: bytes) -> str:
+    value = d.get(key + b".utf-8", d.get(key, b""))
+    if not isinstance(value, bytes):
+        raise ValueError(f"invalid torrent metainfo, {key.decode()} must be a string")  # noqa: TRY004
+    return value.decode("utf-8", errors="replace")
+
+
+def _dict(value: Any, what: str) -> dict[bytes, Any]:
+    if not isinstance(value, dict):
+        raise ValueError(f"invalid torrent metainfo, {what} must be a dict")  # noqa: TRY004
+    return value
+
+
+def _length(d: dict[bytes, Any]) -> int:
+    value = d.get(b"length")
+    if not isinstance(value, int) or value < 0:
+        raise ValueError("invalid torrent metainfo, file length must be a non-negative integer")
+    return value
+
+
+class TorrentMetainfo:
+    """
+    Parsed torrent metainfo.
+
+    .. code-block:: python
+
+        meta = TorrentMetainfo.from_file(pathlib.Path("ubuntu.torrent"))
+        wanted = [f.id for f in meta.files if f.name.endswith(".iso")]
+        client.add_torrent(pathlib.Path("ubuntu.torrent"), files_wanted=wanted)
+    """
+
+    __slots__ = ("files", "info_hash", "info_hash_v2", "name", "piece_length")
+
+    info_hash: str | None
+    """hex sha1 info hash for v1 and hybrid torrent, the ``hashString`` in transmission"""
+
+    info_hash_v2: str | None
+    """hex sha256 info hash for v2 and hybrid torrent"""
+
+    name: str
+    piece_length: int
+    files: list[MetainfoFile]
+    """files in order of transmission file id. Padding files of hybrid torrents are excluded."""
+
+    def __init__(self, data: _Buffer):
+        decoder = _Decoder(data)
+        root, end = decoder.decode(0, 0)
+        info = root.get(b"info") if isinstance(root, dict) else None
+        if end != len(data) or decoder.info_span is None or not isinstance(info, dict):
+            raise ValueError("invalid torrent metainfo, missing info dict")
+
+        start, stop = decoder.info_span
+        with memoryview(data) as view:
+            info_bytes = view[start:stop]
+            # sha1 is required by BitTorrent v1 protocol
+            self.info_hash = hashlib.sha1(info_bytes).hexdigest() if b"pieces" in info else None  # noqa: S324
+            self.info_hash_v2 = hashlib.sha256(info_bytes).hexdigest() if info.get(b"meta version") == 2 else None
+            info_bytes.release()
+
+        self.name = _text(info, b"name")
+        self.piece_length = info.get(b"piece length", 0)
+        if not isinstance(self.piece_length, int):
+            raise ValueError("invalid torrent metainfo, piece length must be an integer")  # noqa: TRY004
+        self.files = _files(self.name, info)
+
+    @classmethod
+    def from_file(cls, path: str | pathlib.Path) -> TorrentMetainfo:
+        """parse a .torrent file, the file is memory-mapped instead of read"""
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return cls(m)
+
+    @property
+    def total_size(self) -> int:
+        return sum(f.size for f in self.files)
+
+    def __repr__(self) -> str:
+        return f"<TorrentMetainfo name={self.name!r} info_hash={self.info_hash!r}>"
+
+
+def _files(name: str, info: dict[bytes, Any]) -> list[MetainfoFile]:
+    if b"files" in info:
+        if not isinstance(info[b"files"], list):
+            raise ValueError("invalid torrent metainfo, files must be a list")
+        files: list[tuple[str, int]] = []
+        for item in info[b"files"]:
+            f = _dict(item, "file")
+            attr = f.get(b"attr", b"")
+            if isinstance(attr, bytes) and b"p" in attr:
+                continue
+            path = f.get(b"path.utf-8", f.get(b"path", []))
+            if not isinstance(path, list) or not all(isinstance(p, bytes) for p in path):
+                raise ValueError("invalid torrent metainfo, file path must be a list of strings")
+            files.append(("/".join([name, *(p.decode("utf-8", errors="replace") for p in path)]), _length(f)))
+    elif b"length" in info:
+        files = [(name, _length(info))]
+    elif b"file tree" in info:
+        files = []
+        _walk_file_tree(_dict(info[b"file tree"], "file tree"), [name], files)
+    else:
+        raise ValueError("invalid torrent metainfo, no files")
+
+    return [MetainfoFile(id=i, name=path, size=size) for i, (path, size) in enumerate(files)]
+
+
+def _walk_file_tree(tree: dict[bytes, Any], parents: list[str], out: list[tuple[str, int]]) -> None:
+    for key in sorted(tree):
+        node = _dict(tree[key], "file tree node")
+        if key == b"":
+            out.append(("/".join(parents), _length(node)))
+        else:
+            _walk_file_tree(node, [*parents, key.decode("utf-8", errors="replace")], out)
+
+
+class MagnetLink(NamedTuple):
+    info_hash: str | None
+    """hex v1 info hash, from ``urn:btih:``"""
+
+    info_hash_v2: str | None
+    """hex v2 info hash, from ``urn:btmh:``"""
+
+    name: str | None
+    """display name, ``dn``"""
+
+
+def parse_magnet(uri: str) -> MagnetLink:
+    """
+    Extract info hashes from a magnet URI. Base32 ``btih`` hashes are converted to hex.
+    """
+    u = urlparse(uri)
+    if u.scheme != "magnet":
+        raise ValueError(f"{uri!r} is not a magnet link")
+
+    query = parse_qs(u.query)
+    v1 = v2 = None
+    for xt in query.get("xt", []):
+        if xt.startswith("urn:btih:"):
+            value = xt[len("urn:btih:") :]
+            if len(value) == 40:
+                v1 = bytes.fromhex(value).hex()
+            elif len(value) == 32:
+                v1 = base64.b32decode(value.upper()).hex()
+            else:
+                raise ValueError(f"invalid btih info hash {value!r}")
+        elif xt.startswith("urn:btmh:1220"):
+            # sha256 multihash
+            v2 = bytes.fromhex(xt[len("urn:btmh:1220") :]).hex()
+
+    if v1 is None and v2 is None:
+        raise ValueError(f"{uri!r} has no info hash")
+
+    names = query.get("dn")
+    return MagnetLink(info_hash=v1, info_hash_v2=v2, name=names[0] if names else None)
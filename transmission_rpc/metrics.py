@@ -0,0 +1,245 @@
+"""
+Request metrics of :py:class:`transmission_rpc.Client` in Prometheus text exposition format, without extra dependencies.
+
+Metrics are collected from :py:mod:`request timings <transmission_rpc.timing>`,
+a :py:class:`Metrics` registry can be shared by multiple clients.
+
+.. code-block:: python
+
+    from transmission_rpc import Client
+    from transmission_rpc.metrics import Metrics, MetricsServer
+
+    metrics = Metrics(labels={"daemon": "seedbox-1"})
+    client = Client(metrics=metrics)
+
+    # serve on http://127.0.0.1:9184/metrics
+    server = MetricsServer(metrics, port=9184)
+
+    # or render it in an existing http handler
+    text = metrics.render()
+
+Exported metrics, all labeled with json-rpc ``method`` except session id rotations:
+
+- ``transmission_rpc_request_duration_seconds``: histogram of total request time, including building result objects.
+- ``transmission_rpc_request_bytes_total``: size of request bodies sent.
+- ``transmission_rpc_response_bytes_total``: size of response bodies received.
+- ``transmission_rpc_errors_total``: failed requests, also labeled with exception class ``error``,
+  like ``TransmissionTimeoutError``, ``TransmissionConnectError`` or ``TransmissionAuthError``.
+- ``transmission_rpc_retries_total``: requests sent again because of outdated session id.
+- ``transmission_rpc_session_id_rotations_total``: times the daemon responded a new session id.
+"""
+
+from __future__ import annotations
+
+import bisect
+import http.server
+import math
+import threading
+import types
+from typing import Any, Iterable, Mapping
+
+from typing_extensions import Self
+
+from transmission_rpc.timing import RequestTiming
+
+#: default histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+class _MethodMetrics:
+    __slots__ = ("buckets", "count", "duration", "request_bytes", "response_bytes", "retries")
+
+    def __init__(self, size: int):
+        # not cumulative, last one is +Inf
+        self.buckets = [0] * (size + 1)
+        self.count = 0
+        self.duration = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+
+
+class Metrics:
+    """
+    Thread-safe registry of request metrics, pass it to :py:class:`~transmission_rpc.Client` as ``metrics``.
+
+    Parameters:
+        buckets: upper bounds of latency histogram buckets in seconds.
+        labels: constant labels added to all samples, to tell daemons apart.
+        namespace: prefix of metric names.
+    """
+
+    def __init__(
+        self,
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        labels: Mapping[str, str] | None = None,
+        namespace: str = "transmission_rpc",
+    ):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        if not self.buckets:
+            raise ValueError("buckets must not be empty")
+        self.labels = dict(labels or {})
+        self.namespace = namespace
+        self.__lock = threading.Lock()
+        self.__methods: dict[str, _MethodMetrics] = {}
+        self.__errors: dict[tuple[str, str], int] = {}
+        self.__session_id_rotations = 0
+
+    def observe(self, timing: RequestTiming) -> None:
+        """record a request, it's added as a timing hook of client"""
+        total = timing.total
+        index = bisect.bisect_left(self.buckets, total)
+        with self.__lock:
+            m = self.__methods.get(timing.method)
+            if m is None:
+                m = self.__methods[timing.method] = _MethodMetrics(len(self.buckets))
+            m.buckets[index] += 1
+            m.count += 1
+            m.duration += total
+            m.request_bytes += timing.request_bytes
+            m.response_bytes += timing.response_bytes
+            m.retries += timing.retries
+            self.__session_id_rotations += timing.session_id_rotations
+            if timing.error is not None:
+                key = (timing.method, type(timing.error).__name__)
+                self.__errors[key] = self.__errors.get(key, 0) + 1
+
+    def errors(self) -> dict[tuple[str, str], int]:
+        """number of failed requests by ``(method, exception class name)``"""
+        with self.__lock:
+            return dict(self.__errors)
+
+    @property
+    def session_id_rotations(self) -> int:
+        return self.__session_id_rotations
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__methods.clear()
+            self.__errors.clear()
+            self.__session_id_rotations = 0
+
+    def __labels(self, **labels: str) -> str:
+        items = {**self.labels, **labels}
+        if not items:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items.items()) + "}"
+
+    def render(self) -> str:
+        """metrics in Prometheus text exposition format"""
+        with self.__lock:
+            methods = {
+                name: (list(m.buckets), m.count, m.duration, m.request_bytes, m.response_bytes, m.retries)
+                for name, m in sorted(self.__methods.items())
+            }
+            errors = sorted(self.__errors.items())
+            rotations = self.__session_id_rotations
+
+        ns = self.namespace
+        lines: list[str] = []
+
+        def header(name: str, kind: str, doc: str) -> str:
+            lines.append(f"# HELP {ns}_{name} {doc}")
+            lines.append(f"# TYPE {ns}_{name} {kind}")
+            return f"{ns}_{name}"
+
+        name = header("request_duration_seconds", "histogram", "Time of json-rpc requests.")
+        for method, (buckets, count, duration, *_) in methods.items():
+            cumulative = 0
+            for bound, value in zip((*self.buckets, math.inf), buckets):
+                cumulative += value
+                lines.append(f"{name}_bucket{self.__labels(method=method, le=_format_value(bound))} {cumulative}")
+            lines.append(f"{name}_sum{self.__labels(method=method)} {_format_value(duration)}")
+            lines.append(f"{name}_count{self.__labels(method=method)} {count}")
+
+        for index, metric, doc in (
+            (3, "request_bytes_total", "Size of json-rpc request bodies sent."),
+            (4, "response_bytes_total", "Size of json-rpc response bodies received."),
+            (5, "retries_total", "Requests sent again because of outdated session id."),
+        ):
+            name = header(metric, "counter", doc)
+            for method, values in methods.items():
+                lines.append(f"{name}{self.__labels(method=method)} {values[index]}")
+
+        name = header("errors_total", "counter", "Failed json-rpc requests by exception class.")
+        for (method, error), count in errors:
+            lines.append(f"{name}{self.__labels(method=method, error=error)} {count}")
+
+        name = header("session_id_rotations_total", "counter", "Times the daemon responded a new session id.")
+        lines.append(f"{name}{self.__labels()} {rotations}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serve :py:meth:`Metrics.render` over http in a background thread, for Prometheus to scrape.
+
+    Any path is served, conventionally ``/metrics``.
+
+    Parameters:
+        metrics: metrics to serve.
+        host: address to listen on, only local by default.
+        port: tcp port, ``0`` picks a free port, see :py:attr:`address`.
+    """
+
+    def __init__(self, metrics: Metrics, host: str = "127.0.0.1", port: int = 0):
+        self.metrics = metrics
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("content-type", CONTENT_TYPE)
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        class Server(http.server.ThreadingHTTPServer):
+            daemon_threads = True
+
+        self.__server = Server((host, port), Handler)
+        self.address: tuple[str, int] = (host, self.__server.server_address[1])
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, name="transmission-rpc-metrics", daemon=True
+        )
+        self.__thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.address[0]}:{self.address[1]}/metrics"
+
+    def close(self) -> None:
+        """stop the server"""
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
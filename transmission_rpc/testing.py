@@ -0,0 +1,789 @@
+"""
+In-process fake transmission daemon, for offline tests and benchmarks.
+
+It implements all methods in :py:class:`~transmission_rpc.constants.RpcMethod` on synthetic state,
+and can be served over http or a unix socket with the same session id handshake and basic auth
+as transmission daemon, or used without any socket with :py:class:`~transmission_rpc.transport.InMemoryTransport`.
+
+.. code-block:: python
+
+    from transmission_rpc.testing import FakeDaemon
+
+    with FakeDaemon(torrents=10_000, files=4, seed=1).serve_http() as daemon:
+        client = daemon.client()
+        print(len(client.get_torrents(arguments=["id", "name"])))
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import http.server
+import json
+import os
+import random
+import secrets
+import socketserver
+import threading
+import time
+import types
+from typing import Any, Iterable
+
+from typing_extensions import Self
+
+from transmission_rpc.client import Client
+from transmission_rpc.constants import RpcMethod
+from transmission_rpc.metainfo import TorrentMetainfo, parse_magnet
+from transmission_rpc.transport import InMemoryTransport
+
+_STOPPED = 0
+_CHECKING = 2
+_DOWNLOADING = 4
+_SEEDING = 6
+
+_PIECE_SIZE = 1 << 20
+
+#: torrent-set arguments stored as-is in torrent fields
+_TORRENT_SET_FIELDS = frozenset(
+    {
+        "bandwidthPriority",
+        "downloadLimit",
+        "downloadLimited",
+        "group",
+        "honorsSessionLimits",
+        "labels",
+        "peer-limit",
+        "queuePosition",
+        "seedIdleLimit",
+        "seedIdleMode",
+        "seedRatioLimit",
+        "seedRatioMode",
+        "sequential_download",
+        "uploadLimit",
+        "uploadLimited",
+    }
+)
+
+
+def _session(rpc_version: int, version: str) -> dict[str, Any]:
+    return {
+        "alt-speed-down": 50,
+        "alt-speed-enabled": False,
+        "alt-speed-time-begin": 540,
+        "alt-speed-time-day": 127,
+        "alt-speed-time-enabled": False,
+        "alt-speed-time-end": 1020,
+        "alt-speed-up": 50,
+        "blocklist-enabled": False,
+        "blocklist-size": 0,
+        "blocklist-url": "http://www.example.com/blocklist",
+        "cache-size-mb": 4,
+        "config-dir": "/config",
+        "default-trackers": "",
+        "dht-enabled": True,
+        "download-dir": "/downloads/complete",
+        "download-dir-free-space": 1 << 40,
+        "download-queue-enabled": True,
+        "download-queue-size": 5,
+        "encryption": "preferred",
+        "idle-seeding-limit": 30,
+        "idle-seeding-limit-enabled": False,
+        "incomplete-dir": "/downloads/incomplete",
+        "incomplete-dir-enabled": False,
+        "lpd-enabled": False,
+        "peer-limit-global": 200,
+        "peer-limit-per-torrent": 50,
+        "peer-port": 51413,
+        "peer-port-random-on-start": False,
+        "pex-enabled": True,
+        "port-forwarding-enabled": False,
+        "queue-stalled-enabled": True,
+        "queue-stalled-minutes": 30,
+        "rename-partial-files": True,
+        "rpc-version": rpc_version,
+        "rpc-version-minimum": 1,
+        "rpc-version-semver": "5.3.0",
+        "script-torrent-added-enabled": False,
+        "script-torrent-added-filename": "",
+        "script-torrent-done-enabled": False,
+        "script-torrent-done-filename": "",
+        "script-torrent-done-seeding-enabled": False,
+        "script-torrent-done-seeding-filename": "",
+        "seed-queue-enabled": False,
+        "seed-queue-size": 10,
+        "seedRatioLimit": 2.0,
+        "seedRatioLimited": False,
+        "session-id": "",
+        "speed-limit-down": 100,
+        "speed-limit-down-enabled": False,
+        "speed-limit-up": 100,
+        "speed-limit-up-enabled": False,
+        "start-added-torrents": True,
+        "trash-original-torrent-files": False,
+        "units": {
+            "memory-bytes": 1024,
+            "memory-units": ["KiB", "MiB", "GiB", "TiB"],
+            "size-bytes": 1000,
+            "size-units": ["kB", "MB", "GB", "TB"],
+            "speed-bytes": 1000,
+            "speed-units": ["kB/s", "MB/s", "GB/s", "TB/s"],
+        },
+        "utp-enabled": True,
+        "version": version,
+    }
+
+
+def _stats(session_count: int) -> dict[str, int]:
+    return {
+        "downloadedBytes": 0,
+        "filesAdded": 0,
+        "secondsActive": 0,
+        "sessionCount": session_count,
+        "uploadedBytes": 0,
+    }
+
+
+class FakeDaemon:
+    """
+    Fake transmission daemon holding synthetic torrents.
+
+    Torrents are generated from ``seed``, same parameters always generate same torrents.
+
+    Parameters:
+        torrents: number of generated torrents.
+        files: number of files of each generated torrent.
+        peers: number of peers of each generated torrent.
+        trackers: number of trackers of each generated torrent.
+        seed: random seed of generated state, latency and errors.
+        username: require basic auth if set.
+        password: password for basic auth.
+        latency: seconds to wait before responding each request.
+        jitter: max random seconds added to ``latency``.
+        error_rate: probability of responding a failed result.
+        error_methods: only inject errors to these methods, default to all methods.
+        rpc_version: ``rpc-version`` in session.
+        version: transmission ``version`` in session.
+    """
+
+    def __init__(
+        self,
+        *,
+        torrents: int = 0,
+        files: int = 1,
+        peers: int = 0,
+        trackers: int = 1,
+        seed: int = 0,
+        username: str | None = None,
+        password: str | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_methods: Iterable[str] | None = None,
+        rpc_version: int = 17,
+        version: str = "4.0.6 (38c164933e)",
+    ):
+        self.files = files
+        self.peers = peers
+        self.trackers = trackers
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_methods = None if error_methods is None else frozenset(error_methods)
+
+        self.session_id = secrets.token_hex(24)
+        self.session: dict[str, Any] = _session(rpc_version, version)
+        self.session["session-id"] = self.session_id
+        self.groups: dict[str, dict[str, Any]] = {}
+        self.torrents: dict[int, dict[str, Any]] = {}
+        self.removed: list[int] = []
+        self.requests = 0
+
+        self.__lock = threading.Lock()
+        self.__rng = random.Random(seed)  # noqa: S311
+        self.__next_id = 1
+        self.__now = 1_700_000_000
+        for _ in range(torrents):
+            self.__add(self.__generate())
+
+        self.__servers: list[socketserver.BaseServer] = []
+        self.address: tuple[str, int] | str | None = None
+
+    # state
+
+    def __generate(self) -> dict[str, Any]:
+        rng = self.__rng
+        info_hash = f"{rng.getrandbits(160):040x}"
+        name = f"torrent-{info_hash[:8]}"
+        files = [
+            {"name": f"{name}/file-{i}.bin" if self.files > 1 else name, "length": rng.randint(1 << 10, 1 << 30)}
+            for i in range(self.files)
+        ]
+        done = 1.0 if rng.random() < 0.5 else round(rng.random(), 4)
+        torrent = self.__new_torrent(info_hash, name, files, done)
+        torrent["status"] = _SEEDING if done == 1.0 else rng.choice([_STOPPED, _DOWNLOADING])
+        torrent["rateDownload"] = 0 if done == 1.0 else rng.randint(0, 1 << 22)
+        torrent["rateUpload"] = rng.randint(0, 1 << 20)
+        torrent["uploadedEver"] = rng.randint(0, 1 << 34)
+        torrent["labels"] = rng.sample(["linux", "iso", "tv", "movie", "music"], rng.randint(0, 2))
+        torrent["peers"] = [self.__peer(i) for i in range(self.peers)]
+        torrent["peersConnected"] = self.peers
+        return torrent
+
+    def __peer(self, index: int) -> dict[str, Any]:
+        rng = self.__rng
+        return {
+            "address": f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+            "clientIsChoked": rng.random() < 0.5,
+            "clientIsInterested": rng.random() < 0.5,
+            "clientName": "Transmission 4.0.6",
+            "flagStr": "TDEH",
+            "isDownloadingFrom": rng.random() < 0.5,
+            "isEncrypted": True,
+            "isIncoming": rng.random() < 0.5,
+            "isUTP": rng.random() < 0.5,
+            "isUploadingTo": rng.random() < 0.5,
+            "peerIsChoked": rng.random() < 0.5,
+            "peerIsInterested": rng.random() < 0.5,
+            "port": rng.randint(1024, 65535),
+            "progress": rng.random(),
+            "rateToClient": rng.randint(0, 1 << 20),
+            "rateToPeer": rng.randint(0, 1 << 20),
+        }
+
+    def __new_torrent(self, info_hash: str, name: str, files: list[dict[str, Any]], done: float) -> dict[str, Any]:
+        now = self.__now
+        total = sum(f["length"] for f in files)
+        piece_count = max(1, -(-total // _PIECE_SIZE))
+        have_pieces = int(piece_count * done)
+        bitfield = bytearray((piece_count + 7) // 8)
+        bitfield[: have_pieces // 8] = b"\xff" * (have_pieces // 8)
+        announce = [f"https://tracker{i}.example.com/announce" for i in range(self.trackers)]
+
+        begin = 0
+        file_list = []
+        for f in files:
+            end = (begin + f["length"]) // _PIECE_SIZE
+            file_list.append(
+                {
+                    "bytesCompleted": int(f["length"] * done),
+                    "length": f["length"],
+                    "name": f["name"],
+                    "beginPiece": begin // _PIECE_SIZE,
+                    "endPiece": end,
+                }
+            )
+            begin += f["length"]
+
+        return {
+            "activityDate": now,
+            "addedDate": now,
+            "bandwidthPriority": 0,
+            "comment": "",
+            "corruptEver": 0,
+            "creator": "transmission-rpc",
+            "dateCreated": now,
+            "desiredAvailable": 0,
+            "doneDate": now if done == 1.0 else 0,
+            "downloadDir": self.session["download-dir"],
+            "downloadedEver": int(total * done),
+            "downloadLimit": 100,
+            "downloadLimited": False,
+            "editDate": 0,
+            "error": 0,
+            "errorString": "",
+            "eta": -1,
+            "etaIdle": -1,
+            "file-count": len(files),
+            "files": file_list,
+            "fileStats": [{"bytesCompleted": f["bytesCompleted"], "priority": 0, "wanted": True} for f in file_list],
+            "group": "",
+            "hashString": info_hash,
+            "haveUnchecked": 0,
+            "haveValid": int(total * done),
+            "honorsSessionLimits": True,
+            "id": 0,
+            "isFinished": False,
+            "isPrivate": False,
+            "isStalled": False,
+            "labels": [],
+            "leftUntilDone": total - int(total * done),
+            "magnetLink": f"magnet:?xt=urn:btih:{info_hash}&dn={name}",
+            "manualAnnounceTime": -1,
+            "maxConnectedPeers": 50,
+            "metadataPercentComplete": 1.0,
+            "name": name,
+            "peer-limit": 50,
+            "peers": [],
+            "peersConnected": 0,
+            "peersFrom": {
+                "fromCache": 0,
+                "fromDht": 0,
+                "fromIncoming": 0,
+                "fromLpd": 0,
+                "fromLtep": 0,
+                "fromPex": 0,
+                "fromTracker": 0,
+            },
+            "peersGettingFromUs": 0,
+            "peersSendingToUs": 0,
+            "percentComplete": done,
+            "percentDone": done,
+            "pieceCount": piece_count,
+            "pieceSize": _PIECE_SIZE,
+            "pieces": base64.b64encode(bitfield).decode(),
+            "primary-mime-type": "application/octet-stream",
+            "priorities": [0] * len(files),
+            "queuePosition": 0,
+            "rateDownload": 0,
+            "rateUpload": 0,
+            "recheckProgress": 0.0,
+            "secondsDownloading": 0,
+            "secondsSeeding": 0,
+            "seedIdleLimit": 30,
+            "seedIdleMode": 0,
+            "seedRatioLimit": 2.0,
+            "seedRatioMode": 0,
+            "sequential_download": False,
+            "sizeWhenDone": total,
+            "startDate": now,
+            "status": _STOPPED,
+            "torrentFile": f"{self.session['config-dir']}/torrents/{info_hash}.torrent",
+            "totalSize": total,
+            "trackerList": "\n\n".join(announce),
+            "trackerStats": [self.__tracker_stats(i, url) for i, url in enumerate(announce)],
+            "trackers": [
+                {
+                    "announce": url,
+                    "id": i,
+                    "scrape": url.replace("announce", "scrape"),
+                    "sitename": "example",
+                    "tier": i,
+                }
+                for i, url in enumerate(announce)
+            ],
+            "uploadLimit": 100,
+            "uploadLimited": False,
+            "uploadRatio": 0.0,
+            "wanted": [1] * len(files),
+            "webseeds": [],
+            "webseedsSendingToUs": 0,
+        }
+
+    def __tracker_stats(self, index: int, url: str) -> dict[str, Any]:
+        return {
+            "announce": url,
+            "announceState": 1,
+            "downloadCount": -1,
+            "hasAnnounced": True,
+            "hasScraped": True,
+            "host": url.rsplit("/", 1)[0],
+            "id": index,
+            "isBackup": False,
+            "lastAnnouncePeerCount": 0,
+            "lastAnnounceResult": "Success",
+            "lastAnnounceStartTime": self.__now,
+            "lastAnnounceSucceeded": True,
+            "lastAnnounceTime": self.__now,
+            "lastAnnounceTimedOut": False,
+            "lastScrapeResult": "",
+            "lastScrapeStartTime": self.__now,
+            "lastScrapeSucceeded": True,
+            "lastScrapeTime": self.__now,
+            "lastScrapeTimedOut": False,
+            "leecherCount": 0,
+            "nextAnnounceTime": self.__now + 1800,
+            "nextScrapeTime": self.__now + 1800,
+            "scrape": url.replace("announce", "scrape"),
+            "scrapeState": 1,
+            "seederCount": 0,
+            "sitename": "example",
+            "tier": index,
+        }
+
+    def __add(self, torrent: dict[str, Any]) -> dict[str, Any]:
+        torrent["id"] = self.__next_id
+        torrent["queuePosition"] = len(self.torrents)
+        self.__next_id += 1
+        self.torrents[torrent["id"]] = torrent
+        return torrent
+
+    def __select(self, ids: Any) -> list[dict[str, Any]]:
+        if ids is None:
+            return list(self.torrents.values())
+        if ids == "recently-active":
+            return [t for t in self.torrents.values() if t["status"] != _STOPPED]
+        if not isinstance(ids, list):
+            ids = [ids]
+        by_hash: dict[str, dict[str, Any]] | None = None
+        selected = []
+        for torrent_id in ids:
+            if isinstance(torrent_id, int):
+                torrent = self.torrents.get(torrent_id)
+            else:
+                if by_hash is None:
+                    by_hash = {t["hashString"]: t for t in self.torrents.values()}
+                torrent = by_hash.get(torrent_id)
+            if torrent is not None:
+                selected.append(torrent)
+        return selected
+
+    # rpc
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """handle a decoded json-rpc request, returns json-rpc response"""
+        method = request.get("method")
+        arguments = request.get("arguments") or {}
+        response: dict[str, Any] = {"result": "success", "arguments": {}}
+        if "tag" in request:
+            response["tag"] = request["tag"]
+
+        with self.__lock:
+            self.requests += 1
+            delay = self.latency + (self.__rng.random() * self.jitter if self.jitter else 0.0)
+            inject_error = (
+                self.error_rate > 0
+                and (self.error_methods is None or method in self.error_methods)
+                and self.__rng.random() < self.error_rate
+            )
+            if not inject_error:
+                handler = getattr(self, "_rpc_" + str(method).replace("-", "_"), None)
+                if handler is None:
+                    response["result"] = "method name not recognized"
+                else:
+                    try:
+                        response["arguments"] = handler(arguments)
+                    except (KeyError, ValueError, TypeError) as e:
+                        response["result"] = f"invalid arguments: {e}"
+
+        if delay > 0:
+            time.sleep(delay)
+        if inject_error:
+            response["result"] = "injected error"
+        return response
+
+    def _rpc_session_get(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        fields = arguments.get("fields")
+        if fields is None:
+            return dict(self.session)
+        return {key: self.session[key] for key in fields if key in self.session}
+
+    def _rpc_session_set(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        for key, value in arguments.items():
+            self.session[key] = value
+        return {}
+
+    def _rpc_session_stats(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        torrents = self.torrents.values()
+        return {
+            "activeTorrentCount": sum(t["status"] != _STOPPED for t in torrents),
+            "downloadSpeed": sum(t["rateDownload"] for t in torrents),
+            "pausedTorrentCount": sum(t["status"] == _STOPPED for t in torrents),
+            "torrentCount": len(self.torrents),
+            "uploadSpeed": sum(t["rateUpload"] for t in torrents),
+            "cumulative-stats": _stats(1),
+            "current-stats": _stats(1),
+        }
+
+    def _rpc_session_close(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return {}
+
+    def _rpc_torrent_get(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        fields: list[str] = arguments["fields"]
+        torrents = self.__select(arguments.get("ids"))
+        if arguments.get("format") == "table":
+            rows: list[Any] = [fields]
+            rows.extend([t.get(key) for key in fields] for t in torrents)
+            result: dict[str, Any] = {"torrents": rows}
+        else:
+            result = {"torrents": [{key: t[key] for key in fields if key in t} for t in torrents]}
+        if arguments.get("ids") == "recently-active":
+            result["removed"] = self.removed
+            self.removed = []
+        return result
+
+    def _rpc_torrent_add(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        if "metainfo" in arguments:
+            meta = TorrentMetainfo(base64.b64decode(arguments["metainfo"]))
+            if meta.info_hash is None:
+                raise ValueError("v2 only torrent is not supported")
+            info_hash, name = meta.info_hash, meta.name
+            files = [{"name": f.name, "length": f.size} for f in meta.files]
+        else:
+            filename: str = arguments["filename"]
+            if filename.startswith("magnet:"):
+                magnet = parse_magnet(filename)
+                if magnet.info_hash is None:
+                    raise ValueError("v2 only magnet link is not supported")
+                info_hash, name = magnet.info_hash, magnet.name or magnet.info_hash
+            else:
+                info_hash = hashlib.sha1(filename.encode()).hexdigest()  # noqa: S324
+                name = filename.rsplit("/", 1)[-1]
+            files = [{"name": name, "length": 1 << 20}]
+
+        for torrent in self.torrents.values():
+            if torrent["hashString"] == info_hash:
+                return {"torrent-duplicate": {"id": torrent["id"], "name": torrent["name"], "hashString": info_hash}}
+
+        torrent = self.__new_torrent(info_hash, name, files, 0.0)
+        if "download-dir" in arguments:
+            torrent["downloadDir"] = arguments["download-dir"]
+        if "labels" in arguments:
+            torrent["labels"] = arguments["labels"]
+        for key in ("bandwidthPriority", "peer-limit", "sequential_download"):
+            if key in arguments:
+                torrent[key] = arguments[key]
+        self.__set_files(torrent, arguments)
+        paused = arguments.get("paused", not self.session["start-added-torrents"])
+        torrent["status"] = _STOPPED if paused else _DOWNLOADING
+        self.__add(torrent)
+        return {"torrent-added": {"id": torrent["id"], "name": name, "hashString": info_hash}}
+
+    def __set_files(self, torrent: dict[str, Any], arguments: dict[str, Any]) -> None:
+        files = range(len(torrent["files"]))
+        for key, wanted in (("files-wanted", 1), ("files-unwanted", 0)):
+            for index in arguments.get(key) or (files if key in arguments else ()):
+                torrent["wanted"][index] = wanted
+                torrent["fileStats"][index]["wanted"] = bool(wanted)
+        for key, priority in (("priority-low", -1), ("priority-normal", 0), ("priority-high", 1)):
+            for index in arguments.get(key) or (files if key in arguments else ()):
+                torrent["priorities"][index] = priority
+                torrent["fileStats"][index]["priority"] = priority
+
+    def _rpc_torrent_set(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        for torrent in self.__select(arguments.get("ids")):
+            for key, value in arguments.items():
+                if key in _TORRENT_SET_FIELDS:
+                    torrent[key] = value
+            if "trackerList" in arguments:
+                torrent["trackerList"] = arguments["trackerList"]
+            if "location" in arguments:
+                torrent["downloadDir"] = arguments["location"]
+            self.__set_files(torrent, arguments)
+            torrent["editDate"] = self.__now
+        return {}
+
+    def _rpc_torrent_remove(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        for torrent in self.__select(arguments.get("ids")):
+            del self.torrents[torrent["id"]]
+            self.removed.append(torrent["id"])
+        for position, torrent in enumerate(sorted(self.torrents.values(), key=lambda t: t["queuePosition"])):
+            torrent["queuePosition"] = position
+        return {}
+
+    def __set_status(self, arguments: dict[str, Any], running: bool) -> dict[str, Any]:
+        for torrent in self.__select(arguments.get("ids")):
+            if not running:
+                torrent["status"] = _STOPPED
+            else:
+                torrent["status"] = _SEEDING if torrent["percentDone"] == 1.0 else _DOWNLOADING
+                torrent["startDate"] = self.__now
+        return {}
+
+    def _rpc_torrent_start(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return self.__set_status(arguments, True)
+
+    def _rpc_torrent_start_now(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return self.__set_status(arguments, True)
+
+    def _rpc_torrent_stop(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return self.__set_status(arguments, False)
+
+    def _rpc_torrent_verify(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        # verification finishes immediately
+        for torrent in self.__select(arguments.get("ids")):
+            torrent["recheckProgress"] = 1.0
+        return {}
+
+    def _rpc_torrent_reannounce(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        for torrent in self.__select(arguments.get("ids")):
+            torrent["manualAnnounceTime"] = self.__now + 60
+        return {}
+
+    def _rpc_torrent_set_location(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        for torrent in self.__select(arguments.get("ids")):
+            torrent["downloadDir"] = arguments["location"]
+        return {}
+
+    def _rpc_torrent_rename_path(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        (torrent,) = self.__select(arguments.get("ids"))
+        path: str = arguments["path"]
+        name: str = arguments["name"]
+        new_path = "/".join([*path.split("/")[:-1], name])
+        for f in torrent["files"]:
+            if f["name"] == path or f["name"].startswith(path + "/"):
+                f["name"] = new_path + f["name"][len(path) :]
+        if torrent["name"] == path:
+            torrent["name"] = name
+        return {"path": path, "name": name, "id": torrent["id"]}
+
+    def __move_queue(self, arguments: dict[str, Any], method: RpcMethod) -> dict[str, Any]:
+        queue = sorted(self.torrents.values(), key=lambda t: t["queuePosition"])
+        selected = {t["id"] for t in self.__select(arguments.get("ids"))}
+        if method == RpcMethod.QueueMoveTop:
+            queue = [t for t in queue if t["id"] in selected] + [t for t in queue if t["id"] not in selected]
+        elif method == RpcMethod.QueueMoveBottom:
+            queue = [t for t in queue if t["id"] not in selected] + [t for t in queue if t["id"] in selected]
+        elif method == RpcMethod.QueueMoveUp:
+            for i in range(1, len(queue)):
+                if queue[i]["id"] in selected and queue[i - 1]["id"] not in selected:
+                    queue[i - 1], queue[i] = queue[i], queue[i - 1]
+        else:
+            for i in range(len(queue) - 2, -1, -1):
+                if queue[i]["id"] in selected and queue[i + 1]["id"] not in selected:
+                    queue[i + 1], queue[i] = queue[i], queue[i + 1]
+        for position, torrent in enumerate(queue):
+            torrent["queuePosition"] = position
+        return {}
+
+    def _rpc_queue_move_top(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return self.__move_queue(arguments, RpcMethod.QueueMoveTop)
+
+    def _rpc_queue_move_bottom(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return self.__move_queue(arguments, RpcMethod.QueueMoveBottom)
+
+    def _rpc_queue_move_up(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return self.__move_queue(arguments, RpcMethod.QueueMoveUp)
+
+    def _rpc_queue_move_down(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return self.__move_queue(arguments, RpcMethod.QueueMoveDown)
+
+    def _rpc_group_set(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        group = self.groups.setdefault(
+            arguments["name"],
+            {
+                "name": arguments["name"],
+                "honorsSessionLimits": True,
+                "speed-limit-down": 0,
+                "speed-limit-down-enabled": False,
+                "speed-limit-up": 0,
+                "speed-limit-up-enabled": False,
+            },
+        )
+        group.update(arguments)
+        return {}
+
+    def _rpc_group_get(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        names = arguments.get("group")
+        if names is None:
+            return {"group": list(self.groups.values())}
+        if isinstance(names, str):
+            names = [names]
+        return {"group": [self.groups[name] for name in names if name in self.groups]}
+
+    def _rpc_free_space(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return {"path": arguments["path"], "size-bytes": 1 << 40, "total_size": 1 << 41}
+
+    def _rpc_port_test(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return {"port-is-open": True, "ip_protocol": arguments.get("ip_protocol", "ipv4")}
+
+    def _rpc_blocklist_update(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        return {"blocklist-size": self.session["blocklist-size"]}
+
+    # serving
+
+    def transport(self) -> InMemoryTransport:
+        """transport calling :py:meth:`handle` directly, without session id handshake or auth"""
+        return InMemoryTransport(self.handle)
+
+    def serve_http(self, host: str = "127.0.0.1", port: int = 0) -> Self:
+        """serve on tcp in a background thread, port 0 picks a free port, see :py:attr:`address`"""
+
+        class Server(http.server.ThreadingHTTPServer):
+            daemon_threads = True
+
+        server = Server((host, port), self.__handler_class(tcp=True))
+        self.address = (host, server.server_address[1])
+        return self.__start(server)
+
+    def serve_unix(self, path: str) -> Self:
+        """serve on unix socket ``path`` in a background thread"""
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        if os.path.exists(path):
+            os.unlink(path)
+        server = Server(path, self.__handler_class())
+        self.address = path
+        return self.__start(server)
+
+    def client(self, **kwargs: Any) -> Client:
+        """client connected to the last started server, or using :py:meth:`transport` if no server is started"""
+        if self.address is None:
+            kwargs.setdefault("transport", self.transport())
+        elif isinstance(self.address, str):
+            kwargs.update(protocol="http+unix", host=self.address)
+        else:
+            kwargs.update(host=self.address[0], port=self.address[1])
+        if self.username is not None:
+            kwargs.setdefault("username", self.username)
+            kwargs.setdefault("password", self.password)
+        return Client(**kwargs)
+
+    def close(self) -> None:
+        """stop all servers"""
+        for server in self.__servers:
+            server.shutdown()
+            server.server_close()
+        self.__servers = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __start(self, server: socketserver.BaseServer) -> Self:
+        threading.Thread(target=server.serve_forever, name="fake-transmission-daemon", daemon=True).start()
+        self.__servers.append(server)
+        return self
+
+    def __handler_class(self, *, tcp: bool = False) -> type[http.server.BaseHTTPRequestHandler]:
+        daemon = self
+        authorization = None
+        if self.username is not None:
+            token = base64.b64encode(f"{self.username}:{self.password or ''}".encode()).decode()
+            authorization = f"Basic {token}"
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, avoid delayed ack stall on keep-alive connection
+            disable_nagle_algorithm = tcp
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("content-length", 0)))
+                if authorization is not None and self.headers.get("authorization") != authorization:
+                    self.__respond(401, b"<h1>401: Unauthorized</h1>")
+                    return
+                if self.headers.get("x-transmission-session-id") != daemon.session_id:
+                    self.__respond(409, b"<h1>409: Conflict</h1>")
+                    return
+                try:
+                    request = json.loads(body)
+                except ValueError:
+                    self.__respond(400, b"<h1>400: Bad Request</h1>")
+                    return
+                self.__respond(200, json.dumps(daemon.handle(request)).encode())
+
+            def __respond(self, status: int, data: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json" if status == 200 else "text/html")
+                self.send_header("X-Transmission-Session-Id", daemon.session_id)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def address_string(self) -> str:
+                return str(self.client_address or "unix")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
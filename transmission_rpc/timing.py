@@ -0,0 +1,239 @@
+"""
+Per-request timing breakdown of :py:class:`transmission_rpc.Client`.
+
+Timing is disabled by default. It's enabled when the client is created with ``timing_history``,
+or when a hook is added with :py:meth:`Client.add_timing_hook <transmission_rpc.Client.add_timing_hook>`.
+
+.. code-block:: python
+
+    def log_slow(timing: RequestTiming) -> None:
+        if timing.total > 1:
+            logging.warning("slow %s: %r", timing.method, timing)
+
+
+    client = Client(timing_history=100)
+    client.add_timing_hook(log_slow)
+    client.get_torrents()
+    print(client.recent_timings[-1])
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import enum
+import logging
+import threading
+import time
+from typing import Any, Callable, ContextManager, Iterator, Mapping, Tuple
+
+from transmission_rpc.tracing import RequestEvent, Tracer
+
+
+class RequestTiming:
+    """
+    Timing of a single json-rpc request, all durations are in seconds.
+
+    A request sent again after a 409 response to update session id is counted in the same timing.
+    """
+
+    __slots__ = (
+        "_end",
+        "build",
+        "connection_reused",
+        "decode",
+        "error",
+        "method",
+        "network",
+        "request_bytes",
+        "response_bytes",
+        "retries",
+        "serialize",
+        "session_id_rotations",
+        "started_at",
+    )
+
+    method: str
+    """json-rpc method"""
+
+    started_at: float
+    """unix timestamp of the start of the request"""
+
+    serialize: float
+    """encoding request as json"""
+
+    network: float
+    """sending request and receiving response, including daemon processing time"""
+
+    decode: float
+    """decoding json response and checking its result"""
+
+    build: float
+    """building result objects like :py:class:`~transmission_rpc.Torrent` from decoded response"""
+
+    request_bytes: int
+    """size of request bodies sent"""
+
+    response_bytes: int
+    """size of response bodies received"""
+
+    retries: int
+    """number of requests sent again because of 409 responses"""
+
+    session_id_rotations: int
+    """number of times the daemon responded a new session id, the first session id of the client isn't counted"""
+
+    connection_reused: bool | None
+    """if the last request is sent on a reused connection, ``None`` if the transport doesn't tell"""
+
+    error: Exception | None
+    """error raised by the request"""
+
+    def __init__(self, method: str):
+        # plain string instead of RpcMethod, so it's formatted as method name
+        self.method = method.value if isinstance(method, enum.Enum) else method
+        self.started_at = time.time()
+        self.serialize = 0.0
+        self.network = 0.0
+        self.decode = 0.0
+        self.build = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+        self.session_id_rotations = 0
+        self.connection_reused = None
+        self.error = None
+        self._end = 0.0
+
+    @property
+    def total(self) -> float:
+        """sum of all phases"""
+        return self.serialize + self.network + self.decode + self.build
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestTiming {self.method} total={self.total * 1e3:.3f}ms serialize={self.serialize * 1e3:.3f}ms"
+            f" network={self.network * 1e3:.3f}ms decode={self.decode * 1e3:.3f}ms build={self.build * 1e3:.3f}ms"
+            f" request_bytes={self.request_bytes} response_bytes={self.response_bytes} retries={self.retries}"
+            f" session_id_rotations={self.session_id_rotations}"
+            f" connection_reused={self.connection_reused} error={self.error!r}>"
+        )
+
+
+TimingHook = Callable[[RequestTiming], None]
+
+_DISABLED: ContextManager[None] = contextlib.nullcontext()
+
+_Trace = Tuple[Tracer, RequestEvent]
+
+
+class _Timings:
+    """timings of a client, the timing of current request is kept per thread"""
+
+    def __init__(self, history: int, logger: logging.Logger):
+        if history < 0:
+            raise ValueError("timing_history must not be negative")
+        self.logger = logger
+        self.hooks: list[TimingHook] = []
+        self.history: collections.deque[RequestTiming] | None = collections.deque(maxlen=history) if history else None
+        self.tracer: Tracer | None = None
+        self.enabled = self.history is not None
+        self.__local = threading.local()
+
+    def __update(self) -> None:
+        self.enabled = bool(self.hooks) or self.history is not None or self.tracer is not None
+
+    def add_hook(self, hook: TimingHook) -> None:
+        # replaced instead of modified, so it can be iterated without lock
+        self.hooks = [*self.hooks, hook]
+        self.__update()
+
+    def remove_hook(self, hook: TimingHook) -> None:
+        hooks = list(self.hooks)
+        hooks.remove(hook)
+        self.hooks = hooks
+        self.__update()
+
+    def set_tracer(self, tracer: Tracer | None) -> None:
+        self.tracer = tracer
+        self.__update()
+
+    def current(self) -> RequestTiming | None:
+        if not self.enabled:
+            return None
+        return getattr(self.__local, "current", None)
+
+    def request(self, method: str, arguments: Mapping[str, Any]) -> ContextManager[RequestTiming | None]:
+        """time a request, yields ``None`` when disabled"""
+        if not self.enabled:
+            return _DISABLED
+        return self.__request(method, arguments)
+
+    @contextlib.contextmanager
+    def __request(self, method: str, arguments: Mapping[str, Any]) -> Iterator[RequestTiming]:
+        local = self.__local
+        timing = RequestTiming(method)
+        # tracer is kept with the request, in case it's replaced before the request finishes
+        trace: _Trace | None = None
+        if self.tracer is not None:
+            trace = (self.tracer, RequestEvent(timing, arguments))
+            self.__call(trace[0].before_request, trace[1])
+        local.current = timing
+        local.trace = trace
+        try:
+            yield timing
+        except Exception as e:
+            timing.error = e
+            raise
+        finally:
+            local.current = None
+            local.trace = None
+            timing._end = time.perf_counter()  # noqa: SLF001
+            pending: list[tuple[RequestTiming, _Trace | None]] | None = getattr(local, "pending", None)
+            if pending is None:
+                self.emit(timing, trace)
+            else:
+                pending.append((timing, trace))
+
+    def retry(self) -> None:
+        """current request is sent again after a 409 response"""
+        trace: _Trace | None = getattr(self.__local, "trace", None)
+        if trace is not None:
+            self.__call(trace[0].on_retry, trace[1])
+
+    def building(self) -> bool:
+        return getattr(self.__local, "pending", None) is not None
+
+    @contextlib.contextmanager
+    def build(self) -> Iterator[None]:
+        """requests sent in this context are emitted at exit, the time after last request is its build time"""
+        local = self.__local
+        pending: list[tuple[RequestTiming, _Trace | None]] = []
+        local.pending = pending
+        try:
+            yield
+        finally:
+            local.pending = None
+            if pending:
+                last = pending[-1][0]
+                last.build = time.perf_counter() - last._end  # noqa: SLF001
+            for timing, trace in pending:
+                self.emit(timing, trace)
+
+    def emit(self, timing: RequestTiming, trace: _Trace | None = None) -> None:
+        if self.history is not None:
+            self.history.append(timing)
+        for hook in self.hooks:
+            self.__call(hook, timing)
+        if trace is not None:
+            tracer, event = trace
+            if timing.error is None:
+                self.__call(tracer.after_response, event)
+            else:
+                self.__call(tracer.on_error, event, timing.error)
+
+    def __call(self, hook: Callable[..., None], *args: Any) -> None:
+        try:
+            hook(*args)
+        except Exception:
+            self.logger.exception("hook %r failed", hook)
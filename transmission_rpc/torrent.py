@@ -4,10 +4,9 @@ import base64
 import enum
 from datetime import datetime, timedelta, timezone
 from functools import cached_property
-from typing import Any
-
-from typing_extensions import deprecated
+from typing import Any, ClassVar
 
+from transmission_rpc._deprecated import deprecated
 from transmission_rpc.constants import IdleMode, Priority, RatioLimitMode
 from transmission_rpc.types import BitMap, Container, File
 from transmission_rpc.utils import format_timedelta
@@ -364,6 +363,33 @@ class Torrent(Container):
 
         super().__init__(fields=fields)
 
+    #: cached properties and the raw fields they are computed from
+    _cached_property_fields: ClassVar[dict[str, tuple[str, ...]]] = {"pieces": ("pieces",)}
+
+    def update(self, fields: dict[str, Any]) -> set[str]:
+        """
+        Merge newer raw fields of the same torrent into this object in-place.
+
+        Cached properties computed from changed fields are invalidated,
+        other cached results are kept.
+
+        Returns:
+            raw rpc field names whose value changed.
+        """
+        if fields.get("id", self.id) != self.id:
+            raise ValueError(f"can't update torrent {self.id} with fields of torrent {fields['id']}")
+
+        current = self.fields
+        changed = {key for key, value in fields.items() if key not in current or current[key] != value}
+        for key in changed:
+            current[key] = fields[key]
+
+        for name, sources in self._cached_property_fields.items():
+            if not changed.isdisjoint(sources):
+                self.__dict__.pop(name, None)
+
+        return changed
+
     @property
     def id(self) -> int:
         return self.fields["id"]
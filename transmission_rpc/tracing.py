@@ -0,0 +1,133 @@
+"""
+Lifecycle hooks of json-rpc requests, to open and close spans of a distributed tracing system.
+
+Subclass :py:class:`Tracer` and pass it to :py:class:`~transmission_rpc.Client` as ``tracer``,
+or use :py:class:`OpenTelemetryTracer`, which requires ``opentelemetry-api``
+(``pip install transmission-rpc[opentelemetry]``).
+
+.. code-block:: python
+
+    from transmission_rpc import Client
+    from transmission_rpc.tracing import OpenTelemetryTracer
+
+    client = Client(tracer=OpenTelemetryTracer())
+
+For each request, :py:meth:`Tracer.before_request` is called before it's sent,
+then :py:meth:`Tracer.on_retry` for each 409 response asking to send it again with a new session id,
+and at last one of :py:meth:`Tracer.after_response` or :py:meth:`Tracer.on_error`.
+Hooks are called in the thread sending the request, exceptions raised by hooks are logged and ignored.
+
+When no tracer is set, requests don't call any hook or build any event.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Mapping
+
+if TYPE_CHECKING:
+    from transmission_rpc.timing import RequestTiming
+
+
+class RequestEvent:
+    """A json-rpc request passed to :py:class:`Tracer` hooks."""
+
+    __slots__ = ("arguments", "ids", "method", "span", "timing")
+
+    method: str
+    """json-rpc method"""
+
+    arguments: list[str]
+    """
+    names of request arguments, without ``ids``.
+    Values are not included, they may be large like torrent content, or private like download paths.
+    """
+
+    ids: int | None
+    """number of torrent ids in request, ``None`` if request is not limited to a list of torrents"""
+
+    timing: RequestTiming
+    """timing of request, complete when :py:meth:`Tracer.after_response` or :py:meth:`Tracer.on_error` is called"""
+
+    span: Any
+    """not used by client, a tracer may keep its span here from :py:meth:`Tracer.before_request`"""
+
+    def __init__(self, timing: RequestTiming, arguments: Mapping[str, Any]):
+        self.method = timing.method
+        self.timing = timing
+        ids = arguments.get("ids")
+        self.ids = len(ids) if isinstance(ids, list) else None
+        self.arguments = sorted(key for key in arguments if key != "ids")
+        self.span = None
+
+    def __repr__(self) -> str:
+        return f"<RequestEvent {self.method} arguments={self.arguments!r} ids={self.ids!r}>"
+
+
+class Tracer:
+    """Base class of tracers, all hooks do nothing by default."""
+
+    def before_request(self, event: RequestEvent) -> None:
+        """called before request is encoded and sent"""
+
+    def on_retry(self, event: RequestEvent) -> None:
+        """called when daemon responds 409, request is sent again with new session id"""
+
+    def after_response(self, event: RequestEvent) -> None:
+        """called after response is decoded, and result objects are built"""
+
+    def on_error(self, event: RequestEvent, error: Exception) -> None:
+        """called when request fails, instead of :py:meth:`after_response`"""
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Create an OpenTelemetry client span for each request, child of the current span.
+
+    Parameters:
+        tracer_provider: use global tracer provider if not set.
+    """
+
+    def __init__(self, tracer_provider: Any = None):
+        # optional dependency
+        from opentelemetry import trace  # noqa: PLC0415
+
+        self.__trace = trace
+        self.tracer = trace.get_tracer("transmission-rpc", tracer_provider=tracer_provider)
+
+    def before_request(self, event: RequestEvent) -> None:
+        attributes: dict[str, Any] = {
+            "rpc.system": "jsonrpc",
+            "rpc.service": "transmission",
+            "rpc.method": event.method,
+            "transmission.arguments": event.arguments,
+        }
+        if event.ids is not None:
+            attributes["transmission.ids"] = event.ids
+        event.span = self.tracer.start_span(
+            f"transmission {event.method}", kind=self.__trace.SpanKind.CLIENT, attributes=attributes
+        )
+
+    def on_retry(self, event: RequestEvent) -> None:
+        event.span.add_event("session id renewed")
+
+    def __end(self, event: RequestEvent) -> None:
+        timing = event.timing
+        span = event.span
+        span.set_attribute("transmission.timing.serialize", timing.serialize)
+        span.set_attribute("transmission.timing.network", timing.network)
+        span.set_attribute("transmission.timing.decode", timing.decode)
+        span.set_attribute("transmission.timing.build", timing.build)
+        span.set_attribute("transmission.request_bytes", timing.request_bytes)
+        span.set_attribute("transmission.response_bytes", timing.response_bytes)
+        span.set_attribute("transmission.retries", timing.retries)
+        if timing.connection_reused is not None:
+            span.set_attribute("transmission.connection_reused", timing.connection_reused)
+        span.end()
+
+    def after_response(self, event: RequestEvent) -> None:
+        self.__end(event)
+
+    def on_error(self, event: RequestEvent, error: Exception) -> None:
+        event.span.record_exception(error)
+        event.span.set_status(self.__trace.Status(self.__trace.StatusCode.ERROR, str(error)))
+        self.__end(event)
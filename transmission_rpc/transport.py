@@ -0,0 +1,398 @@
+"""
+HTTP transports used by :py:class:`transmission_rpc.Client` to send requests.
+
+The default transport is based on urllib3.
+A custom transport can be passed to the client to use a different HTTP stack,
+or to dispatch requests to a python function without any socket with :py:class:`InMemoryTransport`.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import select
+import socket
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Mapping, NamedTuple, Union
+
+import urllib3
+from typing_extensions import Literal
+from urllib3 import Timeout
+
+from transmission_rpc.error import TransmissionConnectError, TransmissionTimeoutError
+
+if TYPE_CHECKING:
+    from transmission_rpc._body import Base64JsonBody
+
+# urllib3 may remove support for int/float in the future
+_Timeout = Union[Timeout, int, float]
+
+
+class TransportResponse(NamedTuple):
+    status: int
+    """http status code"""
+
+    headers: Mapping[str, str]
+    """response headers, names are lower case or looked up case-insensitively"""
+
+    data: bytes
+    """response body"""
+
+    original: Any = None
+    """response object of underlying http library, if any"""
+
+    connection_reused: bool | None = None
+    """if the request is sent on a kept-alive connection, ``None`` if unknown"""
+
+
+class Transport(abc.ABC):
+    """
+    Interface of transports, sending a single http POST request to transmission daemon.
+
+    Session id negotiation, authentication errors and response decoding are handled by the client.
+    """
+
+    @abc.abstractmethod
+    def request(
+        self,
+        path: str,
+        headers: dict[str, str],
+        body: bytes | Base64JsonBody,
+        timeout: _Timeout | None,
+    ) -> TransportResponse:
+        """
+        send a POST request to ``path``.
+
+        ``body`` is bytes or a re-iterable of bytes chunks with ``len()``.
+        Network errors should be raised as :py:class:`~transmission_rpc.TransmissionConnectError`
+        or :py:class:`~transmission_rpc.TransmissionTimeoutError`.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:  # noqa: B027
+        """release connections, default implementation does nothing"""
+
+
+class Urllib3Transport(Transport):
+    """
+    Default transport with urllib3 connection pool, supports ``http``, ``https`` and ``http+unix`` protocols.
+    """
+
+    def __init__(
+        self,
+        protocol: Literal["http", "https", "http+unix"] = "http",
+        host: str = "127.0.0.1",
+        port: int | None = 9091,
+        *,
+        timeout: Timeout | None = None,
+        pool_maxsize: int = 1,
+    ):
+        common_args: dict[str, Any] = {
+            "host": host,
+            "timeout": timeout,
+            "retries": False,
+            "maxsize": pool_maxsize,
+        }
+        self.__http_client: urllib3.HTTPConnectionPool
+        if protocol == "http":
+            self.__http_client = urllib3.HTTPConnectionPool(port=port, **common_args)
+        elif protocol == "https":
+            # certifi is slow to import, only import it for https
+            import certifi  # noqa: PLC0415
+
+            self.__http_client = urllib3.HTTPSConnectionPool(port=port, ca_certs=certifi.where(), **common_args)
+        elif protocol == "http+unix":
+            from transmission_rpc._unix_socket import UnixHTTPConnectionPool  # noqa: PLC0415
+
+            self.__http_client = UnixHTTPConnectionPool(**common_args)
+        else:
+            raise ValueError(f"Unknown protocol {protocol!r}, only 'http', 'https' or 'http+unix' is supported")
+
+    def request(
+        self,
+        path: str,
+        headers: dict[str, str],
+        body: bytes | Base64JsonBody,
+        timeout: _Timeout | None,
+    ) -> TransportResponse:
+        pool = self.__http_client
+        # best effort when the pool is used by multiple threads
+        connections = pool.num_connections
+        try:
+            r = pool.request("POST", url=path, headers=headers, body=body, timeout=timeout)
+        except urllib3.exceptions.TimeoutError as e:
+            raise TransmissionTimeoutError("timeout when connection to transmission daemon") from e
+        except urllib3.exceptions.ConnectionError as e:
+            raise TransmissionConnectError(f"can't connect to transmission daemon: {e!s}") from e
+
+        return TransportResponse(
+            status=r.status,
+            headers=r.headers,
+            data=r.data,
+            original=r,
+            connection_reused=pool.num_connections == connections,
+        )
+
+    def close(self) -> None:
+        self.__http_client.close()
+
+
+class InMemoryTransport(Transport):
+    """
+    Transport calling ``handler`` with decoded json-rpc request, without any socket.
+
+    ``handler`` returns the json-rpc response as a dict, or as encoded bytes.
+    It's useful to test or benchmark client side encoding, decoding and object building.
+
+    .. code-block:: python
+
+        def handler(request: dict[str, Any]) -> dict[str, Any]:
+            if request["method"] == "session-get":
+                return {"result": "success", "arguments": {"rpc-version": 17, "version": "4.0.6"}}
+            return {"result": "success", "arguments": {"torrents": []}}
+
+
+        client = Client(transport=InMemoryTransport(handler))
+    """
+
+    def __init__(self, handler: Callable[[dict[str, Any]], dict[str, Any] | bytes]):
+        self.handler = handler
+
+    def request(
+        self,
+        path: str,
+        headers: dict[str, str],
+        body: bytes | Base64JsonBody,
+        timeout: _Timeout | None,
+    ) -> TransportResponse:
+        content = body if isinstance(body, bytes) else b"".join(body)
+        data = self.handler(json.loads(content))
+        if not isinstance(data, bytes):
+            data = json.dumps(data).encode()
+        return TransportResponse(status=200, headers={}, data=data)
+
+
+class SocketTransport(Transport):
+    """
+    Minimal HTTP/1.1 transport over a single kept-alive socket.
+
+    It skips most generic http client machinery, and is meant for frequent small requests
+    to a local daemon, on a unix socket or tcp loopback. https is not supported.
+
+    Requests are serialized with a lock, create a transport for each thread to send requests concurrently.
+
+    .. code-block:: python
+
+        client = Client(transport=SocketTransport("/run/transmission/rpc.sock"))
+        client = Client(transport=SocketTransport("127.0.0.1", 9091))
+
+    Parameters:
+        host: path of unix socket if ``port`` is ``None``, otherwise tcp host.
+        port: tcp port.
+        timeout: default socket timeout in seconds.
+    """
+
+    def __init__(self, host: str, port: int | None = None, *, timeout: float | None = None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.__sock: socket.socket | None = None
+        self.__buffer = bytearray()
+        self.__lock = threading.Lock()
+        self.__heads: dict[tuple[str, tuple[tuple[str, str], ...]], bytes] = {}
+
+    def request(
+        self,
+        path: str,
+        headers: dict[str, str],
+        body: bytes | Base64JsonBody,
+        timeout: _Timeout | None,
+    ) -> TransportResponse:
+        seconds: float | None = self.timeout
+        if isinstance(timeout, Timeout):
+            timer = timeout.clone()
+            timer.start_connect()
+            read_timeout = timer.read_timeout
+            if isinstance(read_timeout, (int, float)):
+                seconds = read_timeout
+        elif timeout is not None:
+            seconds = timeout
+
+        with self.__lock:
+            try:
+                sock, reused = self.__connection()
+                sock.settimeout(seconds)
+                self.__send(sock, path, headers, body)
+                return self.__read_response(sock, reused)
+            except socket.timeout as e:
+                self.__close()
+                raise TransmissionTimeoutError("timeout when connection to transmission daemon") from e
+            except OSError as e:
+                self.__close()
+                raise TransmissionConnectError(f"can't connect to transmission daemon: {e!s}") from e
+            except Exception:
+                self.__close()
+                raise
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__close()
+
+    def __close(self) -> None:
+        if self.__sock is not None:
+            self.__sock.close()
+            self.__sock = None
+        self.__buffer = bytearray()
+
+    def __connection(self) -> tuple[socket.socket, bool]:
+        """returns the socket, and whether it's reused"""
+        sock = self.__sock
+        if sock is not None:
+            # connection closed by server while idle is readable with no data
+            readable, _, _ = select.select([sock], [], [], 0)
+            if not readable:
+                return sock, True
+            self.__close()
+
+        if self.port is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(self.timeout)
+                sock.connect(self.host)
+            except OSError:
+                sock.close()
+                raise
+        else:
+            sock = socket.create_connection((self.host, self.port), self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.__sock = sock
+        return sock, False
+
+    def __send(self, sock: socket.socket, path: str, headers: dict[str, str], body: bytes | Base64JsonBody) -> None:
+        key = (path, tuple(headers.items()))
+        head = self.__heads.get(key)
+        if head is None:
+            host = "localhost" if self.port is None else f"{self.host}:{self.port}"
+            lines = [f"POST {path} HTTP/1.1", f"host: {host}"]
+            lines.extend(f"{name}: {value}" for name, value in headers.items() if name.lower() != "content-length")
+            head = ("\r\n".join(lines) + "\r\ncontent-length: ").encode("latin-1")
+            if len(self.__heads) > 16:
+                # session id changed too many times
+                self.__heads.clear()
+            self.__heads[key] = head
+
+        if isinstance(body, bytes):
+            sock.sendall(b"%s%d\r\n\r\n%s" % (head, len(body), body))
+            return
+
+        sock.sendall(b"%s%d\r\n\r\n" % (head, len(body)))
+        for chunk in body:
+            sock.sendall(chunk)
+
+    def __recv(self, sock: socket.socket, buffer: bytearray) -> None:
+        data = sock.recv(65536)
+        if not data:
+            raise ConnectionResetError("connection closed by transmission daemon")
+        # extended in place, so reading a large response doesn't copy the buffer again and again
+        buffer += data
+
+    def __read_response(self, sock: socket.socket, reused: bool) -> TransportResponse:
+        buffer = self.__buffer
+        start = 0
+        while True:
+            end = buffer.find(b"\r\n\r\n", start)
+            if end >= 0:
+                break
+            start = max(0, len(buffer) - 3)
+            self.__recv(sock, buffer)
+
+        lines = buffer[:end].decode("latin-1").split("\r\n")
+        del buffer[: end + 4]
+        try:
+            status = int(lines[0].split(" ", 2)[1])
+        except (IndexError, ValueError):
+            raise TransmissionConnectError(f"invalid http response status line {lines[0]!r}") from None
+
+        response_headers: dict[str, str] = {}
+        length = -1
+        chunked = False
+        close = False
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            name = name.strip().lower()
+            value = value.strip()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = value.lower() == "chunked"
+            elif name == "connection":
+                close = value.lower() == "close"
+            elif name == "x-transmission-session-id":
+                response_headers[name] = value
+
+        if chunked:
+            data = self.__read_chunked(sock, buffer)
+        elif length >= 0:
+            data = self.__read_length(sock, buffer, length)
+        else:
+            # body ends when connection is closed
+            parts = [bytes(buffer)]
+            while True:
+                part = sock.recv(65536)
+                if not part:
+                    break
+                parts.append(part)
+            data, close = b"".join(parts), True
+
+        if close:
+            self.__close()
+        else:
+            self.__buffer = buffer
+        return TransportResponse(status=status, headers=response_headers, data=data, connection_reused=reused)
+
+    def __read_length(self, sock: socket.socket, buffer: bytearray, length: int) -> bytes:
+        """read ``length`` bytes of body, data after it is kept in ``buffer``"""
+        if len(buffer) >= length:
+            data = bytes(buffer[:length])
+            del buffer[:length]
+            return data
+
+        # receive directly into body of known size
+        body = bytearray(length)
+        received = len(buffer)
+        body[:received] = buffer
+        buffer.clear()
+        view = memoryview(body)
+        while received < length:
+            n = sock.recv_into(view[received:])
+            if not n:
+                raise ConnectionResetError("connection closed by transmission daemon")
+            received += n
+        view.release()
+        return bytes(body)
+
+    def __read_chunked(self, sock: socket.socket, buffer: bytearray) -> bytes:
+        """read chunked body, data after it is kept in ``buffer``"""
+        parts: list[bytes] = []
+        while True:
+            while (end := buffer.find(b"\r\n")) < 0:
+                self.__recv(sock, buffer)
+            size = int(buffer[:end].split(b";", 1)[0], 16)
+            del buffer[: end + 2]
+            if size == 0:
+                # skip trailers
+                while (end := buffer.find(b"\r\n")) != 0:
+                    if end < 0:
+                        self.__recv(sock, buffer)
+                    else:
+                        del buffer[: end + 2]
+                del buffer[:2]
+                return b"".join(parts)
+            if len(buffer) >= size + 2:
+                parts.append(bytes(buffer[:size]))
+                del buffer[: size + 2]
+            else:
+                parts.append(self.__read_length(sock, buffer, size))
+                while len(buffer) < 2:
+                    self.__recv(sock, buffer)
+                del buffer[:2]
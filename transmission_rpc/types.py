@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, NamedTuple
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-from transmission_rpc.constants import Priority
+from typing_extensions import Literal
+
+from transmission_rpc.constants import Priority, RpcMethod
+
+if TYPE_CHECKING:
+    from transmission_rpc.torrent import Torrent
 
 
 class Container:
@@ -42,6 +47,42 @@ class File(NamedTuple):
     """add in Transmission 4.1.0 rpc-version-semver 5.4.0, rpc-version 18"""
 
 
+class TorrentChangeBatch(NamedTuple):
+    """a single torrent-set request planned by :py:meth:`transmission_rpc.Client.reconcile_torrents`"""
+
+    ids: list[int]
+    """torrent ids to change"""
+
+    arguments: dict[str, Any]
+    """keyword arguments of :py:meth:`transmission_rpc.Client.change_torrent`"""
+
+
+class QueueMove(NamedTuple):
+    """a single queue movement request planned by :py:meth:`transmission_rpc.Client.reorder_queue`"""
+
+    method: RpcMethod
+    """``queue-move-top`` or ``queue-move-bottom``"""
+
+    ids: list[int]
+    """torrent ids to move"""
+
+
+class AddTorrentResult(NamedTuple):
+    """result of a single torrent added by :py:meth:`transmission_rpc.Client.add_torrents`"""
+
+    source: Any
+    """the input torrent, path, bytes, file-like object or URL"""
+
+    status: Literal["added", "duplicate", "error"]
+    """``duplicate`` if transmission daemon or the client id cache already has this torrent"""
+
+    torrent: Torrent | None = None
+    """added or existing torrent, with ``id``, ``hashString`` and ``name`` fields"""
+
+    error: Exception | None = None
+    """error raised when reading or adding this torrent"""
+
+
 class Group(Container):
     """
     https://github.com/transmission/transmission/blob/4.0.5/docs/rpc-spec.md#482-bandwidth-group-accessor-group-get
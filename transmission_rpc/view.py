@@ -0,0 +1,147 @@
+"""
+Declarative, typed views over torrent-get responses.
+
+A view only names the fields it needs, so :py:meth:`transmission_rpc.Client.get_torrents`
+can request exactly those fields and build slot-based objects directly from the response.
+"""
+
+from __future__ import annotations
+
+import enum
+import re
+import sys
+import types
+import typing
+from datetime import datetime, timezone
+from typing import Any, Callable, ClassVar
+
+from typing_extensions import Self
+
+from transmission_rpc.constants import TORRENT_GET_ARGS
+from transmission_rpc.torrent import Status, get_status
+
+
+def _to_attribute_name(rpc_name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", rpc_name).lower().replace("-", "_")
+
+
+#: python attribute name -> rpc field name, ``rate_download`` -> ``rateDownload``
+_ATTRIBUTE_TO_FIELD: dict[str, str] = {_to_attribute_name(key): key for key in TORRENT_GET_ARGS}
+
+
+def _status(value: int) -> Status:
+    return Status(get_status(value))
+
+
+def _timestamp(value: int) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+def _resolve_annotation(annotation: Any, module: str) -> Any:
+    if not isinstance(annotation, str):
+        return annotation
+    holder = types.SimpleNamespace(__annotations__={"value": annotation})
+    try:
+        return typing.get_type_hints(holder, vars(sys.modules[module]))["value"]
+    except Exception:
+        # annotation can't be evaluated, for example ``int | None`` on python 3.8, value is kept as-is.
+        return None
+
+
+_CLASS_VAR = re.compile(r"^(?:[\w.]+\.)?ClassVar(?:\[|$)")
+
+
+def _is_class_var(annotation: Any) -> bool:
+    if isinstance(annotation, str):
+        # not evaluated with `from __future__ import annotations`, `ClassVar`, `typing.ClassVar[int]`
+        return _CLASS_VAR.match(annotation.strip()) is not None
+    return annotation is ClassVar or typing.get_origin(annotation) is ClassVar
+
+
+def _converter(tp: Any) -> Callable[[Any], Any] | None:
+    if tp is Status:
+        return _status
+    if tp is datetime:
+        return _timestamp
+    if tp is float:
+        return float
+    if isinstance(tp, type) and issubclass(tp, enum.Enum):
+        return tp
+    return None
+
+
+_ViewField = typing.Tuple[str, str, typing.Optional[Callable[[Any], Any]]]
+
+
+class _TorrentViewMeta(type):
+    _view_fields: tuple[_ViewField, ...]
+    rpc_fields: list[str]
+
+    def __new__(mcs, name: str, bases: tuple[type, ...], namespace: dict[str, Any]) -> _TorrentViewMeta:
+        annotations: dict[str, Any] = namespace.get("__annotations__", {})
+        own = [attr for attr, ann in annotations.items() if not attr.startswith("_") and not _is_class_var(ann)]
+
+        for attr in own:
+            if attr not in _ATTRIBUTE_TO_FIELD:
+                raise ValueError(f"{name}.{attr} does not match any torrent field")
+
+        namespace["__slots__"] = tuple(own)
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        module = namespace.get("__module__", __name__)
+        inherited: tuple[_ViewField, ...] = getattr(cls, "_view_fields", ())
+        cls._view_fields = inherited + tuple(
+            (attr, _ATTRIBUTE_TO_FIELD[attr], _converter(_resolve_annotation(annotations[attr], module)))
+            for attr in own
+        )
+        cls.rpc_fields = [key for _, key, _ in cls._view_fields]
+        return cls
+
+
+class TorrentView(metaclass=_TorrentViewMeta):
+    """
+    Base class for a lightweight, typed torrent view.
+
+    Annotated attributes are mapped to torrent-get fields by name,
+    ``rate_download`` is ``rateDownload`` and ``peer_limit`` is ``peer-limit``.
+
+    Values of fields annotated with :py:class:`~transmission_rpc.Status`, ``datetime``, ``float``
+    or an enum class are converted, other values are stored as returned by transmission daemon.
+
+    .. code-block:: python
+
+        from transmission_rpc import Client, Status, TorrentView
+
+
+        class Row(TorrentView):
+            name: str
+            rate_download: int
+            status: Status
+
+
+        for row in Client().get_torrents(view=Row):
+            print(row.name, row.rate_download, row.status)
+
+    Fields missing in response are left unset, accessing them raises ``AttributeError``.
+    """
+
+    __slots__ = ()
+
+    _view_fields: ClassVar[tuple[_ViewField, ...]]
+
+    #: rpc field names requested for this view
+    rpc_fields: ClassVar[list[str]]
+
+    @classmethod
+    def from_fields(cls, fields: dict[str, Any]) -> Self:
+        """build a view from a single raw torrent dict in torrent-get response"""
+        obj = cls.__new__(cls)
+        for attr, key, convert in cls._view_fields:
+            if key in fields:
+                value = fields[key]
+                object.__setattr__(obj, attr, value if convert is None else convert(value))
+        return obj
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr, _, _ in self._view_fields if hasattr(self, attr))
+        return f"{type(self).__name__}({values})"
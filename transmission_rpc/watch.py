@@ -0,0 +1,319 @@
+"""
+Watch a drop directory and add new .torrent files to transmission daemon.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import fnmatch
+import json
+import os
+import pathlib
+import select
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Sequence
+
+from transmission_rpc.constants import LOGGER
+from transmission_rpc.error import TransmissionConnectError
+
+if TYPE_CHECKING:
+    from transmission_rpc.client import Client
+    from transmission_rpc.types import AddTorrentResult
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+
+# seconds to wait before adding a file again after a connection error, doubled on each failure
+_RETRY_DELAY = 1.0
+_RETRY_MAX_DELAY = 300.0
+
+
+class WatchRule(NamedTuple):
+    """
+    Arguments of :py:meth:`transmission_rpc.Client.add_torrent` for files matching ``pattern``.
+    """
+
+    pattern: str = "*.torrent"
+    """``fnmatch`` pattern of file name"""
+
+    download_dir: str | None = None
+    labels: list[str] | None = None
+    paused: bool | None = None
+
+    def kwargs(self) -> dict[str, Any]:
+        return {
+            key: value
+            for key, value in (("download_dir", self.download_dir), ("labels", self.labels), ("paused", self.paused))
+            if value is not None
+        }
+
+
+class _Pending(NamedTuple):
+    size: int
+    mtime_ns: int
+    stable_since: float
+
+
+class _Inotify:
+    """wake up on changes of a directory with linux inotify, events are not parsed, directory is scanned again."""
+
+    def __init__(self, directory: pathlib.Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed on {directory}")
+        self.fd = fd
+
+    def wait(self, timeout: float) -> None:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class TorrentWatcher:
+    """
+    Add .torrent files dropped into a directory.
+
+    A file is added after its size and modification time are unchanged for ``settle`` seconds,
+    so partially written files are not uploaded.
+    Files are added in batches with :py:meth:`transmission_rpc.Client.add_torrents`,
+    then moved to ``processed_dir``, deleted if ``delete`` is ``True``, or kept in place.
+
+    The directory is watched with inotify on linux, and polled every ``poll_interval`` seconds on other platforms.
+
+    Processed files are recorded in ``state_file``, a file added but not moved or deleted
+    before the watcher is stopped is not uploaded again after a restart.
+    Files rejected by the daemon are retried after they are changed, or after a restart.
+    Files failed to add because of connection errors or timeouts are retried in later scans,
+    waiting longer after each failure, up to 5 minutes.
+
+    .. code-block:: python
+
+        watcher = TorrentWatcher(
+            Client(pool_maxsize=4, id_cache=True),
+            "/data/drop",
+            rules=[WatchRule("tv.*.torrent", download_dir="/data/tv", labels=["tv"]), WatchRule(paused=True)],
+            processed_dir="/data/drop/done",
+            state_file="/data/drop/.state.json",
+        )
+        watcher.run()  # blocks until watcher.stop() is called from another thread
+
+    Parameters:
+        client: client to add torrents.
+        directory: directory to watch.
+        rules: the first rule matching file name decides add arguments,
+            files not matching any rule are ignored. Default to add all ``*.torrent`` files.
+        processed_dir: move processed files into this directory.
+        delete: delete processed files.
+        state_file: json file to persist processed files.
+        settle: seconds a file must be unchanged before it's added.
+        poll_interval: seconds between directory scans without inotify.
+        workers: number of concurrent torrent-add requests.
+        batch_size: max number of files added in a batch.
+        on_result: called with result of each file.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        directory: str | pathlib.Path,
+        *,
+        rules: Sequence[WatchRule] = (WatchRule(),),
+        processed_dir: str | pathlib.Path | None = None,
+        delete: bool = False,
+        state_file: str | pathlib.Path | None = None,
+        settle: float = 2.0,
+        poll_interval: float = 1.0,
+        workers: int = 4,
+        batch_size: int = 100,
+        on_result: Callable[[AddTorrentResult], None] | None = None,
+    ):
+        if processed_dir is not None and delete:
+            raise ValueError("`processed_dir` can't be used together with `delete`")
+
+        self.client = client
+        self.directory = pathlib.Path(directory)
+        self.rules = list(rules)
+        self.processed_dir = None if processed_dir is None else pathlib.Path(processed_dir)
+        self.delete = delete
+        self.state_file = None if state_file is None else pathlib.Path(state_file)
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.workers = workers
+        self.batch_size = batch_size
+        self.on_result = on_result
+
+        self.__pending: dict[str, _Pending] = {}
+        self.__failed: dict[str, tuple[int, int]] = {}
+        self.__retries: dict[str, int] = {}
+        self.__done: dict[str, tuple[int, int]] = self.__load_state()
+        self.__stop = threading.Event()
+
+    def scan(self) -> list[AddTorrentResult]:
+        """scan directory once and add settled files"""
+        now = time.monotonic()
+        seen: set[str] = set()
+        ready: list[pathlib.Path] = []
+
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_file() or self.__rule(entry.name) is None:
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                key = (stat.st_size, stat.st_mtime_ns)
+
+                if self.__done.get(entry.name) == key:
+                    # added before restart, but not moved or deleted
+                    self.__finish(pathlib.Path(entry.path))
+                    continue
+                if self.__failed.get(entry.name) == key:
+                    continue
+
+                pending = self.__pending.get(entry.name)
+                if pending is None or (pending.size, pending.mtime_ns) != key:
+                    pending = self.__pending[entry.name] = _Pending(*key, now)
+                if now - pending.stable_since >= self.settle:
+                    ready.append(pathlib.Path(entry.path))
+
+        for name in list(self.__pending):
+            if name not in seen:
+                del self.__pending[name]
+        for name in list(self.__failed):
+            if name not in seen:
+                del self.__failed[name]
+        for name in list(self.__retries):
+            if name not in self.__pending:
+                del self.__retries[name]
+
+        if self.__prune_state(seen):
+            self.__save_state()
+
+        results: list[AddTorrentResult] = []
+        for start in range(0, len(ready), self.batch_size):
+            results.extend(self.__add(ready[start : start + self.batch_size]))
+            self.__save_state()
+        return results
+
+    def run(self) -> None:
+        """watch the directory until :py:meth:`stop` is called"""
+        inotify: _Inotify | None = None
+        if sys.platform == "linux":
+            try:
+                inotify = _Inotify(self.directory)
+            except (OSError, AttributeError, TypeError) as e:
+                LOGGER.warning("inotify is not available, polling %s: %s", self.directory, e)
+
+        try:
+            while not self.__stop.is_set():
+                try:
+                    self.scan()
+                except Exception:
+                    LOGGER.exception("failed to process %s", self.directory)
+
+                timeout = self.poll_interval
+                if self.__pending:
+                    timeout = max(0.0, min(timeout, self.__next_settle() - time.monotonic()))
+                if inotify is None:
+                    self.__stop.wait(timeout)
+                else:
+                    inotify.wait(timeout)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def stop(self) -> None:
+        """stop :py:meth:`run`, it returns after current batch"""
+        self.__stop.set()
+
+    def __rule(self, name: str) -> int | None:
+        for i, rule in enumerate(self.rules):
+            if fnmatch.fnmatch(name, rule.pattern):
+                return i
+        return None
+
+    def __next_settle(self) -> float:
+        return min(p.stable_since for p in self.__pending.values()) + self.settle
+
+    def __add(self, paths: list[pathlib.Path]) -> list[AddTorrentResult]:
+        groups: dict[int, list[pathlib.Path]] = {}
+        for path in paths:
+            rule = self.__rule(path.name)
+            if rule is not None:
+                groups.setdefault(rule, []).append(path)
+
+        results: list[AddTorrentResult] = []
+        for rule, group in groups.items():
+            keys = {path.name: self.__pending[path.name] for path in group}
+            kwargs = self.rules[rule].kwargs()
+            for result in self.client.add_torrents(group, workers=self.workers, **kwargs):
+                path = result.source
+                pending = keys[path.name]
+                if isinstance(result.error, TransmissionConnectError):
+                    # daemon is not reachable, keep the file pending and add it again after a delay
+                    retries = self.__retries.get(path.name, 0)
+                    self.__retries[path.name] = retries + 1
+                    delay = min(_RETRY_DELAY * 2**retries, _RETRY_MAX_DELAY)
+                    LOGGER.warning("failed to add %s, retry in %.0f seconds: %s", path, delay, result.error)
+                    self.__pending[path.name] = pending._replace(stable_since=time.monotonic() + delay - self.settle)
+                elif result.status == "error":
+                    LOGGER.error("failed to add %s: %s", path, result.error)
+                    del self.__pending[path.name]
+                    self.__retries.pop(path.name, None)
+                    self.__failed[path.name] = (pending.size, pending.mtime_ns)
+                else:
+                    del self.__pending[path.name]
+                    self.__retries.pop(path.name, None)
+                    self.__done[path.name] = (pending.size, pending.mtime_ns)
+                    self.__finish(path)
+                if self.on_result is not None:
+                    self.on_result(result)
+                results.append(result)
+        return results
+
+    def __finish(self, path: pathlib.Path) -> None:
+        try:
+            if self.delete:
+                path.unlink()
+            elif self.processed_dir is not None:
+                self.processed_dir.mkdir(parents=True, exist_ok=True)
+                os.replace(path, self.processed_dir.joinpath(path.name))
+        except OSError:
+            LOGGER.exception("failed to move or delete processed file %s", path)
+
+    def __prune_state(self, seen: set[str]) -> bool:
+        """forget files moved or deleted"""
+        gone = [name for name in self.__done if name not in seen]
+        for name in gone:
+            del self.__done[name]
+        return bool(gone)
+
+    def __load_state(self) -> dict[str, tuple[int, int]]:
+        if self.state_file is None or not self.state_file.exists():
+            return {}
+        state = json.loads(self.state_file.read_text("utf-8"))
+        return {name: (value[0], value[1]) for name, value in state.get("done", {}).items()}
+
+    def __save_state(self) -> None:
+        if self.state_file is None:
+            return
+        tmp = self.state_file.with_name(self.state_file.name + ".tmp")
+        tmp.write_text(json.dumps({"done": self.__done}), "utf-8")
+        os.replace(tmp, self.state_file)